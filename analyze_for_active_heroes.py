@@ -7,6 +7,8 @@ Active Heroes' mission in fundraising, partnerships, and awareness.
 
 Usage:
     python3 analyze_for_active_heroes.py [--state KY]
+    python3 analyze_for_active_heroes.py --views local,peers,social
+    python3 analyze_for_active_heroes.py --states KY,TN,IN,OH   # per-state subdirectories
 
 Outputs (in data/output/active_heroes/):
     1. local_partners.csv         — Orgs in Active Heroes' home state (default: KY)
@@ -20,10 +22,15 @@ Outputs (in data/output/active_heroes/):
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pandas as pd
 
+from loaders.artifacts import DATASET_DIRNAME, read_directory
+from loaders.stats import STATS_FILENAME, collect_stats, load_stats
+from utils.buckets import revenue_bucket
+
 # Active Heroes is based in Kentucky
 DEFAULT_STATE = "KY"
 
@@ -57,64 +64,121 @@ VET_POP_BY_STATE = {
 }
 
 
+NUMERIC_COLUMNS = [
+    "total_revenue", "total_expenses", "total_assets", "net_assets",
+    "charity_navigator_rating", "charity_navigator_score",
+    "confidence_score", "num_employees",
+]
+
+SOCIAL_COLUMNS = ["facebook_url", "twitter_url", "linkedin_url", "instagram_url", "youtube_url"]
+
+# View name → (output file, columns written; None = every directory column)
+VIEWS = {
+    "local": ("local_partners.csv", None),
+    "funders": ("potential_funders.csv", None),
+    "peers": ("peer_network.csv", None),
+    "gap": ("underserved_gap_analysis.csv", None),
+    "board": ("board_prospects.csv", [
+        "org_name", "state", "key_personnel", "charity_navigator_rating",
+        "total_revenue", "website", "phone", "email",
+    ]),
+    "social": ("social_media_partners.csv", [
+        "org_name", "state", "website", "facebook_url", "twitter_url",
+        "linkedin_url", "instagram_url", "youtube_url",
+        "social_platform_count", "total_revenue",
+    ]),
+}
+
+
 def load_directory(csv_path: str) -> pd.DataFrame:
-    """Load the main veteran org directory CSV."""
-    df = pd.read_csv(csv_path, dtype=str, low_memory=False)
+    """Load the directory once, preferring the typed Parquet dataset.
+
+    The dataset is used when Stage 8 wrote it next to the CSV at the same
+    time or later; otherwise the CSV is parsed.
+    """
+    csv_path = Path(csv_path)
+    dataset_dir = csv_path.with_name(DATASET_DIRNAME)
+    if dataset_dir.exists() and dataset_dir.stat().st_mtime >= csv_path.stat().st_mtime:
+        df = read_directory(output_dir=csv_path.parent)
+    else:
+        df = pd.read_csv(csv_path, dtype=str, low_memory=False)
     # Convert numeric columns
-    for col in ["total_revenue", "total_expenses", "total_assets", "net_assets",
-                 "charity_navigator_rating", "charity_navigator_score",
-                 "confidence_score", "num_employees"]:
+    for col in NUMERIC_COLUMNS:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
+    if "total_revenue" in df.columns:
+        df["annual_revenue_range"] = revenue_bucket(df["total_revenue"])
     return df
 
 
-def keyword_match(series: pd.Series, keywords: list) -> pd.Series:
-    """Check if any keyword appears in the series (case-insensitive)."""
-    combined = series.fillna("").str.lower()
-    pattern = "|".join(keywords)
-    return combined.str.contains(pattern, regex=True, na=False)
+def directory_stats(df: pd.DataFrame, csv_path: str) -> dict:
+    """Stage 8 stats for this CSV if they are current, else collected from df."""
+    stats_path = Path(csv_path).with_name(STATS_FILENAME)
+    if stats_path.exists() and stats_path.stat().st_mtime >= Path(csv_path).stat().st_mtime:
+        stats = load_stats(stats_path)
+        if stats and stats.get("total") == len(df):
+            return stats
+    return collect_stats(df)
+
+
+def _lowered(series: pd.Series) -> pd.Series:
+    return series.fillna("").astype(str).str.lower()
+
+
+def keyword_flags(df: pd.DataFrame) -> pd.DataFrame:
+    """Keyword and social flag columns for every view, computed once.
+
+    The four peer-network text columns are joined per row so one regex
+    scan answers "any column mentions a mental health keyword"; keywords
+    contain no newlines, so no match can straddle two columns.
+    """
+    name = _lowered(df["org_name"])
+    text = name
+    for col in ["mission_statement", "services_offered", "service_categories"]:
+        text = text + "\n" + _lowered(df[col])
+
+    social = df[SOCIAL_COLUMNS].notna()
+    return pd.DataFrame({
+        "mental_health": text.str.contains("|".join(MENTAL_HEALTH_KEYWORDS), regex=True).to_numpy(dtype=bool),
+        "funder_name": name.str.contains("|".join(FUNDER_KEYWORDS), regex=True).to_numpy(dtype=bool),
+        "has_social": social[SOCIAL_COLUMNS[:4]].any(axis=1).to_numpy(),
+        "social_platform_count": social.sum(axis=1).astype(int).to_numpy(),
+    }, index=df.index)
+
+
+def _ranked(df: pd.DataFrame, mask, by: str) -> pd.Index:
+    """Index labels of rows in mask, sorted descending by one column."""
+    mask = pd.Series(mask, index=df.index).fillna(False).astype(bool)
+    # Stable, so ranking a subset matches ranking everything then filtering
+    return df.loc[mask, by].sort_values(ascending=False, kind="stable").index
 
 
-def view1_local_partners(df: pd.DataFrame, state: str) -> pd.DataFrame:
-    """Orgs in Active Heroes' home state, sorted by confidence score."""
-    local = df[df["state"] == state].copy()
-    local = local.sort_values("confidence_score", ascending=False)
-    return local
+def view1_local_partners(df: pd.DataFrame, flags: pd.DataFrame, state: str | list[str]) -> pd.Index:
+    """Orgs in Active Heroes' home state (or states), sorted by confidence score."""
+    states = [state] if isinstance(state, str) else state
+    return _ranked(df, df["state"].isin(states), "confidence_score")
 
 
-def view2_potential_funders(df: pd.DataFrame) -> pd.DataFrame:
+def view2_potential_funders(df: pd.DataFrame, flags: pd.DataFrame, state: str) -> pd.Index:
     """High-rated, high-revenue orgs that could be grant sources."""
     has_revenue = df["total_revenue"].notna() & (df["total_revenue"] >= 1_000_000)
     has_rating = df["charity_navigator_rating"].notna() & (df["charity_navigator_rating"] >= 3)
 
     # Also include orgs with funder-like names regardless of rating
-    is_funder_name = keyword_match(df["org_name"], FUNDER_KEYWORDS)
+    is_funder_name = flags["funder_name"]
 
-    funders = df[
-        (has_revenue & has_rating) | (has_revenue & is_funder_name)
-    ].copy()
+    return _ranked(df, (has_revenue & has_rating) | (has_revenue & is_funder_name), "total_revenue")
 
-    funders = funders.sort_values("total_revenue", ascending=False)
-    return funders
 
-
-def view3_peer_network(df: pd.DataFrame) -> pd.DataFrame:
+def view3_peer_network(df: pd.DataFrame, flags: pd.DataFrame, state: str) -> pd.Index:
     """Orgs offering mental health / suicide prevention / wellness services."""
-    # Search across mission, services, name, and categories
-    match_mission = keyword_match(df["mission_statement"], MENTAL_HEALTH_KEYWORDS)
-    match_services = keyword_match(df["services_offered"], MENTAL_HEALTH_KEYWORDS)
-    match_name = keyword_match(df["org_name"], MENTAL_HEALTH_KEYWORDS)
-    match_categories = keyword_match(df["service_categories"], MENTAL_HEALTH_KEYWORDS)
-
-    peers = df[match_mission | match_services | match_name | match_categories].copy()
-    peers = peers.sort_values("confidence_score", ascending=False)
-    return peers
+    # Matched across mission, services, name, and categories
+    return _ranked(df, flags["mental_health"], "confidence_score")
 
 
-def view4_gap_analysis(df: pd.DataFrame) -> pd.DataFrame:
+def view4_gap_analysis(stats: dict) -> pd.DataFrame:
     """States ranked by orgs-per-veteran ratio (lowest = most underserved)."""
-    state_counts = df["state"].value_counts().to_dict()
+    state_counts = stats["states"]
 
     rows = []
     for state, vet_pop_k in VET_POP_BY_STATE.items():
@@ -133,144 +197,253 @@ def view4_gap_analysis(df: pd.DataFrame) -> pd.DataFrame:
     return gap
 
 
-def view5_board_prospects(df: pd.DataFrame) -> pd.DataFrame:
+def view5_board_prospects(df: pd.DataFrame, flags: pd.DataFrame, state: str) -> pd.Index:
     """Key personnel at well-run, well-rated veteran orgs — potential board members/advisors."""
     has_personnel = df["key_personnel"].notna() & (df["key_personnel"] != "")
     well_run = (
         (df["charity_navigator_rating"].notna() & (df["charity_navigator_rating"] >= 3))
         | (df["total_revenue"].notna() & (df["total_revenue"] >= 500_000))
     )
+    return _ranked(df, has_personnel & well_run, "total_revenue")
 
-    prospects = df[has_personnel & well_run].copy()
-    prospects = prospects[
-        ["org_name", "state", "key_personnel", "charity_navigator_rating",
-         "total_revenue", "website", "phone", "email"]
-    ]
-    prospects = prospects.sort_values("total_revenue", ascending=False)
-    return prospects
 
-
-def view6_social_media_partners(df: pd.DataFrame) -> pd.DataFrame:
+def view6_social_media_partners(df: pd.DataFrame, flags: pd.DataFrame, state: str) -> pd.Index:
     """Orgs with active social media presence for cross-promotion."""
-    has_social = (
-        df["facebook_url"].notna()
-        | df["twitter_url"].notna()
-        | df["linkedin_url"].notna()
-        | df["instagram_url"].notna()
-    )
+    return _ranked(flags, flags["has_social"], "social_platform_count")
 
-    social_count = (
-        df["facebook_url"].notna().astype(int)
-        + df["twitter_url"].notna().astype(int)
-        + df["linkedin_url"].notna().astype(int)
-        + df["instagram_url"].notna().astype(int)
-        + df["youtube_url"].notna().astype(int)
-    )
 
-    partners = df[has_social].copy()
-    partners["social_platform_count"] = social_count[has_social]
-    partners = partners.sort_values("social_platform_count", ascending=False)
+ROW_VIEWS = {
+    "local": view1_local_partners,
+    "funders": view2_potential_funders,
+    "peers": view3_peer_network,
+    "board": view5_board_prospects,
+    "social": view6_social_media_partners,
+}
 
-    cols = [
-        "org_name", "state", "website", "facebook_url", "twitter_url",
-        "linkedin_url", "instagram_url", "youtube_url",
-        "social_platform_count", "total_revenue",
-    ]
-    return partners[[c for c in cols if c in partners.columns]]
+
+def materialize(df: pd.DataFrame, flags: pd.DataFrame, rows: pd.Index, columns: list[str] | None) -> pd.DataFrame:
+    """Build a view's output frame from its row selection."""
+    if columns is None:
+        return df.loc[rows]
+    return pd.DataFrame({
+        col: (df[col] if col in df.columns else flags[col]).loc[rows]
+        for col in columns
+        if col in df.columns or col in flags.columns
+    })
+
+
+# Views that --states splits into per-state reports; the rest are national
+STATE_VIEWS = ["local", "funders", "peers", "social"]
+
+
+def _write_all(jobs: dict, max_workers: int = 8) -> dict:
+    """Run (path, build) jobs on a thread pool; returns key → written frame."""
+    def _write(path: Path, build) -> pd.DataFrame:
+        frame = build()
+        frame.to_csv(path, index=False, encoding="utf-8-sig")
+        return frame
+
+    with ThreadPoolExecutor(max_workers=max(min(len(jobs), max_workers), 1)) as pool:
+        futures = {key: pool.submit(_write, path, build) for key, (path, build) in jobs.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def _view_job(df: pd.DataFrame, flags, stats: dict, name: str, rows: pd.Index | None, output_dir: Path):
+    filename, columns = VIEWS[name]
+    if name == "gap":
+        return output_dir / filename, lambda: view4_gap_analysis(stats)
+    return output_dir / filename, lambda: materialize(df, flags, rows, columns)
+
+
+def run_views(
+    df: pd.DataFrame, stats: dict, state: str, names: list[str], output_dir: Path,
+) -> dict[str, pd.DataFrame]:
+    """Select rows for every requested view, then write all outputs concurrently."""
+    flags = keyword_flags(df) if any(name in ROW_VIEWS for name in names) else None
+    jobs = {
+        name: _view_job(df, flags, stats, name, ROW_VIEWS[name](df, flags, state) if name in ROW_VIEWS else None, output_dir)
+        for name in names
+    }
+    return _write_all(jobs)
+
+
+def split_by_state(df: pd.DataFrame, rows: pd.Index, states: list[str]) -> dict[str, pd.Index]:
+    """Partition a ranked row selection by state, keeping the ranking."""
+    row_states = df.loc[rows, "state"]
+    keep = row_states.isin(states).to_numpy(dtype=bool)
+    kept = rows[keep]
+    positions = row_states[keep].groupby(row_states[keep], sort=False).indices
+    return {state: kept[positions.get(state, [])] for state in states}
+
+
+def run_state_views(
+    df: pd.DataFrame, stats: dict, states: list[str], names: list[str], output_dir: Path,
+) -> tuple[dict[str, dict[str, pd.DataFrame]], dict[str, pd.DataFrame]]:
+    """Per-state reports for many states from one ranking per view.
+
+    Each state view ranks the whole directory once and is then split by
+    state, so the cost barely depends on how many states are requested.
+    Writes <output_dir>/<ST>/ for state views and national views (gap,
+    board) once at the top level. Returns (per-state frames, national frames).
+    """
+    flags = keyword_flags(df) if any(name in ROW_VIEWS for name in names) else None
+
+    jobs = {}
+    for name in names:
+        if name not in STATE_VIEWS:
+            rows = ROW_VIEWS[name](df, flags, states) if name in ROW_VIEWS else None
+            jobs[(None, name)] = _view_job(df, flags, stats, name, rows, output_dir)
+            continue
+        ranked = ROW_VIEWS[name](df, flags, states)
+        for state, rows in split_by_state(df, ranked, states).items():
+            state_dir = output_dir / state
+            state_dir.mkdir(parents=True, exist_ok=True)
+            jobs[(state, name)] = _view_job(df, flags, stats, name, rows, state_dir)
+
+    frames = _write_all(jobs)
+    per_state = {state: {} for state in states}
+    national = {}
+    for (state, name), frame in frames.items():
+        (national if state is None else per_state[state])[name] = frame
+    return per_state, national
+
+
+def _or(value, default: str):
+    return value if pd.notna(value) else default
 
 
 def generate_dashboard(
-    df: pd.DataFrame, local: pd.DataFrame, funders: pd.DataFrame,
-    peers: pd.DataFrame, gap: pd.DataFrame, board: pd.DataFrame,
-    social: pd.DataFrame, state: str,
+    stats: dict, views: dict[str, pd.DataFrame], state: str,
+    files_dir: str = "data/output/active_heroes/",
 ) -> str:
-    """Generate a text summary dashboard."""
+    """Generate a text summary dashboard for the views that were run."""
     lines = [
         "=" * 70,
         "ACTIVE HEROES — STRATEGIC ANALYSIS DASHBOARD",
         "=" * 70,
         "",
-        f"Total orgs in directory: {len(df):,}",
-        "",
-        f"── 1. Local Partners ({state}) ──",
-        f"  Total orgs in {state}: {len(local):,}",
+        f"Total orgs in directory: {stats['total']:,}",
     ]
-    if len(local) > 0:
-        with_phone = local["phone"].notna().sum()
-        with_email = local["email"].notna().sum()
-        with_website = local["website"].notna().sum()
+
+    local = views.get("local")
+    if local is not None:
+        lines.extend([
+            "",
+            f"── 1. Local Partners ({state}) ──",
+            f"  Total orgs in {state}: {len(local):,}",
+        ])
+        if len(local) > 0:
+            coverage = stats["state_coverage"].get(state, {})
+            with_phone = coverage.get("phone", 0)
+            with_email = coverage.get("email", 0)
+            with_website = coverage.get("website", 0)
+            lines.extend([
+                f"  With phone: {with_phone:,}",
+                f"  With email: {with_email:,}",
+                f"  With website: {with_website:,}",
+                f"  Top 5 by confidence:",
+            ])
+            for _, row in local.head(5).iterrows():
+                lines.append(f"    - {row['org_name']} ({_or(row.get('city'), 'N/A')})")
+
+    funders = views.get("funders")
+    if funders is not None:
+        lines.extend([
+            "",
+            "── 2. Potential Funders ──",
+            f"  Total prospects: {len(funders):,}",
+        ])
+        if len(funders) > 0:
+            total_rev = funders["total_revenue"].sum()
+            lines.append(f"  Combined revenue: ${total_rev:,.0f}")
+            lines.append(f"  Top 10 by revenue:")
+            for _, row in funders.head(10).iterrows():
+                rev = row["total_revenue"]
+                name = row["org_name"]
+                st = _or(row.get("state"), "?")
+                lines.append(f"    - {name} ({st}) — ${rev:,.0f}")
+
+    peers = views.get("peers")
+    if peers is not None:
         lines.extend([
-            f"  With phone: {with_phone:,}",
-            f"  With email: {with_email:,}",
-            f"  With website: {with_website:,}",
-            f"  Top 5 by confidence:",
+            "",
+            "── 3. Peer Network (Mental Health / Suicide Prevention) ──",
+            f"  Total peer orgs: {len(peers):,}",
+        ])
+        if len(peers) > 0:
+            top_states = peers["state"].value_counts().head(5)
+            lines.append("  Top states:")
+            for st, cnt in top_states.items():
+                lines.append(f"    {st}: {cnt}")
+            lines.append(f"  Top 5 peers:")
+            for _, row in peers.head(5).iterrows():
+                lines.append(f"    - {row['org_name']} ({_or(row.get('state'), '?')})")
+
+    gap = views.get("gap")
+    if gap is not None:
+        lines.extend([
+            "",
+            "── 4. Underserved Areas (Gap Analysis) ──",
+            "  Most underserved states (fewest orgs per 100K veterans):",
+        ])
+        for _, row in gap.head(10).iterrows():
+            lines.append(
+                f"    {row['state']}: {row['orgs_per_100k_veterans']} orgs/100K vets "
+                f"({row['org_count']} orgs, {row['veteran_population']:,} veterans)"
+            )
+
+    board = views.get("board")
+    if board is not None:
+        lines.extend([
+            "",
+            "── 5. Board / Advisor Prospects ──",
+            f"  Total orgs with named leadership: {len(board):,}",
         ])
-        for _, row in local.head(5).iterrows():
-            lines.append(f"    - {row['org_name']} ({row.get('city', 'N/A')})")
 
-    lines.extend([
-        "",
-        "── 2. Potential Funders ──",
-        f"  Total prospects: {len(funders):,}",
-    ])
-    if len(funders) > 0:
-        total_rev = funders["total_revenue"].sum()
-        lines.append(f"  Combined revenue: ${total_rev:,.0f}")
-        lines.append(f"  Top 10 by revenue:")
-        for _, row in funders.head(10).iterrows():
-            rev = row["total_revenue"]
-            name = row["org_name"]
-            st = row.get("state", "?")
-            lines.append(f"    - {name} ({st}) — ${rev:,.0f}")
+    social = views.get("social")
+    if social is not None:
+        lines.extend([
+            "",
+            "── 6. Social Media Cross-Promotion ──",
+            f"  Orgs with social media: {len(social):,}",
+        ])
+        if len(social) > 0:
+            multi = (social["social_platform_count"] >= 3).sum()
+            lines.append(f"  Orgs on 3+ platforms: {multi:,}")
 
     lines.extend([
         "",
-        "── 3. Peer Network (Mental Health / Suicide Prevention) ──",
-        f"  Total peer orgs: {len(peers):,}",
+        "=" * 70,
+        f"Files saved to {files_dir}",
+        "=" * 70,
     ])
-    if len(peers) > 0:
-        top_states = peers["state"].value_counts().head(5)
-        lines.append("  Top states:")
-        for st, cnt in top_states.items():
-            lines.append(f"    {st}: {cnt}")
-        lines.append(f"  Top 5 peers:")
-        for _, row in peers.head(5).iterrows():
-            lines.append(f"    - {row['org_name']} ({row.get('state', '?')})")
 
-    lines.extend([
-        "",
-        "── 4. Underserved Areas (Gap Analysis) ──",
-        "  Most underserved states (fewest orgs per 100K veterans):",
-    ])
-    for _, row in gap.head(10).iterrows():
-        lines.append(
-            f"    {row['state']}: {row['orgs_per_100k_veterans']} orgs/100K vets "
-            f"({row['org_count']} orgs, {row['veteran_population']:,} veterans)"
-        )
+    return "\n".join(lines)
 
-    lines.extend([
-        "",
-        "── 5. Board / Advisor Prospects ──",
-        f"  Total orgs with named leadership: {len(board):,}",
-    ])
 
-    lines.extend([
-        "",
-        "── 6. Social Media Cross-Promotion ──",
-        f"  Orgs with social media: {len(social):,}",
-    ])
-    if len(social) > 0:
-        multi = (social["social_platform_count"] >= 3).sum()
-        lines.append(f"  Orgs on 3+ platforms: {multi:,}")
+def run_multi_state(df: pd.DataFrame, stats: dict, states_arg: str, names: list[str], output_dir: Path) -> None:
+    """--states mode: one dashboard + view files per state under output_dir/<ST>/."""
+    if states_arg.strip().lower() == "all":
+        states = sorted(stats["states"])
+    else:
+        states = [s.strip().upper() for s in states_arg.split(",") if s.strip()]
 
-    lines.extend([
-        "",
-        "=" * 70,
-        "Files saved to data/output/active_heroes/",
-        "=" * 70,
-    ])
+    print(f"\nGenerating {len(names)} view(s) for {len(states)} state(s): {', '.join(names)}")
+    per_state, national = run_state_views(df, stats, states, names, output_dir)
 
-    return "\n".join(lines)
+    for name, frame in national.items():
+        print(f"   {VIEWS[name][0]}: {len(frame):,} rows")
+    if national:
+        dashboard = generate_dashboard(stats, national, DEFAULT_STATE)
+        (output_dir / "summary_dashboard.txt").write_text(dashboard)
+
+    for state in states:
+        views = per_state[state]
+        counts = ", ".join(f"{name} {len(frame):,}" for name, frame in views.items())
+        print(f"   {state}: {counts}")
+        if views:
+            dashboard = generate_dashboard(stats, views, state, files_dir=f"data/output/active_heroes/{state}/")
+            (output_dir / state / "summary_dashboard.txt").write_text(dashboard)
 
 
 def main():
@@ -279,12 +452,25 @@ def main():
         "--state", default=DEFAULT_STATE,
         help=f"Home state for local partner view (default: {DEFAULT_STATE})"
     )
+    parser.add_argument(
+        "--states", default=None,
+        help="Comma-separated states (or 'all') for per-state reports in subdirectories, e.g. KY,TN,IN,OH"
+    )
     parser.add_argument(
         "--csv", default=None,
         help="Path to veteran org directory CSV (auto-detected if not specified)"
     )
+    parser.add_argument(
+        "--views", default=",".join(VIEWS),
+        help=f"Comma-separated views to generate (default: all of {','.join(VIEWS)})"
+    )
     args = parser.parse_args()
 
+    names = [v.strip() for v in args.views.split(",") if v.strip()]
+    unknown = [v for v in names if v not in VIEWS]
+    if unknown:
+        parser.error(f"unknown view(s): {', '.join(unknown)} (choose from {', '.join(VIEWS)})")
+
     # Find the CSV
     if args.csv:
         csv_path = args.csv
@@ -299,50 +485,28 @@ def main():
     print(f"Loading directory from {csv_path}...")
     df = load_directory(csv_path)
     print(f"Loaded {len(df):,} organizations")
+    stats = directory_stats(df, csv_path)
 
     # Create output directory
     output_dir = Path(__file__).parent / "data" / "output" / "active_heroes"
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Generate all views
-    state = args.state.upper()
-
-    print(f"\n1. Local partners ({state})...")
-    local = view1_local_partners(df, state)
-    local.to_csv(output_dir / "local_partners.csv", index=False, encoding="utf-8-sig")
-    print(f"   {len(local):,} orgs")
-
-    print("2. Potential funders...")
-    funders = view2_potential_funders(df)
-    funders.to_csv(output_dir / "potential_funders.csv", index=False, encoding="utf-8-sig")
-    print(f"   {len(funders):,} prospects")
-
-    print("3. Peer network (mental health / suicide prevention)...")
-    peers = view3_peer_network(df)
-    peers.to_csv(output_dir / "peer_network.csv", index=False, encoding="utf-8-sig")
-    print(f"   {len(peers):,} peer orgs")
-
-    print("4. Gap analysis...")
-    gap = view4_gap_analysis(df)
-    gap.to_csv(output_dir / "underserved_gap_analysis.csv", index=False, encoding="utf-8-sig")
-    print(f"   {len(gap)} states analyzed")
-
-    print("5. Board / advisor prospects...")
-    board = view5_board_prospects(df)
-    board.to_csv(output_dir / "board_prospects.csv", index=False, encoding="utf-8-sig")
-    print(f"   {len(board):,} prospects")
-
-    print("6. Social media partners...")
-    social = view6_social_media_partners(df)
-    social.to_csv(output_dir / "social_media_partners.csv", index=False, encoding="utf-8-sig")
-    print(f"   {len(social):,} orgs with social presence")
-
-    # Generate dashboard
-    print("\nGenerating dashboard...")
-    dashboard = generate_dashboard(df, local, funders, peers, gap, board, social, state)
-    dashboard_path = output_dir / "summary_dashboard.txt"
-    dashboard_path.write_text(dashboard)
-    print(dashboard)
+    if args.states:
+        run_multi_state(df, stats, args.states, names, output_dir)
+    else:
+        # Generate the selected views
+        state = args.state.upper()
+        print(f"\nGenerating {len(names)} view(s) for {state}: {', '.join(names)}")
+        views = run_views(df, stats, state, names, output_dir)
+        for name, frame in views.items():
+            print(f"   {VIEWS[name][0]}: {len(frame):,} rows")
+
+        # Generate dashboard
+        print("\nGenerating dashboard...")
+        dashboard = generate_dashboard(stats, views, state)
+        dashboard_path = output_dir / "summary_dashboard.txt"
+        dashboard_path.write_text(dashboard)
+        print(dashboard)
 
     print(f"\nAll files saved to: {output_dir}")
 
@@ -22,10 +22,42 @@ import streamlit as st
 from config.schema import (
     CONFIDENCE_TIERS,
     FIELD_GROUPS,
+    FILLED_COLUMNS,
     GRADE_INFO,
     GRADE_OPTIONS,
     LEGACY_GRADE_MAP,
+    decode_confidence_detail,
 )
+from dashboard.export import EXPORT_FORMATS, export_bytes, export_key
+from dashboard.filters import apply_filters, cube_filters
+from dashboard.formatting import (
+    cluster_hover_labels,
+    format_count,
+    format_currency,
+    org_hover_labels,
+    state_hover_text,
+)
+from dashboard.map_clusters import (
+    MAX_ZOOM,
+    cell_bounds,
+    cluster_level_for_zoom,
+    cluster_points,
+    in_cell,
+    tile_coords,
+    zoom_for_bounds,
+)
+from dashboard.org_index import OrgIndex
+from loaders.cube import (
+    CUBE_FILENAME,
+    build_cube,
+    cube_counts,
+    cube_state_summary,
+    cube_totals,
+    load_cube,
+    remap_dimension,
+    slice_cube,
+)
+from utils.buckets import EMPLOYEE_LABELS, REVENUE_FILTER_GROUPS, REVENUE_LABELS, revenue_bucket
 
 # ── Page Config ────────────────────────────────────────────────────────
 st.set_page_config(
@@ -192,13 +224,8 @@ def grade_badge_html(grade, show_label=True):
     return f'<span class="grade-badge grade-{grade}">{info.get("label", grade)}</span>'
 
 
-def render_confidence_breakdown(detail_json):
-    """Render 3-column grid of field-group cards from a confidence_detail JSON string."""
-    try:
-        detail = json.loads(detail_json) if isinstance(detail_json, str) else detail_json
-    except (json.JSONDecodeError, TypeError):
-        return ""
-
+def render_confidence_breakdown(detail):
+    """Render 3-column grid of field-group cards from a decode_confidence_detail() dict."""
     groups = detail.get("groups", {})
     cards = ""
     for gkey, gdata in groups.items():
@@ -225,18 +252,6 @@ def render_confidence_breakdown(detail_json):
     return f'<div class="conf-grid">{cards}</div>'
 
 
-def format_currency(val):
-    if pd.isna(val):
-        return "N/A"
-    if val >= 1_000_000_000:
-        return f"${val / 1_000_000_000:.1f}B"
-    if val >= 1_000_000:
-        return f"${val / 1_000_000:.1f}M"
-    if val >= 1_000:
-        return f"${val / 1_000:.0f}K"
-    return f"${val:.0f}"
-
-
 def detail_row(label, value, is_link=False):
     """Render a single label: value row, with gray 'Not available' for missing data."""
     if pd.isna(value) or (isinstance(value, str) and value.strip() == ""):
@@ -260,21 +275,47 @@ def google_search_url(org_name):
     return f"https://www.google.com/search?q={quote_plus(org_name)}"
 
 
-def render_org_detail(df, ein):
-    """Render a full-page detail view for the organization matching the given EIN."""
-    matches = df[df["ein"] == ein]
-    if len(matches) == 0:
+@st.cache_data(ttl=300, max_entries=8, show_spinner="Preparing export…")
+def build_export(_frame: pd.DataFrame, cache_key: str, fmt: str) -> bytes:
+    """Serialize an export; ``cache_key`` identifies the frame, which is not hashed."""
+    return export_bytes(_frame, fmt)
+
+
+def render_export(frame, label, file_stem, key, cache_parts):
+    """Export controls that only serialize the frame after the user asks for it."""
+    fc1, fc2 = st.columns([1, 3])
+    with fc1:
+        fmt = st.selectbox("Format", list(EXPORT_FORMATS), key=f"{key}_format", label_visibility="collapsed")
+    cache_key = export_key(key, fmt, *cache_parts)
+    with fc2:
+        if st.button(label, key=f"{key}_prepare"):
+            st.session_state[f"{key}_export"] = cache_key
+    if st.session_state.get(f"{key}_export") == cache_key:
+        ext, mime = EXPORT_FORMATS[fmt]
+        st.download_button(
+            label=f"Save {file_stem}{ext}",
+            data=build_export(frame, cache_key, fmt),
+            file_name=f"{file_stem}{ext}",
+            mime=mime,
+            key=f"{key}_download",
+        )
+
+
+def render_org_detail(df, org_id, org_index):
+    """Render a full-page detail view for the organization with the given org_id."""
+    pos = org_index.position_for_id(org_id)
+    if pos is None:
         st.warning("Organization not found.")
         if st.button("Back to Directory"):
-            st.session_state.pop("selected_org_ein", None)
+            st.session_state.pop("selected_org_id", None)
             st.rerun()
         return
 
-    row = matches.iloc[0]
+    row = df.iloc[pos]
 
     # ── Back button ──
     if st.button("← Back to Directory"):
-        st.session_state.pop("selected_org_ein", None)
+        st.session_state.pop("selected_org_id", None)
         st.rerun()
 
     # ── Hero header ──
@@ -300,9 +341,9 @@ def render_org_detail(df, ein):
     )
 
     # ── Confidence breakdown ──
-    detail_json = row.get("confidence_detail")
-    if pd.notna(detail_json):
-        st.markdown(render_confidence_breakdown(detail_json), unsafe_allow_html=True)
+    detail = decode_confidence_detail(row)
+    if detail:
+        st.markdown(render_confidence_breakdown(detail), unsafe_allow_html=True)
 
     # ── Identity / Location / Classification ──
     c1, c2, c3 = st.columns(3)
@@ -512,6 +553,7 @@ def render_org_detail(df, ein):
 # ── Data ──────────────────────────────────────────────────────────────
 DATA_DIR = Path(__file__).parent / "data" / "output"
 CSV_PATH = DATA_DIR / "veteran_org_directory.csv"
+CUBE_PATH = DATA_DIR / CUBE_FILENAME
 
 STATE_ABBREV_TO_NAME = {
     "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
@@ -605,14 +647,42 @@ STATE_BOUNDS = {
 @st.cache_data(ttl=300)
 def load_data() -> pd.DataFrame:
     df = pd.read_csv(CSV_PATH, dtype=str, low_memory=False)
+    if "org_id" not in df.columns:
+        # Outputs written before org ids existed: EINs are the only stable key
+        df["org_id"] = df["ein"]
     for col in ["total_revenue", "total_expenses", "total_assets", "net_assets",
                  "charity_navigator_rating", "charity_navigator_score",
                  "confidence_score", "num_employees"]:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
+    if "total_revenue" in df.columns:
+        df["annual_revenue_range"] = revenue_bucket(df["total_revenue"])
+    # Compact confidence breakdown: small counts and a 5-bit source mask
+    for col in [*FILLED_COLUMNS.values(), "confidence_sources"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int8")
     return df
 
 
+@st.cache_data(ttl=300)
+def load_directory_cube(_df: pd.DataFrame, data_version: int) -> pd.DataFrame:
+    """Stage 8 cube with display tiers, rebuilt from rows if missing or stale.
+
+    ``data_version`` (the CSV mtime) is the cache key; the frame itself is
+    not hashed.
+    """
+    if CUBE_PATH.exists() and CUBE_PATH.stat().st_mtime_ns >= data_version:
+        cube = load_cube(CUBE_PATH)
+        return remap_dimension(cube, "confidence_grade", LEGACY_GRADE_MAP, default="Partial")
+    return build_cube(_df)
+
+
+@st.cache_resource(ttl=300)
+def load_org_index(_df: pd.DataFrame, data_version: int) -> OrgIndex:
+    """EIN/name lookup index for the loaded frame, keyed on dataset version."""
+    return OrgIndex(_df)
+
+
 @st.cache_data(ttl=3600)
 def geocode_zips(zip_series: pd.Series) -> pd.DataFrame:
     """Batch geocode 5-digit ZIP codes → lat/lng using pgeocode."""
@@ -645,6 +715,10 @@ df["lng"] = geo["longitude"].values
 if "confidence_grade" in df.columns:
     df["confidence_grade"] = df["confidence_grade"].map(LEGACY_GRADE_MAP).fillna("Partial")
 
+data_version = CSV_PATH.stat().st_mtime_ns
+directory_cube = load_directory_cube(df, data_version)
+org_index = load_org_index(df, data_version)
+
 # ── Sidebar ───────────────────────────────────────────────────────────
 st.sidebar.markdown(
     '<div style="text-align:center; padding: 0.5rem 0 1rem 0;">'
@@ -667,7 +741,7 @@ selected_grades = st.sidebar.multiselect(
 
 # Tier distribution summary
 if "confidence_grade" in df.columns:
-    grade_counts = df["confidence_grade"].value_counts()
+    grade_counts = cube_counts(directory_cube, "confidence_grade")
     dist_parts = []
     for t in CONFIDENCE_TIERS:
         g = t["grade"]
@@ -706,7 +780,7 @@ with st.sidebar.expander("Advanced Filters"):
     all_org_types = sorted(df["org_type"].dropna().unique().tolist())
     selected_org_types = st.sidebar.multiselect("Organization Type", all_org_types, default=[])
 
-    rev_options = ["Any", "Under $50K", "$50K–$500K", "$500K–$1M", "$1M–$10M", "$10M–$100M", "$100M+"]
+    rev_options = ["Any", *REVENUE_FILTER_GROUPS]
     selected_revenue = st.selectbox("Revenue Range", rev_options)
 
     va_filter = st.selectbox("VA Accredited", ["Any", "Yes", "No"])
@@ -715,7 +789,7 @@ with st.sidebar.expander("Advanced Filters"):
 
     has_contact = st.checkbox("Has contact info (phone, email, or website)")
 
-    emp_options = ["Any", "1–10", "11–50", "51–200", "201–1000", "1000+"]
+    emp_options = ["Any", *EMPLOYEE_LABELS]
     selected_employees = st.selectbox("Employee Count", emp_options)
 
     min_confidence = st.slider("Min Confidence Score", 0.0, 1.0, 0.0, 0.05)
@@ -729,85 +803,34 @@ st.sidebar.markdown(
 )
 
 # ── Apply Filters ─────────────────────────────────────────────────────
-filtered = df.copy()
-
-if search_query:
-    mask = filtered["org_name"].str.contains(search_query, case=False, na=False)
-    for col in ["city", "mission_statement", "services_offered", "service_categories", "eligibility_requirements"]:
-        if col in filtered.columns:
-            mask |= filtered[col].str.contains(search_query, case=False, na=False)
-    filtered = filtered[mask]
-
-if selected_grades and "confidence_grade" in filtered.columns:
-    filtered = filtered[filtered["confidence_grade"].isin(selected_grades)]
-
-if selected_states:
-    filtered = filtered[filtered["state"].isin(selected_states)]
-
-if city_query:
-    filtered = filtered[filtered["city"].str.contains(city_query, case=False, na=False)]
-
-if zip_query:
-    filtered = filtered[filtered["zip_code"].str.startswith(zip_query, na=False)]
-
-if selected_categories:
-    cat_mask = pd.Series(False, index=filtered.index)
-    for cat in selected_categories:
-        cat_mask |= filtered["service_categories"].str.contains(cat, case=False, na=False)
-    filtered = filtered[cat_mask]
-
-if selected_org_types:
-    filtered = filtered[filtered["org_type"].isin(selected_org_types)]
-
-if selected_revenue != "Any":
-    rev_ranges = {
-        "Under $50K": (0, 50_000),
-        "$50K–$500K": (50_000, 500_000),
-        "$500K–$1M": (500_000, 1_000_000),
-        "$1M–$10M": (1_000_000, 10_000_000),
-        "$10M–$100M": (10_000_000, 100_000_000),
-        "$100M+": (100_000_000, float("inf")),
-    }
-    low, high = rev_ranges[selected_revenue]
-    filtered = filtered[
-        (filtered["total_revenue"] >= low) & (filtered["total_revenue"] <= high)
-    ]
-
-if va_filter == "Yes":
-    filtered = filtered[filtered["va_accredited"] == "Yes"]
-elif va_filter == "No":
-    filtered = filtered[filtered["va_accredited"] != "Yes"]
-
-if ntee_input:
-    filtered = filtered[filtered["ntee_code"].str.startswith(ntee_input.upper(), na=False)]
-
-if has_contact:
-    contact_mask = pd.Series(False, index=filtered.index)
-    for col in ["phone", "email", "website"]:
-        if col in filtered.columns:
-            contact_mask |= filtered[col].notna() & (filtered[col].str.strip() != "")
-    filtered = filtered[contact_mask]
-
-if selected_employees != "Any":
-    emp_ranges = {
-        "1–10": (1, 10),
-        "11–50": (11, 50),
-        "51–200": (51, 200),
-        "201–1000": (201, 1000),
-        "1000+": (1000, float("inf")),
-    }
-    emp_low, emp_high = emp_ranges[selected_employees]
-    filtered = filtered[
-        filtered["num_employees"].notna()
-        & (filtered["num_employees"] >= emp_low)
-        & (filtered["num_employees"] <= emp_high)
-    ]
+filters = {
+    "search": search_query,
+    "grades": selected_grades,
+    "states": selected_states,
+    "city": city_query,
+    "zip": zip_query,
+    "categories": selected_categories,
+    "org_types": selected_org_types,
+    "revenue": selected_revenue,
+    "va": va_filter,
+    "ntee": ntee_input,
+    "has_contact": has_contact,
+    "employees": selected_employees,
+    "min_confidence": min_confidence,
+}
+filtered = apply_filters(df, filters)
 
-if min_confidence > 0:
-    filtered = filtered[filtered["confidence_score"] >= min_confidence]
+# Summary charts read from the cube; only non-cube filters force a
+# re-aggregation of the filtered rows.
+cube_slice = cube_filters(filters)
+if cube_slice is not None:
+    summary_cube = slice_cube(directory_cube, **cube_slice)
+else:
+    summary_cube = build_cube(filtered)
+summary_totals = cube_totals(summary_cube)
 
 # ── Hero Header ───────────────────────────────────────────────────────
-avg_conf = filtered["confidence_score"].mean() if len(filtered) > 0 else 0
+avg_conf = summary_totals["avg_confidence"] if len(filtered) > 0 else 0
 st.markdown(f"""
 <div class="hero-header">
     <h1>Veteran Organization Directory</h1>
@@ -816,8 +839,8 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 # ── Page Routing: Detail Page vs Tab Layout ──────────────────────────
-if st.session_state.get("selected_org_ein"):
-    render_org_detail(df, st.session_state["selected_org_ein"])
+if st.session_state.get("selected_org_id"):
+    render_org_detail(df, st.session_state["selected_org_id"], org_index)
     st.stop()
 
 # ── Tab Layout ────────────────────────────────────────────────────────
@@ -832,7 +855,7 @@ with tab_overview:
     with col1:
         st.markdown(metric_card("Total Organizations", f"{len(filtered):,}", "🏢", NAVY), unsafe_allow_html=True)
     with col2:
-        _all_regions = filtered["state"].dropna().unique()
+        _all_regions = cube_counts(summary_cube, "state").index
         _n_states = sum(1 for s in _all_regions if s in US_STATE_CODES)
         _n_territories = sum(1 for s in _all_regions if s in US_TERRITORIES)
         _n_military = sum(1 for s in _all_regions if s in MILITARY_MAIL)
@@ -845,17 +868,18 @@ with tab_overview:
             _label_parts.append(f"{_n_military} Military")
         st.markdown(metric_card(" · ".join(_label_parts), _val, "🗺️", "#2C5282"), unsafe_allow_html=True)
     with col3:
-        st.markdown(metric_card("Total Revenue", format_currency(filtered["total_revenue"].sum()), "💰", GREEN), unsafe_allow_html=True)
+        st.markdown(metric_card("Total Revenue", format_currency(summary_totals["revenue_sum"]), "💰", GREEN), unsafe_allow_html=True)
     with col4:
-        st.markdown(metric_card("VA Accredited", f"{(filtered['va_accredited'] == 'Yes').sum():,}", "🛡️", "#D69E2E"), unsafe_allow_html=True)
+        st.markdown(metric_card("VA Accredited", f"{summary_totals['va_accredited']:,}", "🛡️", "#D69E2E"), unsafe_allow_html=True)
 
+    type_counts = cube_counts(summary_cube, "org_type")
     col5, col6, col7, col8 = st.columns(4)
     with col5:
-        st.markdown(metric_card("With Financials", f"{filtered['total_revenue'].notna().sum():,}", "📊", "#2C5282"), unsafe_allow_html=True)
+        st.markdown(metric_card("With Financials", f"{summary_totals['with_financials']:,}", "📊", "#2C5282"), unsafe_allow_html=True)
     with col6:
-        st.markdown(metric_card("501(c)(19) Orgs", f"{(filtered['org_type'] == '501(c)(19)').sum():,}", "🎖️", NAVY), unsafe_allow_html=True)
+        st.markdown(metric_card("501(c)(19) Orgs", f"{type_counts.get('501(c)(19)', 0):,}", "🎖️", NAVY), unsafe_allow_html=True)
     with col7:
-        st.markdown(metric_card("501(c)(3) Orgs", f"{(filtered['org_type'] == '501(c)(3)').sum():,}", "🏛️", GREEN), unsafe_allow_html=True)
+        st.markdown(metric_card("501(c)(3) Orgs", f"{type_counts.get('501(c)(3)', 0):,}", "🏛️", GREEN), unsafe_allow_html=True)
     with col8:
         avg_str = f"{avg_conf:.2f}" if len(filtered) > 0 else "N/A"
         st.markdown(metric_card("Avg Confidence", avg_str, "📈", "#D69E2E"), unsafe_allow_html=True)
@@ -866,7 +890,7 @@ with tab_overview:
     if "confidence_grade" in filtered.columns:
         st.subheader("Data Tier Distribution")
         tier_order = [t["grade"] for t in CONFIDENCE_TIERS]
-        grade_cts = filtered["confidence_grade"].value_counts()
+        grade_cts = cube_counts(summary_cube, "confidence_grade")
         grade_df = pd.DataFrame([
             {
                 "Tier": g,
@@ -890,18 +914,15 @@ with tab_overview:
     c1, c2 = st.columns(2)
     with c1:
         st.subheader("By Organization Type")
-        type_counts = filtered["org_type"].value_counts().head(8)
-        fig_type = px.pie(values=type_counts.values, names=type_counts.index, hole=0.4)
+        top_types = type_counts.head(8)
+        fig_type = px.pie(values=top_types.values, names=top_types.index, hole=0.4)
         style_chart(fig_type, height=350)
         st.plotly_chart(fig_type, use_container_width=True)
 
     with c2:
         st.subheader("By Revenue Range")
-        rev_counts = filtered["annual_revenue_range"].value_counts()
-        rev_order = ["$0", "Under $50K", "$50K–$100K", "$100K–$500K",
-                      "$500K–$1M", "$1M–$5M", "$5M–$10M", "$10M–$50M",
-                      "$50M–$100M", "$100M+"]
-        rev_ordered = rev_counts.reindex([r for r in rev_order if r in rev_counts.index]).dropna()
+        rev_counts = cube_counts(summary_cube, "annual_revenue_range")
+        rev_ordered = rev_counts.reindex([r for r in REVENUE_LABELS if r in rev_counts.index]).dropna()
         if len(rev_ordered) > 0:
             rev_df = pd.DataFrame({"Revenue Range": rev_ordered.index, "Count": rev_ordered.values})
             fig_rev = px.bar(rev_df, x="Revenue Range", y="Count")
@@ -913,21 +934,9 @@ with tab_overview:
     # Interactive state map
     st.subheader("Organizations by State")
     st.caption("Hover for state details. Click a state to explore its organizations in the Map tab.")
-    overview_state_data = filtered.groupby("state").agg(
-        org_count=("org_name", "count"),
-        total_revenue=("total_revenue", "sum"),
-        va_accredited=("va_accredited", lambda x: (x == "Yes").sum()),
-    ).reset_index()
+    overview_state_data = cube_state_summary(summary_cube)
     overview_state_data["state_name"] = overview_state_data["state"].map(STATE_ABBREV_TO_NAME)
-    overview_state_data["hover_text"] = overview_state_data.apply(
-        lambda r: (
-            f"<b>{r['state_name']}</b><br>"
-            f"Organizations: {int(r['org_count']):,}<br>"
-            f"Total Revenue: {format_currency(r['total_revenue'])}<br>"
-            f"VA Accredited: {int(r['va_accredited']):,}"
-        ),
-        axis=1,
-    )
+    overview_state_data["hover_text"] = state_hover_text(overview_state_data)
     fig_overview_map = go.Figure(go.Choropleth(
         locations=overview_state_data["state"],
         z=overview_state_data["org_count"],
@@ -998,7 +1007,7 @@ with tab_explore:
 
         for idx in selected_rows:
             org = display_df.iloc[idx]
-            org_ein = org.get("ein", "")
+            org_id = filtered.at[org.name, "org_id"]
             org_name = org.get("org_name", "Unknown")
             grade = org.get("confidence_grade", "Partial") if pd.notna(org.get("confidence_grade")) else "Partial"
             city = org.get("city", "") if pd.notna(org.get("city")) else ""
@@ -1009,8 +1018,8 @@ with tab_explore:
 
             col_btn, col_info = st.columns([1, 3])
             with col_btn:
-                if st.button(f"**{org_name}**", key=f"nav_{org_ein}", use_container_width=True):
-                    st.session_state["selected_org_ein"] = org_ein
+                if st.button(f"**{org_name}**", key=f"nav_{org_id}", use_container_width=True):
+                    st.session_state["selected_org_id"] = org_id
                     st.rerun()
             with col_info:
                 st.markdown(
@@ -1018,12 +1027,9 @@ with tab_explore:
                     unsafe_allow_html=True,
                 )
 
-    csv_export = filtered.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        label=f"Download filtered results ({len(filtered):,} orgs)",
-        data=csv_export,
-        file_name="vet_org_filtered.csv",
-        mime="text/csv",
+    render_export(
+        filtered, f"Download filtered results ({len(filtered):,} orgs)",
+        "vet_org_filtered", "explore", (filters, data_version),
     )
 
     # Organization Search → View Full Profile
@@ -1031,10 +1037,12 @@ with tab_explore:
     st.subheader("Search for an Organization")
     org_search = st.text_input("Search by name", key="detail_search")
     if org_search:
-        matches = filtered[filtered["org_name"].str.contains(org_search, case=False, na=False)]
-        if len(matches) > 0:
-            selected_org = st.selectbox("Select organization", matches["org_name"].tolist()[:20])
-            org_row = matches[matches["org_name"] == selected_org].iloc[0]
+        # load_data() keeps a RangeIndex, so filtered's labels are row positions in df
+        within = filtered.index.to_numpy()
+        match_names = org_index.search_names(org_search, within=within)
+        if match_names:
+            selected_org = st.selectbox("Select organization", match_names)
+            org_row = df.iloc[org_index.positions_for_name(selected_org, within=within)[0]]
 
             # Brief preview
             grade = org_row.get("confidence_grade", "Partial") if pd.notna(org_row.get("confidence_grade")) else "Partial"
@@ -1046,7 +1054,7 @@ with tab_explore:
             )
 
             if st.button("View Full Profile", key="view_profile_btn"):
-                st.session_state["selected_org_ein"] = org_row.get("ein")
+                st.session_state["selected_org_id"] = org_row.get("org_id")
                 st.rerun()
         else:
             st.info("No organizations found matching your search.")
@@ -1066,27 +1074,11 @@ with tab_map:
         st.caption("Hover over a state to see summary data. Click a state to drill down and explore individual organizations.")
 
         # Build state summary for hover + table
-        state_summary = filtered.groupby("state").agg(
-            org_count=("org_name", "count"),
-            total_revenue=("total_revenue", "sum"),
-            avg_revenue=("total_revenue", "mean"),
-            va_accredited=("va_accredited", lambda x: (x == "Yes").sum()),
-            with_financials=("total_revenue", lambda x: x.notna().sum()),
-        ).reset_index().sort_values("org_count", ascending=False)
+        state_summary = cube_state_summary(summary_cube).sort_values("org_count", ascending=False)
         state_summary["state_name"] = state_summary["state"].map(STATE_ABBREV_TO_NAME)
 
         # Rich hover text
-        state_summary["hover_text"] = state_summary.apply(
-            lambda r: (
-                f"<b>{r['state_name']}</b><br>"
-                f"Organizations: {int(r['org_count']):,}<br>"
-                f"Total Revenue: {format_currency(r['total_revenue'])}<br>"
-                f"VA Accredited: {int(r['va_accredited']):,}<br>"
-                f"With Financials: {int(r['with_financials']):,}<br>"
-                f"<i>Click to explore →</i>"
-            ),
-            axis=1,
-        )
+        state_summary["hover_text"] = state_hover_text(state_summary, click_hint=True)
 
         fig_map = go.Figure(go.Choropleth(
             locations=state_summary["state"],
@@ -1159,127 +1151,160 @@ with tab_map:
                 enriched_cnt = (state_orgs["confidence_grade"] == "Enriched").sum()
                 st.markdown(metric_card("Enriched Data", f"{enriched_cnt:,}", "📊", BLUE), unsafe_allow_html=True)
 
-            # Cap for performance
+            # Points are drawn individually up to this many; denser views are
+            # shown as quadtree clusters that drill down on click.
             MAP_POINT_LIMIT = 5000
-            plot_orgs = state_orgs
-            if len(plot_orgs) > MAP_POINT_LIMIT:
-                st.info(f"Showing {MAP_POINT_LIMIT:,} of {len(state_orgs):,} orgs. Use sidebar filters to narrow.")
-                plot_orgs = plot_orgs.head(MAP_POINT_LIMIT)
+
+            # Drill-down path through the cluster quadtree: [(level, x, y), ...]
+            cluster_nav = st.session_state.get("map_cluster_nav")
+            if not cluster_nav or cluster_nav["state"] != focused_state:
+                cluster_nav = {"state": focused_state, "path": []}
+                st.session_state["map_cluster_nav"] = cluster_nav
+            cluster_path = cluster_nav["path"]
 
             # Use real geocoded lat/lng; drop orgs without coordinates
-            plot_orgs = plot_orgs.dropna(subset=["lat", "lng"]).copy()
+            plot_orgs = state_orgs.dropna(subset=["lat", "lng"]).copy()
+            # Quadtree tiles live on the map frame only, never on df (exports, tables)
+            plot_orgs["tile_x"], plot_orgs["tile_y"] = tile_coords(plot_orgs["lat"], plot_orgs["lng"])
+            for level, cell_x, cell_y in cluster_path:
+                plot_orgs = plot_orgs[in_cell(plot_orgs, level, cell_x, cell_y)]
+
+            if cluster_path:
+                if st.button("← Zoom out", key="map_zoom_out"):
+                    cluster_path.pop()
+                    st.rerun()
+
             if len(plot_orgs) == 0:
-                st.info("No geocoded locations available for this state.")
+                st.info("No geocoded locations available for this area.")
                 if st.button("← Back to National Map", key="back_nogeo"):
                     st.session_state["map_focused_state"] = None
                     st.rerun()
-
-            # Compute bounding box from actual data points
-            lat_min, lat_max = plot_orgs["lat"].min(), plot_orgs["lat"].max()
-            lon_min, lon_max = plot_orgs["lng"].min(), plot_orgs["lng"].max()
-            # Fall back to state bounds if data is too tight (e.g. single point)
-            if lat_max - lat_min < 0.5 or lon_max - lon_min < 0.5:
-                bounds = STATE_BOUNDS.get(focused_state)
-                if bounds:
-                    lat_min, lat_max, lon_min, lon_max = bounds
-
-            plot_orgs["hover_label"] = plot_orgs.apply(
-                lambda r: (
-                    f"<b>{r.get('org_name', 'N/A')}</b><br>"
-                    f"{r.get('city', '')} {r.get('state', '')}<br>"
-                    f"Type: {r.get('org_type', 'N/A')}<br>"
-                    f"Revenue: {format_currency(r.get('total_revenue'))}<br>"
-                    f"Tier: {r.get('confidence_grade', 'N/A')}"
-                ),
-                axis=1,
-            )
-
-            # Color by data tier
-            tier_colors = {"Enriched": "#2F855A", "Baseline": "#2C5282", "Partial": "#D69E2E"}
-            plot_orgs["dot_color"] = plot_orgs["confidence_grade"].map(tier_colors).fillna("#718096")
-
-            # Compute center and zoom from bounding box
-            center_lat = (lat_min + lat_max) / 2
-            center_lon = (lon_min + lon_max) / 2
-            lat_span = lat_max - lat_min
-            lon_span = lon_max - lon_min
-            max_span = max(lat_span, lon_span)
-            # Approximate mapbox zoom from span
-            if max_span > 15:
-                zoom = 4
-            elif max_span > 8:
-                zoom = 5
-            elif max_span > 4:
-                zoom = 6
-            elif max_span > 2:
-                zoom = 7
-            elif max_span > 1:
-                zoom = 8
             else:
-                zoom = 9
-
-            fig_state = go.Figure()
-            fig_state.add_trace(go.Scattermapbox(
-                lat=plot_orgs["lat"],
-                lon=plot_orgs["lng"],
-                text=plot_orgs["hover_label"],
-                hoverinfo="text",
-                marker=dict(
-                    size=9,
-                    color=plot_orgs["dot_color"],
-                    opacity=0.75,
-                ),
-            ))
-            fig_state.update_layout(
-                mapbox=dict(
-                    style="carto-positron",
-                    center=dict(lat=center_lat, lon=center_lon),
-                    zoom=zoom,
-                ),
-                margin=dict(l=0, r=0, t=0, b=0),
-                height=550,
-            )
-
-            state_map_event = st.plotly_chart(
-                fig_state, use_container_width=True,
-                on_select="rerun", key="state_org_map",
-            )
+                # Compute bounding box from actual data points
+                lat_min, lat_max = plot_orgs["lat"].min(), plot_orgs["lat"].max()
+                lon_min, lon_max = plot_orgs["lng"].min(), plot_orgs["lng"].max()
+                # Fall back to the drilled cell (or state) bounds if data is too tight
+                if lat_max - lat_min < 0.5 or lon_max - lon_min < 0.5:
+                    bounds = cell_bounds(*cluster_path[-1]) if cluster_path else STATE_BOUNDS.get(focused_state)
+                    if bounds:
+                        lat_min, lat_max, lon_min, lon_max = bounds
+
+                center_lat = (lat_min + lat_max) / 2
+                center_lon = (lon_min + lon_max) / 2
+                zoom = zoom_for_bounds(lat_min, lat_max, lon_min, lon_max)
+
+                # Cluster when the view is too dense, always drilling at least one
+                # quadtree level below the cell we are already inside.
+                cluster_level = cluster_level_for_zoom(zoom)
+                if cluster_path:
+                    cluster_level = max(cluster_level, min(cluster_path[-1][0] + 1, MAX_ZOOM))
+                show_clusters = len(plot_orgs) > MAP_POINT_LIMIT and (
+                    not cluster_path or cluster_path[-1][0] < MAX_ZOOM
+                )
 
-            # Handle dot click — show org detail card
-            if state_map_event and state_map_event.selection and state_map_event.selection.points:
-                pt = state_map_event.selection.points[0]
-                pt_idx = pt.get("point_index")
-                if pt_idx is not None and pt_idx < len(plot_orgs):
-                    org = plot_orgs.iloc[pt_idx]
-                    o_ein = org.get("ein", "")
-                    o_name = org.get("org_name", "Unknown")
-                    o_city = org.get("city", "") if pd.notna(org.get("city")) else ""
-                    o_state = org.get("state", "") if pd.notna(org.get("state")) else ""
-                    o_type = org.get("org_type", "") if pd.notna(org.get("org_type")) else ""
-                    o_rev = format_currency(org.get("total_revenue"))
-                    o_grade = org.get("confidence_grade", "Partial") if pd.notna(org.get("confidence_grade")) else "Partial"
-                    o_phone = org.get("phone", "") if pd.notna(org.get("phone")) else ""
-                    o_email = org.get("email", "") if pd.notna(org.get("email")) else ""
-                    o_website = org.get("website", "") if pd.notna(org.get("website")) else ""
-                    search_url = google_search_url(o_name)
-                    web_html = f'<a href="{o_website}" target="_blank">{o_website}</a>' if o_website else f'<a href="{search_url}" target="_blank">Search online</a>'
-
-                    st.markdown(
-                        f'<div class="detail-section" style="border-top:3px solid {NAVY};">'
-                        f'<h4 style="color:{NAVY};">{o_name}</h4>'
-                        f'<p>{grade_badge_html(o_grade)} &nbsp; '
-                        f'{o_city}, {o_state} · {o_type} · Revenue: {o_rev}</p>'
-                        f'{detail_row("EIN", o_ein)}'
-                        f'{detail_row("Phone", o_phone if o_phone else None)}'
-                        f'{detail_row("Email", o_email if o_email else None)}'
-                        f'<p><strong>Website:</strong> {web_html}</p>'
-                        f'</div>',
-                        unsafe_allow_html=True,
+                fig_state = go.Figure()
+                if show_clusters:
+                    clusters = cluster_points(plot_orgs, cluster_level)
+                    st.info(
+                        f"{len(plot_orgs):,} orgs grouped into {len(clusters):,} clusters. "
+                        "Click a cluster to zoom in."
                     )
-                    if st.button(f"View Full Profile — {o_name}", key="map_view_profile"):
-                        st.session_state["selected_org_ein"] = o_ein
+                    clusters["hover_label"] = cluster_hover_labels(clusters)
+                    fig_state.add_trace(go.Scattermapbox(
+                        lat=clusters["lat"],
+                        lon=clusters["lng"],
+                        mode="markers+text",
+                        text=format_count(clusters["count"]),
+                        hovertext=clusters["hover_label"],
+                        hoverinfo="text",
+                        textfont=dict(color="white", size=11),
+                        marker=dict(
+                            size=np.clip(np.sqrt(clusters["count"]) * 2.5, 14, 60),
+                            color=NAVY,
+                            opacity=0.8,
+                        ),
+                    ))
+                else:
+                    if len(plot_orgs) > MAP_POINT_LIMIT:
+                        # Only reachable when many orgs share one ZIP centroid
+                        plot_orgs = plot_orgs.head(MAP_POINT_LIMIT)
+
+                    plot_orgs = plot_orgs.copy()
+                    plot_orgs["hover_label"] = org_hover_labels(plot_orgs)
+
+                    # Color by data tier
+                    tier_colors = {"Enriched": "#2F855A", "Baseline": "#2C5282", "Partial": "#D69E2E"}
+                    plot_orgs["dot_color"] = plot_orgs["confidence_grade"].map(tier_colors).fillna("#718096")
+
+                    fig_state.add_trace(go.Scattermapbox(
+                        lat=plot_orgs["lat"],
+                        lon=plot_orgs["lng"],
+                        text=plot_orgs["hover_label"],
+                        hoverinfo="text",
+                        marker=dict(
+                            size=9,
+                            color=plot_orgs["dot_color"],
+                            opacity=0.75,
+                        ),
+                    ))
+                fig_state.update_layout(
+                    mapbox=dict(
+                        style="carto-positron",
+                        center=dict(lat=center_lat, lon=center_lon),
+                        zoom=zoom,
+                    ),
+                    margin=dict(l=0, r=0, t=0, b=0),
+                    height=550,
+                )
+
+                state_map_event = st.plotly_chart(
+                    fig_state, use_container_width=True,
+                    on_select="rerun", key="state_org_map",
+                )
+
+                # Handle cluster click — drill into that quadtree cell
+                if show_clusters and state_map_event and state_map_event.selection and state_map_event.selection.points:
+                    pt_idx = state_map_event.selection.points[0].get("point_index")
+                    if pt_idx is not None and pt_idx < len(clusters):
+                        cell = clusters.iloc[pt_idx]
+                        cluster_path.append((cluster_level, int(cell["cell_x"]), int(cell["cell_y"])))
                         st.rerun()
 
+                # Handle dot click — show org detail card
+                if not show_clusters and state_map_event and state_map_event.selection and state_map_event.selection.points:
+                    pt = state_map_event.selection.points[0]
+                    pt_idx = pt.get("point_index")
+                    if pt_idx is not None and pt_idx < len(plot_orgs):
+                        org = plot_orgs.iloc[pt_idx]
+                        o_ein = org.get("ein", "")
+                        o_name = org.get("org_name", "Unknown")
+                        o_city = org.get("city", "") if pd.notna(org.get("city")) else ""
+                        o_state = org.get("state", "") if pd.notna(org.get("state")) else ""
+                        o_type = org.get("org_type", "") if pd.notna(org.get("org_type")) else ""
+                        o_rev = format_currency(org.get("total_revenue"))
+                        o_grade = org.get("confidence_grade", "Partial") if pd.notna(org.get("confidence_grade")) else "Partial"
+                        o_phone = org.get("phone", "") if pd.notna(org.get("phone")) else ""
+                        o_email = org.get("email", "") if pd.notna(org.get("email")) else ""
+                        o_website = org.get("website", "") if pd.notna(org.get("website")) else ""
+                        search_url = google_search_url(o_name)
+                        web_html = f'<a href="{o_website}" target="_blank">{o_website}</a>' if o_website else f'<a href="{search_url}" target="_blank">Search online</a>'
+
+                        st.markdown(
+                            f'<div class="detail-section" style="border-top:3px solid {NAVY};">'
+                            f'<h4 style="color:{NAVY};">{o_name}</h4>'
+                            f'<p>{grade_badge_html(o_grade)} &nbsp; '
+                            f'{o_city}, {o_state} · {o_type} · Revenue: {o_rev}</p>'
+                            f'{detail_row("EIN", o_ein)}'
+                            f'{detail_row("Phone", o_phone if o_phone else None)}'
+                            f'{detail_row("Email", o_email if o_email else None)}'
+                            f'<p><strong>Website:</strong> {web_html}</p>'
+                            f'</div>',
+                            unsafe_allow_html=True,
+                        )
+                        if st.button(f"View Full Profile — {o_name}", key="map_view_profile"):
+                            st.session_state["selected_org_id"] = org.get("org_id")
+                            st.rerun()
+
             # Tier legend
             st.markdown(
                 '<div style="font-size:0.82rem; color:#718096; margin-top:0.5rem;">'
@@ -1329,12 +1354,9 @@ with tab_funders:
         },
     )
 
-    csv_funders = funders[available].to_csv(index=False).encode("utf-8")
-    st.download_button(
-        label=f"Download funder list ({len(funders):,} orgs)",
-        data=csv_funders,
-        file_name="potential_funders.csv",
-        mime="text/csv",
+    render_export(
+        funders[available], f"Download funder list ({len(funders):,} orgs)",
+        "potential_funders", "funders", (filters, data_version),
     )
 
 
@@ -1390,12 +1412,9 @@ with tab_peers:
         },
     )
 
-    csv_peers = peers[available].to_csv(index=False).encode("utf-8")
-    st.download_button(
-        label=f"Download peer network ({len(peers):,} orgs)",
-        data=csv_peers,
-        file_name="peer_network.csv",
-        mime="text/csv",
+    render_export(
+        peers[available], f"Download peer network ({len(peers):,} orgs)",
+        "peer_network", "peers", (filters, data_version),
     )
 
 
@@ -1417,7 +1436,7 @@ with tab_gaps:
         "DE": 70, "RI": 60, "WY": 45, "VT": 42, "DC": 30,
     }
 
-    state_counts = filtered["state"].value_counts().to_dict()
+    state_counts = cube_counts(summary_cube, "state").to_dict()
     gap_rows = []
     for state, pop_k in vet_pop.items():
         org_count = state_counts.get(state, 0)
@@ -0,0 +1,503 @@
+"""Local stand-in for every upstream service the pipeline talks to.
+
+MockUpstream is a ThreadingHTTPServer. With ``MOCK_UPSTREAM_URL`` set,
+RateLimitedSession sends every request to it as
+``<mock>/<original host>/<original path>``, so no extractor changes and
+no network access are needed. Routes (by original host):
+
+- ``www.irs.gov``            /pub/irs-soi/eo*.csv — synthetic BMF files
+- ``projects.propublica.org`` organization JSON with one filing per EIN
+- ``api.charitynavigator.org`` /graphql — organizationByEIN (POST)
+- ``api.va.gov``             paginated facilities (type/page/per_page)
+- ``www.va.gov``             VSO org/representative HTML tables
+- ``www.nrd.gov``            /landingItems JSON and /sitemap.xml
+- ``raw.githubusercontent.com`` NODC concordance and 990 CSVs
+- any other host             an org homepage for the enricher
+
+Responses are synthetic and deterministic for a seed, or replayed from
+``replay_dir/<host>/<path>`` when such a file exists. Put real
+downloads there (e.g. ``www.irs.gov/pub/irs-soi/eo1.csv``) to replay them.
+
+Upstream behaviour is configurable:
+
+- ``latency`` / ``jitter``: seconds added to every response;
+- ``error_rate``: share of attempts answered 503;
+- ``throttle_rate``: share of attempts answered 429;
+- ``max_rps``: per-host request rate above which the server answers 429;
+- ``retry_after``: the Retry-After value sent with 429/503;
+- ``not_found_rate``: share of EINs / homepages with no data (404).
+
+Fault decisions hash the seed, the request and its attempt number, so
+a retried request can succeed and runs are reproducible. ``GET /__stats``
+returns per-route request and status counts.
+
+Usage:
+    python -m benchmarks.mock_upstream --port 8900 --rows 10000 --latency-ms 50
+    MOCK_UPSTREAM_URL=http://127.0.0.1:8900 CHARITY_NAVIGATOR_API_KEY=mock \\
+        VA_FACILITIES_API_KEY=mock python main.py --clean
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from benchmarks.synthetic import (
+    CITIES,
+    SERVICE_CATEGORIES,
+    STATE_WEIGHTS,
+    VETERAN_NAMES,
+    bmf_files,
+    dirty_phones,
+    dirty_streets,
+    synthetic_bmf,
+)
+
+FACILITY_TYPES = ["health", "benefits", "cemetery", "vet_center"]
+
+
+def _unit(*parts) -> float:
+    """Deterministic uniform [0, 1) value for the given key parts."""
+    digest = hashlib.md5("|".join(map(str, parts)).encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64
+
+
+def homepage(host: str) -> bytes:
+    """Deterministic HTML for an org website, keyed by host name."""
+    slug = host.split(":")[0].lower().removeprefix("www.").split(".")[0] or "org"
+    digest = int(hashlib.md5(slug.encode()).hexdigest(), 16)
+    links = [f'<a href="https://www.facebook.com/{slug}">Facebook</a>']
+    if digest % 2:
+        links.append(f'<a href="https://twitter.com/{slug[:15]}">Twitter</a>')
+    if digest % 3 == 0:
+        links.append(f'<a href="https://www.instagram.com/{slug}/">Instagram</a>')
+    email = f"<p>Contact: info@{slug}.org</p>" if digest % 4 else ""
+    return (
+        "<html><head>"
+        f'<meta name="description" content="{slug} serves veterans and their families.">'
+        f"</head><body><h1>{slug}</h1>{''.join(links)}{email}</body></html>"
+    ).encode()
+
+
+class MockUpstream:
+    """Synthetic upstream services on one local port."""
+
+    def __init__(
+        self,
+        port: int = 0,
+        rows: int = 10_000,
+        seed: int = 0,
+        veteran_share: float = 0.2,
+        bmf: dict[str, bytes] | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        max_rps: float = 0.0,
+        retry_after: int = 1,
+        not_found_rate: float = 0.1,
+        facilities: int = 1_700,
+        vso_orgs: int = 600,
+        nrd_resources: int = 2_000,
+        replay_dir: Path | None = None,
+    ):
+        self.rows = rows
+        self.seed = seed
+        self.veteran_share = veteran_share
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self.not_found_rate = not_found_rate
+        self.facilities = facilities
+        self.vso_orgs = vso_orgs
+        self.nrd_resources = nrd_resources
+        self.replay_dir = Path(replay_dir) if replay_dir else None
+
+        self._bmf = bmf
+        self._cache: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._attempts: Counter = Counter()
+        self._recent: dict[str, deque] = {}
+        self.stats: Counter = Counter()
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    # ── Lifecycle ──────────────────────────────────────────────────────
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> MockUpstream:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> MockUpstream:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ── Fault injection ────────────────────────────────────────────────
+
+    def _fault(self, method: str, host: str, target: str) -> int | None:
+        """Status to answer instead of the real response, if any."""
+        with self._lock:
+            key = f"{method} {host}{target}"
+            attempt = self._attempts[key]
+            self._attempts[key] += 1
+
+            if self.max_rps > 0:
+                now = time.monotonic()
+                window = self._recent.setdefault(host, deque())
+                while window and now - window[0] > 1.0:
+                    window.popleft()
+                if len(window) >= self.max_rps:
+                    return 429
+                window.append(now)
+
+        if self.throttle_rate and _unit(self.seed, "429", key, attempt) < self.throttle_rate:
+            return 429
+        if self.error_rate and _unit(self.seed, "503", key, attempt) < self.error_rate:
+            return 503
+        return None
+
+    def _delay(self, host: str, target: str) -> None:
+        pause = self.latency + self.jitter * _unit(self.seed, "jitter", host, target)
+        if pause > 0:
+            time.sleep(pause)
+
+    # ── Synthetic data ─────────────────────────────────────────────────
+
+    def _memo(self, key: str, build) -> bytes:
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = build()
+            return self._cache[key]
+
+    def bmf_file(self, filename: str) -> bytes | None:
+        if self._bmf is None:
+            with self._lock:
+                if self._bmf is None:
+                    bmf_rows = int(self.rows / self.veteran_share)
+                    frame = synthetic_bmf(bmf_rows, seed=self.seed, veteran_share=self.veteran_share)
+                    self._bmf = bmf_files(frame)
+        return self._bmf.get(filename)
+
+    def _eins(self) -> list[str]:
+        """EINs in the served BMF (for the NODC 990 file)."""
+        eins = []
+        for filename in sorted(self._bmf or {}):
+            lines = self._bmf[filename].decode("latin-1").splitlines()[1:]
+            eins.extend(line.split(",", 1)[0] for line in lines)
+        return eins
+
+    def propublica(self, ein: str) -> tuple[int, bytes]:
+        if _unit(self.seed, "pp", ein) < self.not_found_rate:
+            return 404, b'{"error": "not found"}'
+        u = _unit(self.seed, "pp-revenue", ein)
+        revenue = int(10 ** (3 + 5 * u))
+        org = {
+            "ein": int(ein) if ein.isdigit() else ein,
+            "name": f"ORGANIZATION {ein}",
+            "city": CITIES[int(u * len(CITIES))].upper(),
+            "state": list(STATE_WEIGHTS)[int(u * len(STATE_WEIGHTS))],
+            "ntee_code": "W30",
+            "number_of_forms_filed": 1 + int(u * 20),
+        }
+        filing = {
+            "tax_prd": 202212,
+            "totrevenue": revenue,
+            "totfuncexpns": int(revenue * 0.9),
+            "totassetsend": int(revenue * 1.5),
+            "totliabend": int(revenue * 0.3),
+            "totnetassetend": int(revenue * 1.2),
+            "officers": [
+                {"name": f"Officer {k} {ein[-4:]}", "title": title, "compensation": 0}
+                for k, title in enumerate(["President", "Treasurer", "Secretary"][: 1 + int(u * 3)])
+            ],
+        }
+        return 200, json.dumps({"organization": org, "filings_with_data": [filing]}).encode()
+
+    def charity_navigator(self, body: bytes) -> tuple[int, bytes]:
+        try:
+            ein = json.loads(body or b"{}").get("variables", {}).get("ein", "")
+        except json.JSONDecodeError:
+            return 400, b'{"errors": [{"message": "bad request"}]}'
+        org = None
+        u = _unit(self.seed, "cn", ein)
+        if u < 0.1:  # Charity Navigator rates a small share of orgs
+            slug = f"org{ein}"
+            org = {
+                "name": f"Organization {ein}",
+                "ein": ein,
+                "mission": "Supporting veterans and military families.",
+                "websiteURL": f"https://www.{slug}.org",
+                "currentRating": {"score": round(60 + 400 * u, 1), "rating": int(u * 40), "ratingImage": {"small": ""}},
+                "advisories": [],
+                "socialMedia": {
+                    "facebookProfileUrl": f"https://www.facebook.com/{slug}",
+                    "twitterHandle": slug[:15],
+                    "linkedinUrl": None,
+                    "instagramHandle": None,
+                    "youtubeUrl": None,
+                },
+            }
+        return 200, json.dumps({"data": {"organizationByEIN": org}}).encode()
+
+    def va_facilities(self, query: dict) -> tuple[int, bytes]:
+        ftype = query.get("type", ["health"])[0]
+        page = max(int(query.get("page", ["1"])[0]), 1)
+        per_page = max(int(query.get("per_page", ["30"])[0]), 1)
+        total = self.facilities // len(FACILITY_TYPES)
+        start = (page - 1) * per_page
+        ids = range(start, min(start + per_page, total))
+
+        rng = np.random.default_rng([self.seed, FACILITY_TYPES.index(ftype) if ftype in FACILITY_TYPES else 9, page])
+        streets = dirty_streets(rng, len(ids))
+        phones = dirty_phones(rng, len(ids))
+        states = list(STATE_WEIGHTS)
+        data = []
+        for k, i in enumerate(ids):
+            city = CITIES[i % len(CITIES)]
+            data.append({
+                "id": f"vha_{ftype}_{i}",
+                "type": "va_facilities",
+                "attributes": {
+                    "name": f"{city} VA {ftype.replace('_', ' ').title()} {i}",
+                    "address": {"physical": {
+                        "address_1": streets[k], "address_2": "",
+                        "city": city, "state": states[i % len(states)], "zip": f"{10000 + i * 7 % 89999:05d}",
+                    }},
+                    "phone": {"main": phones[k]},
+                    "website": f"https://www.va.gov/{city.lower()}-health-care/",
+                    "services": {"health": [{"name": s} for s in SERVICE_CATEGORIES[: 1 + i % 4]]},
+                    "hours": {"monday": "800AM-430PM"},
+                    "lat": 30 + (i % 170) / 10, "long": -120 + (i % 500) / 10,
+                },
+            })
+        total_pages = max((total + per_page - 1) // per_page, 1)
+        meta = {"pagination": {"currentPage": page, "perPage": per_page,
+                               "totalPages": total_pages, "totalEntries": total}}
+        return 200, json.dumps({"data": data, "meta": meta}).encode()
+
+    def vso_table(self) -> bytes:
+        def build() -> bytes:
+            rng = np.random.default_rng([self.seed, 11])
+            phones = dirty_phones(rng, self.vso_orgs)
+            states = list(STATE_WEIGHTS)
+            rows = [
+                "<tr><th>Organization Name</th><th>POA</th><th>Org Phone</th><th>Org City</th>"
+                "<th>Org State</th><th>Representative</th><th>Rep City</th><th>Rep State</th>"
+                "<th>Rep Zip</th><th>Reg Num</th></tr>"
+            ]
+            for i in range(self.vso_orgs):
+                city = CITIES[i % len(CITIES)]
+                name = VETERAN_NAMES[i % len(VETERAN_NAMES)].format(city=city, n=i + 1)
+                for r in range(1 + i % 4):
+                    rows.append(
+                        f"<tr><td>{escape(name)}</td><td>{i:03d}</td><td>{phones[i]}</td><td>{city}</td>"
+                        f"<td>{states[i % len(states)]}</td><td>Rep {i}-{r}</td><td>{city}</td>"
+                        f"<td>{states[i % len(states)]}</td><td>{40000 + i:05d}</td><td>{i * 10 + r}</td></tr>"
+                    )
+            return f"<html><body><table>{''.join(rows)}</table></body></html>".encode()
+        return self._memo("vso", build)
+
+    def nrd_landing(self) -> bytes:
+        def build() -> bytes:
+            resources = [
+                {"title": f"Featured Veteran Resource {i}", "url": f"https://featured{i}.org",
+                 "description": "<p>Help for veterans</p>", "phone": f"800-555-{i:04d}"}
+                for i in range(20)
+            ]
+            folders = [
+                {"name": cat, "resources": [
+                    {"title": f"{cat} Program {i}", "url": f"https://{cat.lower().replace(' ', '')}{i}.org"}
+                    for i in range(10)
+                ]}
+                for cat in SERVICE_CATEGORIES
+            ]
+            return json.dumps({"resources": resources, "folders": folders}).encode()
+        return self._memo("nrd-landing", build)
+
+    def nrd_sitemap(self) -> bytes:
+        def build() -> bytes:
+            urls = "".join(
+                f"<url><loc>https://www.nrd.gov/resource/detail/{i}/"
+                f"{VETERAN_NAMES[i % len(VETERAN_NAMES)].format(city=CITIES[i % len(CITIES)], n=i).lower().replace(' ', '-')}"
+                f"</loc></url>"
+                for i in range(self.nrd_resources)
+            )
+            return (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+            ).encode()
+        return self._memo("nrd-sitemap", build)
+
+    def nodc_file(self, filename: str) -> tuple[int, bytes]:
+        if filename == "concordance.csv":
+            return 200, b"variable_name,description,xpath\nMISSION,Mission statement,/Return/Mission\n"
+        if filename != "990_master.csv" or not self._bmf:
+            return 404, b"404: Not Found"
+
+        def build() -> bytes:
+            lines = ["EIN,MISSION,NUM_EMPLOYEES,NUM_VOLUNTEERS,WEBURL"]
+            for ein in self._eins():
+                u = _unit(self.seed, "nodc", ein)
+                if u < 0.3:
+                    lines.append(f"{ein},Serving veterans since {1950 + int(u * 200)},{int(u * 300)},{int(u * 900)},www.org{ein}.org")
+            return ("\n".join(lines) + "\n").encode()
+        return 200, self._memo("nodc-990", build)
+
+    # ── Routing ────────────────────────────────────────────────────────
+
+    def route(self, method: str, host: str, path: str, query: dict, body: bytes) -> tuple[int, bytes, str]:
+        """(status, body, content type) for one upstream request."""
+        if self.replay_dir:
+            recorded = self.replay_dir / host / path.lstrip("/")
+            if recorded.is_file():
+                return 200, recorded.read_bytes(), "application/octet-stream"
+
+        if host == "www.irs.gov" and path.startswith("/pub/irs-soi/"):
+            data = self.bmf_file(path.rsplit("/", 1)[-1])
+            return (200, data, "text/csv") if data is not None else (404, b"not found", "text/plain")
+        if host == "projects.propublica.org" and path.endswith(".json") and "/organizations/" in path:
+            status, data = self.propublica(path.rsplit("/", 1)[-1][: -len(".json")])
+            return status, data, "application/json"
+        if host == "api.charitynavigator.org" and method == "POST":
+            status, data = self.charity_navigator(body)
+            return status, data, "application/json"
+        if host == "api.va.gov" and "va_facilities" in path:
+            status, data = self.va_facilities(query)
+            return status, data, "application/json"
+        if host == "www.va.gov" and "/ogc/apps/accreditation/" in path:
+            if path.endswith(("orgsexcellist.asp", "accredvso.asp")):
+                return 200, self.vso_table(), "text/html"
+            return 404, b"not found", "text/plain"
+        if host == "www.nrd.gov":
+            if path == "/landingItems":
+                return 200, self.nrd_landing(), "application/json"
+            if path == "/sitemap.xml":
+                return 200, self.nrd_sitemap(), "application/xml"
+            return 404, b"not found", "text/plain"
+        if host == "raw.githubusercontent.com":
+            status, data = self.nodc_file(path.rsplit("/", 1)[-1])
+            return status, data, "text/csv"
+
+        if _unit(self.seed, "site", host.lower()) < self.not_found_rate:
+            return 404, b"not found", "text/plain"
+        return 200, homepage(host), "text/html"
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def _handle(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parts = urlsplit(self.path)
+
+                if parts.path == "/__stats":
+                    with mock._lock:
+                        stats = {f"{k[0]} {k[1]}": n for k, n in sorted(mock.stats.items())}
+                    self._reply(200, json.dumps(stats, indent=2).encode(), "application/json")
+                    return
+
+                # /<original host>/<original path>
+                host, _, rest = parts.path.lstrip("/").partition("/")
+                path = "/" + rest
+                target = path + (f"?{parts.query}" if parts.query else "")
+                mock._delay(host, target)
+
+                status = mock._fault(method, host, target)
+                if status is not None:
+                    data, content_type = b"", "text/plain"
+                else:
+                    status, data, content_type = mock.route(method, host, path, parse_qs(parts.query), body)
+
+                with mock._lock:
+                    mock.stats[(host, status)] += 1
+                self._reply(status, data, content_type)
+
+            def _reply(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if status in (429, 503):
+                    self.send_header("Retry-After", str(mock.retry_after))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Local mock of the pipeline's upstream services")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--rows", type=int, default=10_000, help="Approximate veteran orgs in the synthetic BMF")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of attempts answered 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of attempts answered 429")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="Per-host requests/s before 429 (0 = no limit)")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--not-found-rate", type=float, default=0.1)
+    parser.add_argument("--facilities", type=int, default=1_700)
+    parser.add_argument("--vso-orgs", type=int, default=600)
+    parser.add_argument("--nrd-resources", type=int, default=2_000)
+    parser.add_argument("--replay-dir", type=Path, default=None,
+                        help="Serve <dir>/<host>/<path> files instead of synthetic responses")
+    args = parser.parse_args(argv)
+
+    server = MockUpstream(
+        port=args.port, rows=args.rows, seed=args.seed,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate, max_rps=args.max_rps,
+        retry_after=args.retry_after, not_found_rate=args.not_found_rate,
+        facilities=args.facilities, vso_orgs=args.vso_orgs, nrd_resources=args.nrd_resources,
+        replay_dir=args.replay_dir,
+    )
+    print(f"Mock upstream listening on {server.url}  (export MOCK_UPSTREAM_URL={server.url})")
+    try:
+        server.start()._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
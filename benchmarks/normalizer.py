@@ -0,0 +1,150 @@
+"""Differential check and timing for the vectorized normalizers.
+
+Runs every scalar normalize_* function, its *_series counterpart and the
+memoized (map_unique) form over the same synthetic columns, fails loudly
+on any differing cell, then times all three paths.
+
+Usage:
+    python -m benchmarks.normalizer
+    python -m benchmarks.normalizer --rows 85000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from transformers.normalizer import (
+    STATE_NAME_TO_CODE,
+    normalize_ein,
+    normalize_ein_series,
+    normalize_org_name,
+    normalize_org_name_series,
+    normalize_phone,
+    normalize_phone_series,
+    normalize_state,
+    normalize_state_series,
+    normalize_url,
+    normalize_url_series,
+    normalize_zip,
+    normalize_zip_series,
+)
+from utils.unique_map import map_unique
+
+PAIRS = {
+    "ein": (normalize_ein, normalize_ein_series),
+    "phone": (normalize_phone, normalize_phone_series),
+    "website": (normalize_url, normalize_url_series),
+    "state": (normalize_state, normalize_state_series),
+    "zip_code": (normalize_zip, normalize_zip_series),
+    "org_name": (normalize_org_name, normalize_org_name_series),
+}
+
+_NOISE = string.ascii_letters + string.digits + string.punctuation + " \t\n\x0b\x1c\x00" + "éßıſÅ٣\xa0\u2003"
+
+
+def _noise(rng: random.Random) -> str:
+    return "".join(rng.choice(_NOISE) for _ in range(rng.randint(0, 14)))
+
+
+def _missing(rng: random.Random):
+    return rng.choice([None, np.nan])
+
+
+def _cased(rng: random.Random, text: str) -> str:
+    return rng.choice([text.lower(), text.title(), text])
+
+
+def synthetic_columns(n: int, seed: int = 0) -> pd.DataFrame:
+    """Mostly realistic values with missing cells and junk mixed in."""
+    rng = random.Random(seed)
+    states = list(STATE_NAME_TO_CODE) + list(STATE_NAME_TO_CODE.values())
+    words = ["veterans", "VFW", "post", "dav", "chapter", "amvets", "Us", "of", "the",
+             "american", "legion", "ptsd", "foundation", "va", "va-post", "o'neil"]
+    hosts = ["Example.ORG", "www.vets.org", "sub.Site.com:8080", "", "ex.com/", "[::1]", "x.org;p"]
+
+    def pick(make):
+        r = rng.random()
+        if r < 0.08:
+            return _missing(rng)
+        if r < 0.16:
+            return _noise(rng)
+        return make()
+
+    rows = {
+        "ein": [pick(lambda: rng.choice(["", "EIN "]) + f"{rng.randint(0, 10**10 - 1):0{rng.choice([9, 9, 8, 10])}d}"[:rng.choice([9, 10])])
+                for _ in range(n)],
+        "phone": [pick(lambda: rng.choice(["", "+1 ", "1-"]) + f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}")
+                  for _ in range(n)],
+        "website": [pick(lambda: rng.choice(["", "http://", "https://", " HTTPS://"]) + rng.choice(hosts)
+                         + rng.choice(["", "/", "/About/", "/a?b=1", "#top", "/x//"]))
+                    for _ in range(n)],
+        "state": [pick(lambda: rng.choice(["", " "]) + _cased(rng, rng.choice(states)))
+                  for _ in range(n)],
+        "zip_code": [pick(lambda: f"{rng.randint(0, 99999):05d}" + rng.choice(["", "-1234", "1234", "-12", "--9999"]))
+                     for _ in range(n)],
+        "org_name": [pick(lambda: rng.choice(["", "  "]) + rng.choice([" ", "  ", "\t"]).join(
+                         rng.choice(words) for _ in range(rng.randint(1, 5))))
+                     for _ in range(n)],
+    }
+    return pd.DataFrame(rows)
+
+
+def check(df: pd.DataFrame) -> int:
+    """Return the number of cells where scalar and vectorized results differ."""
+    mismatches = 0
+    for col, (scalar, vectorized) in PAIRS.items():
+        expected = df[col].map(scalar)
+        for label, actual in (("vectorized", vectorized(df[col])), ("memoized", map_unique(df[col], vectorized))):
+            same = ((expected == actual) | (expected.isna() & actual.isna())).to_numpy()
+            bad = df.loc[~same, col]
+            if len(bad):
+                mismatches += len(bad)
+                print(f"  MISMATCH {col} ({label}): {len(bad):,} cells, e.g. {bad.head(5).tolist()!r}")
+                print(f"    scalar: {expected[~same].head(5).tolist()!r}")
+                print(f"    {label}: {actual[~same].head(5).tolist()!r}")
+    return mismatches
+
+
+def bench(df: pd.DataFrame) -> None:
+    for col, (scalar, vectorized) in PAIRS.items():
+        t0 = time.perf_counter()
+        df[col].apply(scalar)
+        t1 = time.perf_counter()
+        vectorized(df[col])
+        t2 = time.perf_counter()
+        map_unique(df[col], vectorized)
+        t3 = time.perf_counter()
+        apply_s, vec_s, memo_s = t1 - t0, t2 - t1, t3 - t2
+        print(
+            f"  {col:<10} {df[col].nunique(dropna=False):>9,} unique   apply {apply_s:7.3f}s   "
+            f"vectorized {vec_s:7.3f}s ({apply_s / max(vec_s, 1e-9):4.1f}x)   "
+            f"memoized {memo_s:7.3f}s ({apply_s / max(memo_s, 1e-9):4.1f}x)"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Normalizer differential check + benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[85_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for n in args.rows:
+        df = synthetic_columns(n, seed=args.seed)
+        print(f"── {n:,} rows ──")
+        mismatches = check(df)
+        print(f"  differential check: {'OK' if mismatches == 0 else f'{mismatches:,} mismatches'}")
+        failed |= mismatches > 0
+        bench(df)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""End-to-end pipeline benchmark on synthetic BMF-scale data.
+
+For each requested size this generates a synthetic BMF (benchmarks/
+synthetic.py), serves it and fake org homepages from a local
+MockUpstream (benchmarks/mock_upstream.py), and runs Stages 1, 5, 6, 7 (on a sample of websites) and 8
+plus the dashboard filter path in a fresh subprocess. The subprocess gets
+its own temporary DATA_DIR, so checkpoints, caches and outputs start cold
+and never touch data/, and peak RSS is measured per size.
+
+Stage timings come from the utils.profiling run report. Dashboard filters
+are timed as the best of several repeats, both as row filters and, where
+the selection allows it, as cube slices.
+
+Each run is appended to a JSONL history file and compared with the last
+run of the same configuration; steps slower by more than --threshold are
+flagged (and fail the run with --fail-on-regression).
+
+Usage:
+    python -m benchmarks.pipeline
+    python -m benchmarks.pipeline --rows 10000 100000 --enrich-sample 500
+    python -m benchmarks.pipeline --rows 1000000 --enrich-sample 0 --fail-on-regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from config.settings import DATA_DIR, PROJECT_ROOT
+
+HISTORY_PATH = DATA_DIR / "benchmarks" / "history.jsonl"
+
+# Filter selections timed on the dashboard path (merged over DEFAULT_FILTERS)
+FILTER_SCENARIOS = {
+    "state": {"states": ["KY"]},
+    "grade_va": {"grades": ["A", "B"], "va": "Yes"},
+    "revenue": {"revenue": "$1M–$10M"},
+    "search": {"search": "legion"},
+    "contact": {"has_contact": True},
+    "employees": {"employees": "11–50"},
+    "combined": {"states": ["CA", "TX"], "grades": ["A", "B", "C"], "search": "post", "has_contact": True},
+}
+DASHBOARD_REPEATS = 5
+
+
+# ── Worker (runs inside the sandboxed subprocess) ──────────────────────
+
+def _best_of(func, repeats: int = DASHBOARD_REPEATS):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def time_dashboard(steps: dict) -> None:
+    """Time the dashboard's load, row-filter and cube-slice paths."""
+    from config.settings import OUTPUT_DIR
+    from dashboard.filters import DEFAULT_FILTERS, apply_filters, cube_filters
+    from loaders.artifacts import read_directory
+    from loaders.cube import CUBE_FILENAME, load_cube, slice_cube
+
+    seconds, df = _best_of(read_directory, repeats=1)
+    steps["dashboard.load"] = {"seconds": seconds, "rows_out": len(df)}
+    cube = load_cube(OUTPUT_DIR / CUBE_FILENAME)
+
+    for name, overrides in FILTER_SCENARIOS.items():
+        filters = {**DEFAULT_FILTERS, **overrides}
+        seconds, rows = _best_of(lambda: apply_filters(df, filters))
+        steps[f"dashboard.filter.{name}"] = {"seconds": seconds, "rows_out": len(rows)}
+
+        cube_args = cube_filters(filters)
+        if cube_args is not None and cube is not None:
+            seconds, sliced = _best_of(lambda: slice_cube(cube, **cube_args))
+            steps[f"dashboard.cube.{name}"] = {"seconds": seconds, "rows_out": len(sliced)}
+
+
+def run_worker(args) -> dict:
+    """Run the timed stages against the mock upstream; return step metrics."""
+    import main as pipeline
+    from benchmarks.synthetic import synthetic_sources
+    from utils import profiling
+
+    profile = profiling.start_run()
+
+    base = pipeline.stage1_irs_bmf()
+    with profiling.span("synthetic_sources", category="setup"):
+        src = synthetic_sources(base, seed=args.seed, dup_rate=args.dup_rate)
+    merged = pipeline.stage5_merge(base, src["pp"], src["cn"], src["vso"], src["nrd"], src["va_fac"], src["nodc"])
+    merged = pipeline.stage6_dedup(merged)
+    if args.enrich_sample:
+        sample = merged[merged["website"].notna()].head(args.enrich_sample)
+        merged.update(pipeline.stage7_enrichment(sample.copy()))
+    pipeline.stage8_output(merged)
+
+    report = profile.report()
+    steps = {}
+    for entry in report["spans"]:
+        if entry["depth"] != 0:
+            continue
+        steps[entry["name"]] = {
+            key: entry[key] for key in ("rows_in", "rows_out", "peak_rss") if key in entry
+        }
+        steps[entry["name"]]["seconds"] = entry["duration_s"]
+
+    time_dashboard(steps)
+    return {"steps": steps, "peak_rss": report["peak_rss"], "http": report["http"]}
+
+
+# ── Driver ─────────────────────────────────────────────────────────────
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(rows: int, args) -> dict:
+    """Generate fixtures for one size and benchmark it in a subprocess."""
+    from benchmarks.mock_upstream import MockUpstream
+    from benchmarks.synthetic import bmf_files, synthetic_bmf
+
+    bmf_rows = int(rows / args.veteran_share)
+    t0 = time.perf_counter()
+    files = bmf_files(synthetic_bmf(bmf_rows, seed=args.seed, veteran_share=args.veteran_share))
+    print(f"  generated {bmf_rows:,} BMF rows in {time.perf_counter() - t0:.1f}s")
+
+    with MockUpstream(bmf=files, seed=args.seed, latency=args.latency_ms / 1000) as server, \
+            tempfile.TemporaryDirectory(prefix="vetorg-bench-") as data_dir:
+        result_path = Path(data_dir) / "result.json"
+        env = {
+            **os.environ,
+            "DATA_DIR": data_dir,
+            "MOCK_UPSTREAM_URL": server.url,
+            "NO_PROXY": "127.0.0.1,localhost",
+            "no_proxy": "127.0.0.1,localhost",
+            "ENRICHER_RATE_LIMIT": "0",
+            "OUTPUT_DATABASE": os.environ.get("OUTPUT_DATABASE", "sqlite"),
+        }
+        cmd = [
+            sys.executable, "-m", "benchmarks.pipeline", "--worker",
+            "--result", str(result_path), "--seed", str(args.seed),
+            "--dup-rate", str(args.dup_rate), "--enrich-sample", str(args.enrich_sample),
+        ]
+        subprocess.run(cmd, cwd=PROJECT_ROOT, env=env, check=True)
+        result = json.loads(result_path.read_text())
+
+    result["config"] = {
+        "rows": rows,
+        "bmf_rows": bmf_rows,
+        "seed": args.seed,
+        "veteran_share": args.veteran_share,
+        "dup_rate": args.dup_rate,
+        "enrich_sample": args.enrich_sample,
+        "latency_ms": args.latency_ms,
+    }
+    return result
+
+
+def load_history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    entries = []
+    for line in path.read_text().splitlines():
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return entries
+
+
+def previous_run(history: list[dict], config: dict) -> dict | None:
+    """The most recent history entry with the same configuration."""
+    for entry in reversed(history):
+        if entry.get("config") == config:
+            return entry
+    return None
+
+
+def _rows(value) -> str:
+    if isinstance(value, list):
+        return " + ".join(f"{n:,}" for n in value)
+    return f"{value:,}"
+
+
+def report(entry: dict, previous: dict | None, threshold: float) -> list[str]:
+    """Print step timings against the previous run; return regressed steps."""
+    regressions = []
+    before = previous["steps"] if previous else {}
+    for name, step in entry["steps"].items():
+        seconds = step["seconds"]
+        line = f"  {name:<28} {seconds:>10.4f}s"
+        if name in before:
+            old = before[name]["seconds"]
+            change = (seconds - old) / old if old > 0 else 0.0
+            line += f"   prev {old:>10.4f}s  {change * 100:+6.1f}%"
+            # Ignore sub-10ms noise
+            if change > threshold and seconds - old > 0.01:
+                line += "  REGRESSION"
+                regressions.append(name)
+        rows_in, rows_out = step.get("rows_in"), step.get("rows_out")
+        if rows_out is not None:
+            line += f"   rows {'' if rows_in is None else f'{rows_in:,} → '}{_rows(rows_out)}"
+        print(line)
+    peak = entry.get("peak_rss")
+    if peak:
+        print(f"  peak RSS {peak / 2**20:,.0f}MB")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pipeline benchmark on synthetic data")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000],
+                        help="Stage 1 output sizes to benchmark (e.g. 10000 100000 1000000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--veteran-share", type=float, default=0.2,
+                        help="Share of synthetic BMF rows that pass the veteran filter")
+    parser.add_argument("--dup-rate", type=float, default=0.15,
+                        help="VA VSO rows duplicating base orgs, as a share of the base")
+    parser.add_argument("--enrich-sample", type=int, default=200,
+                        help="Websites to scrape in Stage 7 (0 skips the stage)")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Artificial mock upstream latency per response")
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH)
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative slowdown flagged as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        logging.basicConfig(level=logging.WARNING)
+        args.result.write_text(json.dumps(run_worker(args), default=str))
+        return 0
+
+    history = load_history(args.history)
+    args.history.parent.mkdir(parents=True, exist_ok=True)
+    regressed = False
+    for rows in args.rows:
+        print(f"── {rows:,} rows ──")
+        entry = run_size(rows, args)
+        entry = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "pandas": __import__("pandas").__version__,
+            "cpus": os.cpu_count(),
+            **entry,
+        }
+        regressed |= bool(report(entry, previous_run(history, entry["config"]), args.threshold))
+        with open(args.history, "a") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+        history.append(entry)
+
+    print(f"History: {args.history}")
+    return 1 if regressed and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
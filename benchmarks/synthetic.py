@@ -0,0 +1,351 @@
+"""Synthetic BMF-scale inputs for the pipeline benchmarks.
+
+synthetic_bmf() builds a raw IRS BMF extract (the eo*.csv columns) in
+which roughly ``veteran_share`` of the rows pass the Stage 1 veteran
+filter. synthetic_sources() derives the Stage 5 inputs from a Stage 1
+base: ProPublica / Charity Navigator / NODC rows keyed by EIN, and VA VSO
+/ NRD / VA Facilities rows without EINs. A ``dup_rate`` share of the
+non-EIN rows are name variants of base orgs in the same city, half of
+them listing the org's address and phone, some chapters share a national
+website, and a few rows repeat an EIN, so every dedup tier has clusters
+to find.
+
+Phones, URLs, ZIPs and street lines come in the mixed formats the real
+sources use. Everything is deterministic for a given seed and columns are
+built with numpy, so a million-row directory takes seconds to generate.
+"""
+
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import pandas as pd
+
+from config.settings import IRS_BMF_FILES
+from extractors.irs_bmf import BMF_USECOLS
+
+# (state, relative weight) — large states dominate, as in the BMF
+STATE_WEIGHTS = {
+    "CA": 9, "TX": 8, "FL": 7, "NY": 6, "PA": 5, "OH": 5, "IL": 4, "VA": 4,
+    "NC": 4, "GA": 3, "MI": 3, "KY": 3, "WA": 3, "MO": 2, "TN": 2, "IN": 2,
+    "AZ": 2, "WI": 2, "MN": 2, "CO": 2, "AL": 2, "SC": 2, "LA": 1, "OK": 1,
+    "OR": 1, "IA": 1, "KS": 1, "AR": 1, "MS": 1, "NE": 1, "NM": 1, "WV": 1,
+    "ME": 1, "NH": 1, "ID": 1, "MT": 1, "SD": 1, "ND": 1, "VT": 1, "WY": 1,
+    "AK": 1, "HI": 1, "NV": 1, "UT": 1, "CT": 1, "MA": 2, "MD": 2, "NJ": 2,
+    "DE": 1, "RI": 1, "DC": 1, "PR": 1,
+}
+
+CITIES = [
+    "Springfield", "Franklin", "Clinton", "Greenville", "Bristol", "Salem",
+    "Madison", "Georgetown", "Fairview", "Riverside", "Louisville",
+    "Shepherdsville", "Lexington", "Columbus", "Jackson", "Marion", "Oxford",
+    "Ashland", "Dover", "Milton", "Auburn", "Hudson", "Kingston", "Newport",
+]
+
+VETERAN_NAMES = [
+    "American Legion Post {n}", "Veterans of Foreign Wars Post {n}",
+    "VFW Post {n} Auxiliary", "Disabled American Veterans Chapter {n}",
+    "AMVETS Post {n}", "{city} Veterans Foundation",
+    "{city} Military Family Support Network", "Marine Corps League Detachment {n}",
+    "Military Order of the Purple Heart Chapter {n}",
+    "Vietnam Veterans of America Chapter {n}", "{city} Honor Guard Veterans Association",
+    "Wounded Warrior Outreach of {city}", "Gold Star Families of {city}",
+    "Blue Star Mothers Chapter {n}", "{city} Veterans Housing Corp",
+    "National Guard Family Program {city}", "{city} Combat Veteran Motorcycle Club",
+]
+
+OTHER_NAMES = [
+    "{city} Community Garden Club", "Friends of the {city} Library",
+    "{city} Youth Soccer League", "{city} Historical Society", "{city} Food Pantry",
+    "{city} Arts Council", "{city} Rotary Club Foundation", "{city} Little League",
+    "Parent Teacher Organization of {city} Elementary", "{city} Humane Society",
+]
+
+# National orgs whose chapters often list the national website
+NATIONAL_SITES = ["legion.org", "vfw.org", "dav.org", "amvets.org", "vva.org"]
+
+STREET_NAMES = ["Main", "Oak", "Maple", "Washington", "Lincoln", "Park", "Cedar", "Elm", "Hill", "Lake"]
+STREET_TYPES = ["Street", "St", "St.", "Avenue", "Ave", "Road", "Rd", "Drive", "Dr", "Boulevard", "Blvd"]
+DIRECTIONS = ["", "", "", "N ", "S ", "East ", "W. "]
+UNITS = ["", "", "", "", " Ste 200", " Suite 4", " # 12", " Apt B"]
+
+SERVICE_CATEGORIES = [
+    "Mental Health", "Housing", "Employment", "Legal", "Benefits Assistance",
+    "Peer Support", "Education", "Family Support", "Transportation", "Recreation",
+]
+
+
+def _choice(rng: np.random.Generator, options, n: int, p=None) -> np.ndarray:
+    return np.asarray(options, dtype=object)[rng.choice(len(options), size=n, p=p)]
+
+
+def _missing(rng: np.random.Generator, values: np.ndarray, rate: float) -> np.ndarray:
+    values = values.astype(object)
+    values[rng.random(len(values)) < rate] = None
+    return values
+
+
+def _format(templates: np.ndarray, cities: np.ndarray, numbers: np.ndarray) -> list[str]:
+    return [t.format(city=c, n=n) for t, c, n in zip(templates, cities, numbers)]
+
+
+def dirty_phones(rng: np.random.Generator, n: int) -> np.ndarray:
+    """US phone numbers in the formats sources actually use."""
+    area = rng.integers(200, 999, n)
+    exchange = rng.integers(200, 999, n)
+    line = rng.integers(0, 9999, n)
+    style = rng.integers(0, 5, n)
+    out = np.empty(n, dtype=object)
+    for i in range(n):
+        a, e, ln = area[i], exchange[i], line[i]
+        out[i] = (
+            f"({a}) {e}-{ln:04d}", f"{a}-{e}-{ln:04d}", f"{a}.{e}.{ln:04d}",
+            f"1{a}{e}{ln:04d}", f"+1 {a} {e} {ln:04d}",
+        )[style[i]]
+    return out
+
+
+def dirty_urls(rng: np.random.Generator, domains: np.ndarray) -> np.ndarray:
+    """Websites with mixed scheme, www, case and trailing paths."""
+    prefix = _choice(rng, ["http://", "https://www.", "www.", "HTTP://WWW.", "https://", ""], len(domains))
+    suffix = _choice(rng, ["", "/", "/about", "/Home.aspx"], len(domains))
+    return np.array([
+        None if d is None else f"{p}{d.upper() if p.isupper() else d}{s}"
+        for p, d, s in zip(prefix, domains, suffix)
+    ], dtype=object)
+
+
+def dirty_streets(rng: np.random.Generator, n: int) -> np.ndarray:
+    numbers = rng.integers(1, 9999, n)
+    names = _choice(rng, STREET_NAMES, n)
+    types = _choice(rng, STREET_TYPES, n)
+    dirs = _choice(rng, DIRECTIONS, n)
+    units = _choice(rng, UNITS, n)
+    po_box = rng.random(n) < 0.12
+    box_style = _choice(rng, ["PO Box", "P.O. BOX", "Po Box"], n)
+    return np.array([
+        f"{box_style[i]} {numbers[i]}" if po_box[i]
+        else f"{numbers[i]} {dirs[i]}{names[i]} {types[i]}{units[i]}"
+        for i in range(n)
+    ], dtype=object)
+
+
+def _zips(rng: np.random.Generator, n: int) -> np.ndarray:
+    base = rng.integers(501, 99950, n)
+    plus4 = rng.integers(0, 9999, n)
+    long_form = rng.random(n) < 0.4
+    return np.array([
+        f"{z:05d}-{p:04d}" if lf else f"{z:05d}" for z, p, lf in zip(base, plus4, long_form)
+    ], dtype=object)
+
+
+def _slug(name: str) -> str:
+    return "".join(ch for ch in name.lower() if ch.isalnum())[:40]
+
+
+def synthetic_bmf(rows: int, seed: int = 0, veteran_share: float = 0.2) -> pd.DataFrame:
+    """Raw BMF rows (all BMF_USECOLS as strings); ~veteran_share pass Stage 1."""
+    rng = np.random.default_rng(seed)
+    states = list(STATE_WEIGHTS)
+    weights = np.array(list(STATE_WEIGHTS.values()), dtype=float)
+
+    veteran = rng.random(rows) < veteran_share
+    city = _choice(rng, CITIES, rows)
+    state = _choice(rng, states, rows, p=weights / weights.sum())
+    number = rng.integers(1, 2000, rows)
+    templates = np.where(
+        veteran,
+        _choice(rng, VETERAN_NAMES, rows),
+        _choice(rng, OTHER_NAMES, rows),
+    )
+    names = np.array(_format(templates, city, number), dtype=object)
+    upper = rng.random(rows) < 0.7  # BMF names are mostly upper case
+    names[upper] = np.char.upper(names[upper].astype(str)).astype(object)
+
+    subsection = np.where(
+        veteran,
+        _choice(rng, ["19", "03", "03", "04", "07"], rows),
+        _choice(rng, ["03", "03", "03", "04", "06"], rows),
+    )
+    ntee = np.where(
+        veteran,
+        _choice(rng, ["W30", "W40", "W99", "W70", "", "P70"], rows),
+        _choice(rng, ["A20", "B11", "N60", "K31", "", "C30"], rows),
+    )
+    revenue = np.where(rng.random(rows) < 0.3, 0, rng.lognormal(11, 2.2, rows).astype(np.int64))
+    assets = (revenue * rng.uniform(0.2, 3.0, rows)).astype(np.int64)
+
+    eins = 10_000_000 + rng.choice(989_999_999, size=rows, replace=False)
+    data = {
+        "EIN": [f"{e:09d}" for e in eins],
+        "NAME": names,
+        "ICO": _missing(rng, _choice(rng, ["% TREASURER", "% COMMANDER", "% J SMITH"], rows), 0.6),
+        "STREET": dirty_streets(rng, rows),
+        "CITY": np.char.upper(city.astype(str)).astype(object),
+        "STATE": state,
+        "ZIP": _zips(rng, rows),
+        "GROUP": _choice(rng, ["0000", "0925", "1234"], rows),
+        "SUBSECTION": subsection,
+        "AFFILIATION": _choice(rng, ["3", "9", "6"], rows),
+        "CLASSIFICATION": _choice(rng, ["1000", "2000", "1200"], rows),
+        "RULING": [f"{y}{m:02d}" for y, m in zip(rng.integers(1940, 2024, rows), rng.integers(1, 13, rows))],
+        "DEDUCTIBILITY": _choice(rng, ["1", "2"], rows),
+        "FOUNDATION": _choice(rng, ["15", "16", "00"], rows),
+        "ACTIVITY": _choice(rng, ["000000000", "061000000"], rows),
+        "ORGANIZATION": _choice(rng, ["1", "5"], rows),
+        "STATUS": _choice(rng, ["01", "01", "01", "02", "12"], rows),
+        "TAX_PERIOD": _choice(rng, ["202212", "202306", "202312"], rows),
+        "ASSET_CD": _choice(rng, ["0", "1", "3", "5"], rows),
+        "INCOME_CD": _choice(rng, ["0", "1", "3", "5"], rows),
+        "FILING_REQ_CD": _choice(rng, ["01", "02", "03", "06"], rows),
+        "PF_FILING_REQ_CD": _choice(rng, ["0"], rows),
+        "ACCT_PD": _choice(rng, ["12", "06", "09"], rows),
+        "ASSET_AMT": _missing(rng, assets.astype(str).astype(object), 0.1),
+        "INCOME_AMT": _missing(rng, revenue.astype(str).astype(object), 0.1),
+        "REVENUE_AMT": _missing(rng, revenue.astype(str).astype(object), 0.1),
+        "NTEE_CD": _missing(rng, ntee, 0.05),
+        "SORT_NAME": _missing(rng, _choice(rng, ["", "AUXILIARY", "POST HOME"], rows), 0.85),
+    }
+    return pd.DataFrame(data, columns=BMF_USECOLS)
+
+
+def bmf_files(bmf: pd.DataFrame) -> dict[str, bytes]:
+    """Split a synthetic BMF into the eo*.csv files the IRS publishes."""
+    files = {}
+    for filename, part in zip(IRS_BMF_FILES, np.array_split(np.arange(len(bmf)), len(IRS_BMF_FILES))):
+        buffer = io.StringIO()
+        bmf.iloc[part].to_csv(buffer, index=False)
+        files[filename] = buffer.getvalue().encode("latin-1", errors="replace")
+    return files
+
+
+def _name_variants(rng: np.random.Generator, names: pd.Series) -> pd.Series:
+    """Spellings a second source might use for the same org."""
+    names = names.astype(str)
+    style = rng.integers(0, 5, len(names))
+    variants = [
+        names.str.upper(),
+        names.str.title() + " Inc",
+        names.str.replace("Post ", "Post #", regex=False),
+        names.str.replace("Veterans", "Vets", regex=False),
+        names.str.replace(" of ", " ", regex=False),
+    ]
+    out = variants[0].copy()
+    for k, variant in enumerate(variants):
+        out[style == k] = variant[style == k]
+    return out
+
+
+def synthetic_sources(
+    base: pd.DataFrame,
+    seed: int = 0,
+    dup_rate: float = 0.15,
+) -> dict[str, pd.DataFrame]:
+    """Stage 5 inputs derived from a Stage 1 base (schema columns).
+
+    Returns pp, cn, nodc (EIN-keyed) and vso, nrd, va_fac (no EIN).
+    """
+    rng = np.random.default_rng(seed + 1)
+    n = len(base)
+    if n == 0:
+        empty = pd.DataFrame()
+        return {key: empty for key in ("pp", "cn", "nodc", "vso", "nrd", "va_fac")}
+
+    eins = base["ein"].to_numpy(dtype=object)
+    names = base["org_name"].astype(str)
+    slugs = np.array([_slug(name) for name in names], dtype=object)
+    national = rng.random(n) < 0.1
+    domains = np.where(national, _choice(rng, NATIONAL_SITES, n), slugs + ".org")
+    phones = dirty_phones(rng, n)
+    streets = base["street_address"].to_numpy(dtype=object)
+    zips = base["zip_code"].to_numpy(dtype=object)
+
+    def sample(frac: float) -> np.ndarray:
+        return np.sort(rng.choice(n, size=int(n * frac), replace=False))
+
+    # ProPublica: financials for most EINs
+    pp_rows = sample(0.6)
+    revenue = rng.lognormal(11, 2.2, len(pp_rows))
+    pp = pd.DataFrame({
+        "ein": eins[pp_rows],
+        "total_revenue": revenue,
+        "total_expenses": revenue * rng.uniform(0.6, 1.1, len(pp_rows)),
+        "total_assets": revenue * rng.uniform(0.2, 3.0, len(pp_rows)),
+        "num_employees": _missing(rng, rng.integers(1, 2500, len(pp_rows)).astype(float), 0.5),
+        "mission_statement": _missing(rng, np.array([f"Serving veterans of {c}" for c in base["city"].to_numpy()[pp_rows]], dtype=object), 0.4),
+        "data_sources": "propublica",
+    })
+
+    cn_rows = sample(0.05)
+    cn = pd.DataFrame({
+        "ein": eins[cn_rows],
+        "charity_navigator_rating": rng.integers(0, 5, len(cn_rows)).astype(float),
+        "charity_navigator_score": rng.uniform(40, 100, len(cn_rows)).round(1),
+        "website": dirty_urls(rng, domains[cn_rows]),
+        "data_sources": "charity_nav",
+    })
+
+    nodc_rows = sample(0.4)
+    nodc = pd.DataFrame({
+        "ein": eins[nodc_rows],
+        "website": _missing(rng, dirty_urls(rng, domains[nodc_rows]), 0.2),
+        "phone": _missing(rng, phones[nodc_rows], 0.3),
+        "data_sources": "nodc",
+    })
+
+    def non_ein(source: str, frac_dup: float, frac_new: float) -> pd.DataFrame:
+        dup_rows = sample(frac_dup)
+        new = int(n * frac_new)
+        city = np.concatenate([base["city"].to_numpy(dtype=object)[dup_rows], _choice(rng, CITIES, new)])
+        state = np.concatenate([base["state"].to_numpy(dtype=object)[dup_rows], _choice(rng, list(STATE_WEIGHTS), new)])
+        org_names = np.concatenate([
+            _name_variants(rng, names.iloc[dup_rows]).to_numpy(dtype=object),
+            np.array(_format(_choice(rng, VETERAN_NAMES, new), city[len(dup_rows):],
+                             rng.integers(2000, 9000, new)), dtype=object),
+        ])
+        m = len(org_names)
+        # A few source rows carry their counterpart's EIN
+        ein = np.full(m, None, dtype=object)
+        with_ein = rng.random(len(dup_rows)) < 0.05
+        ein[:len(dup_rows)][with_ein] = eins[dup_rows][with_ein]
+        site = np.concatenate([domains[dup_rows], np.array([_slug(x) + ".org" for x in org_names[len(dup_rows):]], dtype=object)])
+        # Half the duplicates list their counterpart's address and phone
+        street, zipcode, phone = dirty_streets(rng, m), _zips(rng, m), dirty_phones(rng, m)
+        same = np.zeros(m, dtype=bool)
+        same[:len(dup_rows)] = rng.random(len(dup_rows)) < 0.5
+        street[same] = [None if pd.isna(x) else str(x).upper() for x in streets[dup_rows][same[:len(dup_rows)]]]
+        zipcode[same] = zips[dup_rows][same[:len(dup_rows)]]
+        phone[same] = phones[dup_rows][same[:len(dup_rows)]]
+        return pd.DataFrame({
+            "org_name": org_names,
+            "ein": ein,
+            "street_address": street,
+            "city": city,
+            "state": state,
+            "zip_code": zipcode,
+            "phone": _missing(rng, phone, 0.3),
+            "website": _missing(rng, dirty_urls(rng, site), 0.5),
+            "service_categories": [
+                ";".join(sorted(set(_choice(rng, SERVICE_CATEGORIES, k))))
+                for k in rng.integers(1, 4, m)
+            ],
+            "data_sources": source,
+        })
+
+    vso = non_ein("va_vso", dup_rate, dup_rate / 3)
+    vso["va_accredited"] = "Yes"
+    vso["accreditation_details"] = "VSO accredited representative"
+    nrd = non_ein("nrd", dup_rate / 2, dup_rate / 3)
+
+    fac = max(n // 200, 1)
+    va_fac = pd.DataFrame({
+        "org_name": [f"{c} VA Clinic" for c in _choice(rng, CITIES, fac)],
+        "city": _choice(rng, CITIES, fac),
+        "state": _choice(rng, list(STATE_WEIGHTS), fac),
+        "phone": dirty_phones(rng, fac),
+        "org_type": "VA Facility",
+        "data_sources": "va_facilities",
+    })
+
+    return {"pp": pp, "cn": cn, "nodc": nodc, "vso": vso, "nrd": nrd, "va_fac": va_fac}
@@ -1,10 +1,13 @@
 """Canonical 45-column DataFrame schema for the veteran org directory."""
 
+import json
+
 import pandas as pd
 
 # Column definitions: (column_name, dtype, description)
 SCHEMA_COLUMNS = [
     # Identity
+    ("org_id", "string", "Stable organization id assigned at dedup (kept across runs)"),
     ("org_name", "string", "Official organization name"),
     ("org_name_alt", "string", "Alternate / DBA name"),
     ("ein", "string", "Employer Identification Number (XX-XXXXXXX)"),
@@ -17,6 +20,7 @@ SCHEMA_COLUMNS = [
     ("state", "string", "Two-letter state code"),
     ("zip_code", "string", "ZIP or ZIP+4"),
     ("country", "string", "Country code (US default)"),
+    ("address_key", "string", "Canonical street line | ZIP5 (cross-source match key)"),
     ("phone", "string", "Primary phone number"),
     ("email", "string", "Primary email address"),
     ("website", "string", "Organization website URL"),
@@ -71,7 +75,16 @@ SCHEMA_COLUMNS = [
     ("data_freshness_date", "string", "Date data was last collected (YYYY-MM-DD)"),
     ("confidence_score", "float64", "Record completeness score (0.0 - 1.0)"),
     ("confidence_grade", "string", "Letter grade A-F based on data completeness"),
-    ("confidence_detail", "string", "JSON with per-group filled/total/source breakdown"),
+    ("filled_identity", "Int64", "Identity fields filled (of 3)"),
+    ("filled_location", "Int64", "Location fields filled (of 4)"),
+    ("filled_classification", "Int64", "Classification fields filled (of 3)"),
+    ("filled_financials", "Int64", "Financial fields filled (of 4)"),
+    ("filled_contact", "Int64", "Contact fields filled (of 3)"),
+    ("filled_ratings", "Int64", "Rating fields filled (of 2)"),
+    ("filled_description", "Int64", "Description fields filled (of 3)"),
+    ("filled_social", "Int64", "Social media fields filled (of 4)"),
+    ("filled_personnel", "Int64", "Personnel fields filled (of 2)"),
+    ("confidence_sources", "Int64", "Bitmask of CONFIDENCE_SOURCE_FLAGS found in data_sources"),
     ("record_last_updated", "string", "Timestamp of last update"),
 ]
 
@@ -85,6 +98,8 @@ def empty_dataframe() -> pd.DataFrame:
     for col, dtype, _ in SCHEMA_COLUMNS:
         if dtype == "float64":
             df[col] = pd.array([], dtype="Float64")
+        elif dtype == "Int64":
+            df[col] = pd.array([], dtype="Int64")
         else:
             df[col] = pd.array([], dtype="string")
     return df
@@ -96,42 +111,20 @@ def coerce_schema(df: pd.DataFrame) -> pd.DataFrame:
         if col not in df.columns:
             if dtype == "float64":
                 df[col] = pd.array([pd.NA] * len(df), dtype="Float64")
+            elif dtype == "Int64":
+                df[col] = pd.array([pd.NA] * len(df), dtype="Int64")
             else:
                 df[col] = pd.array([pd.NA] * len(df), dtype="string")
         else:
             if dtype == "float64":
                 df[col] = pd.to_numeric(df[col], errors="coerce").astype("Float64")
+            elif dtype == "Int64":
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
             else:
                 df[col] = df[col].astype("string")
     return df[COLUMN_NAMES]
 
 
-# Revenue range buckets
-REVENUE_RANGES = [
-    (0, 0, "$0"),
-    (1, 49_999, "Under $50K"),
-    (50_000, 99_999, "$50K–$100K"),
-    (100_000, 499_999, "$100K–$500K"),
-    (500_000, 999_999, "$500K–$1M"),
-    (1_000_000, 4_999_999, "$1M–$5M"),
-    (5_000_000, 9_999_999, "$5M–$10M"),
-    (10_000_000, 49_999_999, "$10M–$50M"),
-    (50_000_000, 99_999_999, "$50M–$100M"),
-    (100_000_000, float("inf"), "$100M+"),
-]
-
-
-def revenue_to_range(revenue) -> str:
-    """Convert a revenue number to a human-readable range bucket."""
-    if pd.isna(revenue) or revenue is None:
-        return pd.NA
-    revenue = float(revenue)
-    for low, high, label in REVENUE_RANGES:
-        if low <= revenue <= high:
-            return label
-    return pd.NA
-
-
 # Confidence score weights (sum = 1.0)
 CONFIDENCE_WEIGHTS = {
     "org_name": 0.10,
@@ -217,6 +210,72 @@ FIELD_GROUPS = {
 }
 
 
+# ── Compact confidence breakdown ─────────────────────────────────────
+#
+# Each row stores its per-group filled counts in filled_<group> columns and
+# the source flags found in data_sources as a bitmask in confidence_sources
+# (bit i ↔ CONFIDENCE_SOURCE_FLAGS[i]). decode_confidence_detail() rebuilds
+# the {"grade", "groups"} breakdown the old confidence_detail JSON held.
+#
+FILLED_COLUMNS = {gkey: f"filled_{gkey}" for gkey in FIELD_GROUPS}
+
+CONFIDENCE_SOURCE_FLAGS = ["irs_bmf", "propublica", "va_vso", "web", "charity_nav"]
+
+
+def encode_confidence_sources(data_sources) -> int:
+    """Bitmask of CONFIDENCE_SOURCE_FLAGS appearing in a data_sources string."""
+    if not isinstance(data_sources, str):
+        return 0
+    ds_lower = data_sources.lower()
+    return sum(1 << i for i, flag in enumerate(CONFIDENCE_SOURCE_FLAGS) if flag in ds_lower)
+
+
+def group_sources(flags: int) -> dict[str, str]:
+    """Most likely source per field group for a confidence_sources bitmask."""
+    has = {flag: bool(flags & (1 << i)) for i, flag in enumerate(CONFIDENCE_SOURCE_FLAGS)}
+    sources = {}
+    for gkey, gdef in FIELD_GROUPS.items():
+        source = gdef["source_hint"]
+        if gkey == "financials" and has["propublica"]:
+            source = "propublica"
+        elif gkey in ("identity", "location", "classification") and has["irs_bmf"]:
+            source = "irs_bmf"
+        elif gkey == "contact" and (has["va_vso"] or has["web"]):
+            source = "va_vso" if has["va_vso"] else "web_enrichment"
+        elif gkey == "ratings" and has["charity_nav"]:
+            source = "charity_nav"
+        sources[gkey] = source
+    return sources
+
+
+def decode_confidence_detail(row) -> dict | None:
+    """Per-group breakdown for one directory row, or None if it has none.
+
+    Falls back to the confidence_detail JSON written by older pipeline runs.
+    """
+    counts = {gkey: row.get(col) for gkey, col in FILLED_COLUMNS.items()}
+    if all(pd.isna(c) for c in counts.values()):
+        legacy = row.get("confidence_detail")
+        if not isinstance(legacy, str):
+            return None
+        try:
+            return json.loads(legacy)
+        except json.JSONDecodeError:
+            return None
+
+    flags = row.get("confidence_sources")
+    sources = group_sources(0 if pd.isna(flags) else int(flags))
+    groups = {
+        gkey: {
+            "filled": 0 if pd.isna(counts[gkey]) else int(counts[gkey]),
+            "total": len(gdef["fields"]),
+            "source": sources[gkey],
+        }
+        for gkey, gdef in FIELD_GROUPS.items()
+    }
+    return {"grade": row.get("confidence_grade"), "groups": groups}
+
+
 # ── Confidence Grade Criteria (rule-based, checked top-down) ────────
 #
 # Legacy A-F grades (still in CSV from pipeline):
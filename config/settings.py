@@ -11,7 +11,7 @@ except ImportError:
 
 # ── Paths ──────────────────────────────────────────────────────────────
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
-DATA_DIR = PROJECT_ROOT / "data"
+DATA_DIR = Path(os.getenv("DATA_DIR", PROJECT_ROOT / "data"))  # benchmarks point this at a temp dir
 RAW_DIR = DATA_DIR / "raw"
 INTERMEDIATE_DIR = DATA_DIR / "intermediate"
 OUTPUT_DIR = DATA_DIR / "output"
@@ -21,7 +21,7 @@ for d in (RAW_DIR, INTERMEDIATE_DIR, OUTPUT_DIR, CHECKPOINT_DIR):
     d.mkdir(parents=True, exist_ok=True)
 
 # ── IRS BMF ────────────────────────────────────────────────────────────
-IRS_BMF_BASE_URL = "https://www.irs.gov/pub/irs-soi"
+IRS_BMF_BASE_URL = os.getenv("IRS_BMF_BASE_URL", "https://www.irs.gov/pub/irs-soi")
 IRS_BMF_FILES = ["eo1.csv", "eo2.csv", "eo3.csv", "eo4.csv"]
 
 # ── ProPublica Nonprofit Explorer ──────────────────────────────────────
@@ -52,15 +52,53 @@ NODC_GITHUB_BASE = "https://raw.githubusercontent.com/Nonprofit-Open-Data-Collec
 DEFAULT_TIMEOUT = 30  # seconds
 DEFAULT_RETRIES = 3
 DEFAULT_RETRY_BACKOFF = 1.0  # seconds, multiplied by attempt number
-DISK_CACHE_DIR = DATA_DIR / "http_cache"
+# When set (e.g. http://127.0.0.1:8900), every RateLimitedSession request is
+# sent to this local mock (benchmarks/mock_upstream.py) as <mock>/<host>/<path>
+MOCK_UPSTREAM_URL = os.getenv("MOCK_UPSTREAM_URL", "").rstrip("/")
+# Mock responses get their own cache so they never mix with real ones
+DISK_CACHE_DIR = DATA_DIR / ("http_cache_mock" if MOCK_UPSTREAM_URL else "http_cache")
 DISK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 # ── Checkpoint settings ────────────────────────────────────────────────
 CHECKPOINT_INTERVAL = 100  # save every N operations (reduced from 500 for web scraping)
 
+# ── Address standardization ───────────────────────────────────────────
+# Parse cache survives --clean (it is not a checkpoint)
+ADDRESS_CACHE_PATH = INTERMEDIATE_DIR / "address_cache.pkl"
+ADDRESS_WORKERS = int(os.getenv("ADDRESS_WORKERS", os.cpu_count() or 1))
+ADDRESS_CHUNK_SIZE = 5000  # distinct addresses per worker task
+
+# ── Source linking ────────────────────────────────────────────────────
+# merge_all links EIN-less rows (VA VSO, NRD, VA Facilities) to IRS records
+LINK_THRESHOLD = 90  # token_sort_ratio on cleaned names, same state (and city)
+LINK_MAX_BLOCK = 200  # state|token blocks with more IRS rows are too generic
+
+# ── Deduplication ─────────────────────────────────────────────────────
+# The fuzzy name+city tier is sharded by state across a process pool
+# when there are enough candidates to pay for the pool; 1 = always serial
+DEDUP_WORKERS = int(os.getenv("DEDUP_WORKERS", os.cpu_count() or 1))
+DEDUP_PARALLEL_MIN_ROWS = 20_000
+# Phones / website domains shared by more rows than this (hotlines, national
+# sites listed by every chapter) are not treated as identifying
+DEDUP_SHARED_KEY_MAX_GROUP = 5
+# Persisted fuzzy-tier state for incremental runs; survives --clean, like the
+# address cache. DEDUP_INCREMENTAL=0 (or --full-dedup) always rebuilds
+DEDUP_STATE_PATH = INTERMEDIATE_DIR / "dedup_state.pkl"
+DEDUP_INCREMENTAL = os.getenv("DEDUP_INCREMENTAL", "1") != "0"
+DEDUP_INCREMENTAL_MAX_NEW = 0.5  # rebuild when a larger share of records is new
+
+# ── Output artifacts ───────────────────────────────────────────────────
+# Written next to the CSV in Stage 8; see loaders/artifacts.py
+OUTPUT_PARQUET = os.getenv("OUTPUT_PARQUET", "1") != "0"  # state-partitioned dataset
+OUTPUT_DATABASE = os.getenv("OUTPUT_DATABASE", "sqlite").lower()  # sqlite | duckdb | none
+
 # ── Enricher (web scraping for social media) ───────────────────────────
-ENRICHER_RATE_LIMIT = 0.5  # requests per second
+ENRICHER_RATE_LIMIT = float(os.getenv("ENRICHER_RATE_LIMIT", 0.5))  # requests per second (0 = unlimited)
 ENRICHER_TIMEOUT = 15
 
 # ── Logging ────────────────────────────────────────────────────────────
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# ── Profiling ──────────────────────────────────────────────────────────
+# main.py always writes run_report.json; the Chrome trace is opt-in (--trace)
+PROFILE_TRACE = os.getenv("PROFILE_TRACE", "0") != "0"
@@ -0,0 +1,59 @@
+"""Download payloads for the dashboard's export buttons.
+
+Exports are only serialized when the user asks for one. CSV output is
+written in row chunks so the full file never exists as a single Python
+string next to its encoded bytes.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+from typing import Iterator
+
+import pandas as pd
+
+# label → (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "CSV (gzip)": (".csv.gz", "application/gzip"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+EXPORT_CHUNK_ROWS = 10_000
+
+
+def export_key(*parts) -> str:
+    """Stable hash of the filter selection (and anything else) behind an export."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """Yield UTF-8 CSV bytes for df, header first, chunk_rows rows at a time."""
+    if len(df) == 0:
+        yield df.to_csv(index=False).encode("utf-8")
+        return
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+def export_bytes(df: pd.DataFrame, fmt: str) -> bytes:
+    """Serialize df in one of EXPORT_FORMATS."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    buffer = io.BytesIO()
+    if fmt == "Parquet":
+        df.to_parquet(buffer, index=False)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=6) as gz:
+            for chunk in iter_csv_chunks(df):
+                gz.write(chunk)
+    else:
+        for chunk in iter_csv_chunks(df):
+            buffer.write(chunk)
+    return buffer.getvalue()
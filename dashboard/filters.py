@@ -0,0 +1,122 @@
+"""Sidebar filter state and row filtering for the dashboard.
+
+The sidebar collects its widgets into a plain dict shaped like
+DEFAULT_FILTERS; apply_filters() turns that dict into a row subset, and
+cube_filters() reports whether the same selection can be answered from the
+pre-aggregated directory cube instead.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from utils.buckets import REVENUE_FILTER_GROUPS, employee_bucket, revenue_bucket
+
+DEFAULT_FILTERS = {
+    "search": "",
+    "grades": [],
+    "states": [],
+    "city": "",
+    "zip": "",
+    "categories": [],
+    "org_types": [],
+    "revenue": "Any",
+    "va": "Any",
+    "ntee": "",
+    "has_contact": False,
+    "employees": "Any",
+    "min_confidence": 0.0,
+}
+
+# Filters that map onto cube dimensions (revenue options are unions of
+# the cube's annual_revenue_range buckets)
+CUBE_FILTER_KEYS = {"grades", "states", "org_types", "va", "revenue"}
+
+
+def cube_filters(filters: dict) -> dict | None:
+    """Return cube slice arguments if only cube-dimension filters are active."""
+    for key, default in DEFAULT_FILTERS.items():
+        if key not in CUBE_FILTER_KEYS and filters.get(key, default) != default:
+            return None
+    return {
+        "states": filters.get("states") or None,
+        "grades": filters.get("grades") or None,
+        "org_types": filters.get("org_types") or None,
+        "va": filters.get("va", "Any"),
+        "revenue_ranges": REVENUE_FILTER_GROUPS.get(filters.get("revenue", "Any")),
+    }
+
+
+def apply_filters(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
+    """Apply the sidebar filter selection to the directory rows."""
+    filtered = df
+
+    search_query = filters.get("search")
+    if search_query:
+        mask = filtered["org_name"].str.contains(search_query, case=False, na=False)
+        for col in ["city", "mission_statement", "services_offered", "service_categories", "eligibility_requirements"]:
+            if col in filtered.columns:
+                mask |= filtered[col].str.contains(search_query, case=False, na=False)
+        filtered = filtered[mask]
+
+    selected_grades = filters.get("grades")
+    if selected_grades and "confidence_grade" in filtered.columns:
+        filtered = filtered[filtered["confidence_grade"].isin(selected_grades)]
+
+    selected_states = filters.get("states")
+    if selected_states:
+        filtered = filtered[filtered["state"].isin(selected_states)]
+
+    city_query = filters.get("city")
+    if city_query:
+        filtered = filtered[filtered["city"].str.contains(city_query, case=False, na=False)]
+
+    zip_query = filters.get("zip")
+    if zip_query:
+        filtered = filtered[filtered["zip_code"].str.startswith(zip_query, na=False)]
+
+    selected_categories = filters.get("categories")
+    if selected_categories:
+        cat_mask = pd.Series(False, index=filtered.index)
+        for cat in selected_categories:
+            cat_mask |= filtered["service_categories"].str.contains(cat, case=False, na=False)
+        filtered = filtered[cat_mask]
+
+    selected_org_types = filters.get("org_types")
+    if selected_org_types:
+        filtered = filtered[filtered["org_type"].isin(selected_org_types)]
+
+    selected_revenue = filters.get("revenue", "Any")
+    if selected_revenue != "Any":
+        revenue_range = (
+            filtered["annual_revenue_range"] if "annual_revenue_range" in filtered.columns
+            else revenue_bucket(filtered["total_revenue"])
+        )
+        filtered = filtered[revenue_range.isin(REVENUE_FILTER_GROUPS[selected_revenue])]
+
+    va_filter = filters.get("va", "Any")
+    if va_filter == "Yes":
+        filtered = filtered[filtered["va_accredited"] == "Yes"]
+    elif va_filter == "No":
+        filtered = filtered[filtered["va_accredited"] != "Yes"]
+
+    ntee_input = filters.get("ntee")
+    if ntee_input:
+        filtered = filtered[filtered["ntee_code"].str.startswith(ntee_input.upper(), na=False)]
+
+    if filters.get("has_contact"):
+        contact_mask = pd.Series(False, index=filtered.index)
+        for col in ["phone", "email", "website"]:
+            if col in filtered.columns:
+                contact_mask |= filtered[col].notna() & (filtered[col].str.strip() != "")
+        filtered = filtered[contact_mask]
+
+    selected_employees = filters.get("employees", "Any")
+    if selected_employees != "Any":
+        filtered = filtered[employee_bucket(filtered["num_employees"]) == selected_employees]
+
+    min_confidence = filters.get("min_confidence", 0.0)
+    if min_confidence > 0:
+        filtered = filtered[filtered["confidence_score"] >= min_confidence]
+
+    return filtered.copy()
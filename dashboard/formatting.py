@@ -0,0 +1,95 @@
+"""Display formatting for the dashboard: currency and map hover labels.
+
+Everything here accepts whole Series so labels for thousands of map points
+are built with column operations instead of a per-row DataFrame.apply.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# (threshold, divisor, printf format) — checked top-down
+_CURRENCY_SCALES = [
+    (1_000_000_000, 1_000_000_000, "$%.1fB"),
+    (1_000_000, 1_000_000, "$%.1fM"),
+    (1_000, 1_000, "$%.0fK"),
+]
+
+
+def format_currency(val):
+    """Format a number (or a Series of numbers) as $1.2M / $350K / $800."""
+    if isinstance(val, pd.Series):
+        return _format_currency_series(val)
+    if pd.isna(val):
+        return "N/A"
+    for threshold, divisor, fmt in _CURRENCY_SCALES:
+        if val >= threshold:
+            return fmt % (val / divisor)
+    return "$%.0f" % val
+
+
+def _format_currency_series(values: pd.Series) -> pd.Series:
+    v = pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    out = np.full(v.shape, "N/A", dtype=object)
+    remaining = ~np.isnan(v)
+    for threshold, divisor, fmt in _CURRENCY_SCALES:
+        mask = remaining & (v >= threshold)
+        if mask.any():
+            out[mask] = np.char.mod(fmt, v[mask] / divisor)
+        remaining &= ~mask
+    if remaining.any():
+        out[remaining] = np.char.mod("$%.0f", v[remaining])
+    return pd.Series(out, index=values.index, dtype=object)
+
+
+def format_count(values: pd.Series) -> pd.Series:
+    """Format integer counts with thousands separators."""
+    return values.fillna(0).astype("int64").map("{:,}".format)
+
+
+def _text(values: pd.Series, default: str = "") -> pd.Series:
+    return values.astype(object).where(values.notna(), default).astype(str)
+
+
+def state_hover_text(summary: pd.DataFrame, click_hint: bool = False) -> pd.Series:
+    """Choropleth hover text for a per-state summary frame."""
+    name = summary["state_name"].where(summary["state_name"].notna(), summary["state"])
+    text = (
+        "<b>" + _text(name) + "</b><br>"
+        + "Organizations: " + format_count(summary["org_count"]) + "<br>"
+        + "Total Revenue: " + format_currency(summary["total_revenue"]) + "<br>"
+        + "VA Accredited: " + format_count(summary["va_accredited"])
+    )
+    if "with_financials" in summary.columns:
+        text = text + "<br>With Financials: " + format_count(summary["with_financials"])
+    if click_hint:
+        text = text + "<br><i>Click to explore →</i>"
+    return text
+
+
+def org_hover_labels(orgs: pd.DataFrame) -> pd.Series:
+    """Map-point hover labels for individual organizations."""
+    return (
+        "<b>" + _text(orgs["org_name"], "N/A") + "</b><br>"
+        + _text(orgs["city"]) + " " + _text(orgs["state"]) + "<br>"
+        + "Type: " + _text(orgs["org_type"], "N/A") + "<br>"
+        + "Revenue: " + format_currency(orgs["total_revenue"]) + "<br>"
+        + "Tier: " + _text(orgs["confidence_grade"], "N/A")
+    )
+
+
+def cluster_hover_labels(clusters: pd.DataFrame) -> pd.Series:
+    """Map hover labels for quadtree cluster bubbles."""
+    def _tier(name):
+        if name in clusters.columns:
+            return format_count(clusters[name])
+        return pd.Series("0", index=clusters.index)
+
+    return (
+        "<b>" + format_count(clusters["count"]) + " organizations</b><br>"
+        + "Enriched: " + _tier("Enriched") + " · "
+        + "Baseline: " + _tier("Baseline") + " · "
+        + "Partial: " + _tier("Partial") + "<br>"
+        + "<i>Click to zoom in →</i>"
+    )
@@ -0,0 +1,111 @@
+"""Multi-resolution point clustering for the dashboard state map.
+
+Every org's lat/lng is projected once onto a Web-Mercator quadtree at
+MAX_ZOOM. Coarser levels are right-shifts of those integer tile
+coordinates, so clustering at any zoom is a groupby over two int columns
+rather than a distance computation, and drilling into a cluster is a
+cheap mask on the same columns.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+MAX_ZOOM = 16
+
+# Cluster cells are 2**offset times finer than the map tiles at the
+# current zoom, i.e. roughly an 8×8 grid of clusters per map tile.
+CLUSTER_GRID_OFFSET = 3
+
+_MAX_LAT = 85.05112878
+
+
+def tile_coords(lat: pd.Series, lng: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Project lat/lng to quadtree tile x/y at MAX_ZOOM (-1 where missing)."""
+    lat_arr = pd.to_numeric(lat, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    lng_arr = pd.to_numeric(lng, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    valid = ~(np.isnan(lat_arr) | np.isnan(lng_arr))
+
+    n = 1 << MAX_ZOOM
+    lat_rad = np.radians(np.clip(np.nan_to_num(lat_arr), -_MAX_LAT, _MAX_LAT))
+    x = (np.nan_to_num(lng_arr) + 180.0) / 360.0 * n
+    y = (1.0 - np.arcsinh(np.tan(lat_rad)) / np.pi) / 2.0 * n
+
+    tile_x = np.where(valid, np.clip(x, 0, n - 1), -1).astype("int64")
+    tile_y = np.where(valid, np.clip(y, 0, n - 1), -1).astype("int64")
+    return tile_x, tile_y
+
+
+def zoom_for_bounds(lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> int:
+    """Approximate mapbox zoom level that fits a bounding box."""
+    max_span = max(lat_max - lat_min, lon_max - lon_min)
+    if max_span > 15:
+        return 4
+    elif max_span > 8:
+        return 5
+    elif max_span > 4:
+        return 6
+    elif max_span > 2:
+        return 7
+    elif max_span > 1:
+        return 8
+    elif max_span > 0.5:
+        return 9
+    elif max_span > 0.25:
+        return 10
+    return 11
+
+
+def cluster_level_for_zoom(zoom: int) -> int:
+    """Quadtree level used to cluster points displayed at a map zoom."""
+    return min(zoom + CLUSTER_GRID_OFFSET, MAX_ZOOM)
+
+
+def in_cell(df: pd.DataFrame, level: int, cell_x: int, cell_y: int) -> pd.Series:
+    """Mask of rows whose tile falls inside a quadtree cell at the given level."""
+    scale = 1 << (MAX_ZOOM - level)
+    return ((df["tile_x"] // scale) == cell_x) & ((df["tile_y"] // scale) == cell_y)
+
+
+def cell_bounds(level: int, cell_x: int, cell_y: int) -> tuple[float, float, float, float]:
+    """Return (lat_min, lat_max, lon_min, lon_max) of a quadtree cell."""
+    n = 1 << level
+
+    def _lat(y):
+        return float(np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * y / n)))))
+
+    return (
+        _lat(cell_y + 1), _lat(cell_y),
+        cell_x / n * 360.0 - 180.0, (cell_x + 1) / n * 360.0 - 180.0,
+    )
+
+
+def cluster_points(df: pd.DataFrame, level: int) -> pd.DataFrame:
+    """Aggregate geocoded rows into quadtree cells at the given level.
+
+    Returns one row per non-empty cell with the cell coordinates, the
+    number of orgs, their mean position, and per-tier counts.
+    """
+    shift = MAX_ZOOM - level
+    located = df[df["tile_x"] >= 0]
+    keys = pd.DataFrame({
+        "cell_x": located["tile_x"].to_numpy() >> shift,
+        "cell_y": located["tile_y"].to_numpy() >> shift,
+        "lat": located["lat"].to_numpy(dtype="float64"),
+        "lng": located["lng"].to_numpy(dtype="float64"),
+        "grade": located["confidence_grade"].to_numpy()
+        if "confidence_grade" in located.columns else "Partial",
+    })
+
+    clusters = keys.groupby(["cell_x", "cell_y"], sort=True).agg(
+        count=("lat", "size"),
+        lat=("lat", "mean"),
+        lng=("lng", "mean"),
+    )
+    tiers = pd.crosstab([keys["cell_x"], keys["cell_y"]], keys["grade"])
+    clusters = clusters.join(tiers).fillna(0).reset_index()
+    count_cols = ["count", *tiers.columns]
+    clusters[count_cols] = clusters[count_cols].astype("int64")
+    clusters["level"] = level
+    return clusters
@@ -0,0 +1,69 @@
+"""Constant-time organization lookups for the dashboard.
+
+An OrgIndex is built once per dataset version and maps org ids, EINs and
+org names to row positions in the loaded directory frame, so opening a profile or
+resolving a search pick does not scan every row.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+class OrgIndex:
+    """org_id / EIN → position and name → positions lookups into one directory frame."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.size = len(df)
+        positions = np.arange(self.size)
+
+        ids = df["org_id"].to_numpy(dtype=object)
+        has_id = pd.notna(ids)
+        self._by_id = dict(zip(ids[has_id].tolist(), positions[has_id].tolist()))
+
+        eins = df["ein"].to_numpy(dtype=object)
+        has_ein = pd.notna(eins)
+        ein_keys = pd.Series(positions[has_ein], index=eins[has_ein])
+        # First occurrence wins, matching the old matches.iloc[0]
+        self._by_ein = ein_keys[~ein_keys.index.duplicated()].to_dict()
+
+        # Codes follow first appearance, so code order is row order
+        self._name_codes, names = pd.factorize(df["org_name"], sort=False)
+        self._names = pd.Series(names, dtype=object)
+        self._by_name = df.groupby("org_name", sort=False).indices
+
+    def position_for_id(self, org_id) -> int | None:
+        """Row position of the org with this org_id, or None."""
+        return self._by_id.get(org_id)
+
+    def position_for_ein(self, ein) -> int | None:
+        """Row position of the org with this EIN, or None."""
+        return self._by_ein.get(ein)
+
+    def positions_for_name(self, name: str, within: np.ndarray | None = None) -> np.ndarray:
+        """Row positions carrying this exact org name, optionally limited to a subset."""
+        found = self._by_name.get(name, np.empty(0, dtype="int64"))
+        if within is not None:
+            found = found[self._member_mask(within)[found]]
+        return found
+
+    def search_names(self, query: str, within: np.ndarray | None = None, limit: int = 20) -> list[str]:
+        """Distinct org names containing query (case-insensitive), in row order.
+
+        Matching runs over the distinct names rather than every row;
+        ``within`` restricts results to names present at those positions.
+        """
+        hits = self._names.str.contains(query, case=False, na=False).to_numpy()
+        if within is None:
+            codes = np.flatnonzero(hits)[:limit]
+        else:
+            row_codes = self._name_codes[within]
+            row_codes = row_codes[row_codes >= 0]
+            codes = pd.unique(row_codes[hits[row_codes]])[:limit]
+        return self._names.iloc[codes].tolist()
+
+    def _member_mask(self, within: np.ndarray) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        mask[within] = True
+        return mask
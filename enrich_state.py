@@ -100,12 +100,31 @@ HEADERS = {
 
 
 def load_checkpoint(state_code):
-    """Load enrichment checkpoint for a state."""
+    """Load enrichment checkpoint for a state (keyed by org_id)."""
     path = CHECKPOINT_DIR / f"enrich_{state_code.lower()}.json"
     if path.exists():
         with open(path) as f:
             return json.load(f)
-    return {"done_eins": [], "enrichments": {}}
+    return {"done_ids": [], "enrichments": {}}
+
+
+def migrate_checkpoint(ckpt, df):
+    """Re-key an old checkpoint (done EINs + row positions) by org_id.
+
+    Old checkpoints only hold while the CSV they were made against is
+    unchanged; positions that no longer exist are dropped.
+    """
+    if "done_ids" in ckpt:
+        return ckpt
+    ids_by_ein = dict(zip(df["ein"].dropna(), df.loc[df["ein"].notna(), "org_id"]))
+    done = [ids_by_ein[ein] for ein in ckpt.get("done_eins", []) if ein in ids_by_ein]
+    enrichments = {}
+    for idx_str, info in ckpt.get("enrichments", {}).items():
+        idx = int(idx_str)
+        if idx in df.index:
+            enrichments[df.at[idx, "org_id"]] = info
+    logger.info(f"Migrated checkpoint: {len(done)} done, {len(enrichments)} enrichments re-keyed by org_id")
+    return {"done_ids": done, "enrichments": enrichments}
 
 
 def save_checkpoint(state_code, data):
@@ -288,7 +307,9 @@ def main():
     # Load CSV
     logger.info(f"Loading {OUTPUT_CSV}")
     import pandas as pd
-    df = pd.read_csv(OUTPUT_CSV, low_memory=False)
+    df = pd.read_csv(OUTPUT_CSV, dtype={"ein": str, "org_id": str}, low_memory=False)
+    if "org_id" not in df.columns or df["org_id"].isna().any():
+        sys.exit(f"{OUTPUT_CSV} has rows without an org_id; re-run the pipeline (Stage 6 assigns them)")
 
     # Filter to state
     state_mask = df["state"].str.upper() == state
@@ -296,21 +317,21 @@ def main():
     logger.info(f"Found {len(state_df):,} orgs in {state}")
 
     # Load checkpoint
-    ckpt = {"done_eins": [], "enrichments": {}}
+    ckpt = {"done_ids": [], "enrichments": {}}
     if args.resume:
-        ckpt = load_checkpoint(state)
-        logger.info(f"Resuming: {len(ckpt['done_eins'])} already done")
+        ckpt = migrate_checkpoint(load_checkpoint(state), df)
+        logger.info(f"Resuming: {len(ckpt['done_ids'])} already done")
 
-    done_set = set(ckpt["done_eins"])
+    done_set = set(ckpt["done_ids"])
     enrichments = ckpt["enrichments"]
 
     # Build work queue
     work = []
-    for idx, row in state_df.iterrows():
-        ein = str(row.get("ein", ""))
-        if ein and ein in done_set:
+    for _, row in state_df.iterrows():
+        org_id = row["org_id"]
+        if org_id in done_set:
             continue
-        work.append((idx, ein, row["org_name"], row.get("city", ""), state))
+        work.append((org_id, row["org_name"], row.get("city", ""), state))
 
     if args.limit > 0:
         work = work[:args.limit]
@@ -318,25 +339,23 @@ def main():
     logger.info(f"Enriching {len(work):,} orgs...")
     found_count = 0
 
-    for i, (idx, ein, name, city, st) in enumerate(tqdm(work, desc=f"Enriching {state}", unit="org")):
+    for i, (org_id, name, city, st) in enumerate(tqdm(work, desc=f"Enriching {state}", unit="org")):
         try:
             info = enrich_org(name, city, st)
         except Exception as e:
             logger.warning(f"Error on {name}: {e}")
             time.sleep(3)
-            if ein:
-                done_set.add(ein)
-                ckpt["done_eins"] = list(done_set)
+            done_set.add(org_id)
+            ckpt["done_ids"] = list(done_set)
             continue
 
-        if ein:
-            done_set.add(ein)
-            ckpt["done_eins"] = list(done_set)
+        done_set.add(org_id)
+        ckpt["done_ids"] = list(done_set)
 
         if info:
             found_fields = [k for k, v in info.items() if v]
             if found_fields:
-                enrichments[str(idx)] = info
+                enrichments[org_id] = info
                 found_count += 1
                 tqdm.write(f"  {name}: {', '.join(found_fields)}")
 
@@ -359,9 +378,12 @@ def main():
         "facebook_url", "twitter_url", "linkedin_url", "instagram_url", "youtube_url",
     ]
 
+    rows_by_id = pd.Series(df.index, index=df["org_id"])
     updated = 0
-    for idx_str, info in enrichments.items():
-        idx = int(idx_str)
+    for org_id, info in enrichments.items():
+        idx = rows_by_id.get(org_id)
+        if idx is None:
+            continue
         for field in fields_to_update:
             value = info.get(field, "")
             if value and (pd.isna(df.at[idx, field]) or df.at[idx, field] == ""):
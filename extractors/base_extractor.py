@@ -9,6 +9,7 @@ import pandas as pd
 from config.schema import COLUMN_NAMES, coerce_schema
 from config.settings import INTERMEDIATE_DIR
 from utils.checkpoint import has_checkpoint, load_checkpoint, save_checkpoint
+from utils.profiling import span
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +32,13 @@ class BaseExtractor(ABC):
         return df
 
     def run(self, resume: bool = False) -> pd.DataFrame:
-        """Execute full extract → transform → save pipeline."""
+        """Execute full extract → transform → save pipeline (profiled)."""
+        with span(f"extractor.{self.name}", category="extractor", resume=resume) as s:
+            df = self._run(resume)
+            s.rows_out = len(df) if df is not None else None
+            return df
+
+    def _run(self, resume: bool) -> pd.DataFrame:
         checkpoint_name = f"extractor_{self.name}"
 
         if resume and has_checkpoint(checkpoint_name):
@@ -15,6 +15,7 @@ from config.ntee_codes import EXCLUDE_PATTERNS, VETERAN_KEYWORDS
 from config.settings import IRS_BMF_BASE_URL, IRS_BMF_FILES, RAW_DIR
 from extractors.base_extractor import BaseExtractor
 from utils.http_client import RateLimitedSession
+from utils.unique_map import map_unique, strip, strip_title, strip_upper
 
 logger = logging.getLogger(__name__)
 
@@ -100,20 +101,23 @@ class IrsBmfExtractor(BaseExtractor):
         return lower_names.str.contains(pattern, regex=True, na=False)
 
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Text columns repeat heavily (cities, states, codes), so each
+        # transform runs once per distinct value
         out = pd.DataFrame()
-        out["org_name"] = df["NAME"].str.strip().str.title()
-        out["org_name_alt"] = df.get("SORT_NAME", pd.Series(dtype="string")).str.strip().str.title()
+        out["org_name"] = map_unique(df["NAME"], strip_title)
+        out["org_name_alt"] = map_unique(df.get("SORT_NAME", pd.Series(dtype="string")), strip_title)
         out["ein"] = df["EIN"].str.strip()
-        out["street_address"] = df["STREET"].str.strip().str.title()
-        out["city"] = df["CITY"].str.strip().str.title()
-        out["state"] = df["STATE"].str.strip().str.upper()
-        out["zip_code"] = df["ZIP"].str.strip().str[:10]
+        out["street_address"] = map_unique(df["STREET"], strip_title)
+        out["city"] = map_unique(df["CITY"], strip_title)
+        out["state"] = map_unique(df["STATE"], strip_upper)
+        out["zip_code"] = map_unique(df["ZIP"], lambda s: s.str.strip().str[:10])
         out["country"] = "US"
-        out["ntee_code"] = df["NTEE_CD"].str.strip()
-        out["irs_subsection"] = df["SUBSECTION"].str.strip()
-        out["irs_filing_requirement"] = df["FILING_REQ_CD"].str.strip()
-        out["ruling_date"] = df["RULING"].str.strip()
-        out["fiscal_year_end"] = df["ACCT_PD"].str.strip()
+        out["ntee_code"] = map_unique(df["NTEE_CD"], strip)
+        subsection = map_unique(df["SUBSECTION"], strip)
+        out["irs_subsection"] = subsection
+        out["irs_filing_requirement"] = map_unique(df["FILING_REQ_CD"], strip)
+        out["ruling_date"] = map_unique(df["RULING"], strip)
+        out["fiscal_year_end"] = map_unique(df["ACCT_PD"], strip)
         out["total_assets"] = pd.to_numeric(df["ASSET_AMT"], errors="coerce")
         out["total_revenue"] = pd.to_numeric(df["REVENUE_AMT"], errors="coerce")
 
@@ -124,9 +128,7 @@ class IrsBmfExtractor(BaseExtractor):
             "19": "501(c)(19)",
             "23": "501(c)(23)",
         }
-        out["org_type"] = df["SUBSECTION"].str.strip().map(subsection_map).fillna(
-            "501(c)(" + df["SUBSECTION"].str.strip() + ")"
-        )
+        out["org_type"] = subsection.map(subsection_map).fillna("501(c)(" + subsection + ")")
 
         # Derive tax_exempt_status from STATUS
         status_map = {
@@ -137,6 +139,6 @@ class IrsBmfExtractor(BaseExtractor):
         }
         out["tax_exempt_status"] = df.get("STATUS", pd.Series(dtype="string"))
         if "STATUS" in df.columns:
-            out["tax_exempt_status"] = df["STATUS"].str.strip().map(status_map)
+            out["tax_exempt_status"] = map_unique(df["STATUS"], strip).map(status_map)
 
         return out
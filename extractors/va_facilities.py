@@ -17,6 +17,7 @@ from config.settings import (
 )
 from extractors.base_extractor import BaseExtractor
 from utils.http_client import RateLimitedSession
+from utils.unique_map import map_unique, strip, strip_title, strip_upper
 
 logger = logging.getLogger(__name__)
 
@@ -124,14 +125,16 @@ class VaFacilitiesExtractor(BaseExtractor):
         out["org_name"] = df["org_name"].str.strip()
         out["street_address"] = df["street_address"].str.strip()
         out["street_address_2"] = df.get("street_address_2", pd.Series(dtype="string"))
-        out["city"] = df["city"].str.strip().str.title()
-        out["state"] = df["state"].str.strip().str.upper()
-        out["zip_code"] = df["zip_code"].str.strip()
+        out["city"] = map_unique(df["city"], strip_title)
+        out["state"] = map_unique(df["state"], strip_upper)
+        out["zip_code"] = map_unique(df["zip_code"], strip)
         out["country"] = "US"
         out["phone"] = df["phone"]
         out["website"] = df["website"]
         out["services_offered"] = df["services_offered"]
         out["org_type"] = "VA Facility"
         out["va_accredited"] = "Yes"
-        out["accreditation_details"] = "VA " + df["facility_type"].str.replace("_", " ").str.title()
+        out["accreditation_details"] = "VA " + map_unique(
+            df["facility_type"], lambda s: s.str.replace("_", " ").str.title()
+        )
         return out
@@ -14,6 +14,7 @@ from bs4 import BeautifulSoup
 
 from extractors.base_extractor import BaseExtractor
 from utils.http_client import RateLimitedSession
+from utils.unique_map import map_unique, strip_title, strip_upper
 
 logger = logging.getLogger(__name__)
 
@@ -157,9 +158,10 @@ class VaVsoExtractor(BaseExtractor):
         if df.empty:
             return df
         out = pd.DataFrame()
-        out["org_name"] = df["org_name"].str.strip().str.title()
-        out["city"] = df.get("city", pd.Series(dtype="string")).str.strip().str.title()
-        out["state"] = df.get("state", pd.Series(dtype="string")).str.strip().str.upper()
+        # One row per representative, so org/city/state repeat heavily
+        out["org_name"] = map_unique(df["org_name"], strip_title)
+        out["city"] = map_unique(df.get("city", pd.Series(dtype="string")), strip_title)
+        out["state"] = map_unique(df.get("state", pd.Series(dtype="string")), strip_upper)
         out["zip_code"] = df.get("zip_code", pd.Series(dtype="string"))
         out["phone"] = df.get("phone", pd.Series(dtype="string"))
         out["va_accredited"] = "Yes"
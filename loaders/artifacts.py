@@ -0,0 +1,186 @@
+"""Columnar and indexed copies of the final directory.
+
+Next to the Excel-friendly CSV, Stage 8 writes:
+
+- a Hive-partitioned Parquet dataset (``state=KY/part-0.parquet``), so a
+  consumer that needs one state reads one partition instead of parsing the
+  whole CSV, with column types preserved;
+- an SQLite (or DuckDB) file with indexes on ein, state and org_name;
+- ``manifest.json`` listing every artifact with its row counts, columns
+  and sizes.
+
+The frame is converted to Arrow once and every artifact is written from
+that table. read_directory() is the matching reader.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config.schema import coerce_schema
+from config.settings import OUTPUT_DATABASE, OUTPUT_DIR, OUTPUT_PARQUET
+
+logger = logging.getLogger(__name__)
+
+DATASET_DIRNAME = "veteran_org_directory.parquet"
+DIRECTORY_STEM = "veteran_org_directory"
+DATABASE_TABLE = "organizations"
+DATABASE_INDEXES = ["ein", "state", "org_name"]
+MANIFEST_FILENAME = "manifest.json"
+
+PARTITION_COLUMN = "state"
+# Directory name pyarrow reads back as a null partition value
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+_PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive")
+
+
+def write_artifacts(
+    df: pd.DataFrame,
+    csv_path: Path,
+    parquet: bool = OUTPUT_PARQUET,
+    database: str = OUTPUT_DATABASE,
+) -> Path:
+    """Write the Parquet dataset, database and manifest for a final directory.
+
+    Returns the manifest path.
+    """
+    output_dir = Path(csv_path).parent
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    manifest = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "rows": len(df),
+        "columns": {col: str(dtype) for col, dtype in df.dtypes.items()},
+        "csv": _file_entry(Path(csv_path), output_dir),
+    }
+
+    if parquet:
+        manifest["parquet"] = _write_partitioned(df, table, output_dir / DATASET_DIRNAME, output_dir)
+
+    if database == "sqlite":
+        manifest["database"] = _write_sqlite(df, output_dir / f"{DIRECTORY_STEM}.sqlite", output_dir)
+    elif database == "duckdb":
+        manifest["database"] = _write_duckdb(table, output_dir / f"{DIRECTORY_STEM}.duckdb", output_dir)
+    elif database not in ("", "none"):
+        logger.warning(f"Unknown OUTPUT_DATABASE {database!r}; skipping database output")
+
+    manifest_path = output_dir / MANIFEST_FILENAME
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    logger.info(f"Output manifest: {manifest_path}")
+    return manifest_path
+
+
+def _file_entry(path: Path, output_dir: Path) -> dict:
+    return {"path": path.relative_to(output_dir).as_posix(), "bytes": path.stat().st_size}
+
+
+def _write_partitioned(df: pd.DataFrame, table: pa.Table, dataset_dir: Path, output_dir: Path) -> dict:
+    """One Parquet file per state under state=<value>/, swapped in atomically."""
+    tmp_dir = dataset_dir.with_name(dataset_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    body = table.drop_columns([PARTITION_COLUMN])
+    partitions = {}
+    groups = df.groupby(PARTITION_COLUMN, dropna=False, sort=True).indices
+    for state, positions in groups.items():
+        value = NULL_PARTITION if pd.isna(state) else quote(str(state), safe="")
+        part_dir = tmp_dir / f"{PARTITION_COLUMN}={value}"
+        part_dir.mkdir(parents=True)
+        pq.write_table(body.take(positions), part_dir / "part-0.parquet")
+        partitions[value] = {
+            "path": f"{DATASET_DIRNAME}/{part_dir.name}/part-0.parquet",
+            "rows": len(positions),
+        }
+
+    shutil.rmtree(dataset_dir, ignore_errors=True)
+    tmp_dir.rename(dataset_dir)
+
+    total_bytes = sum(f.stat().st_size for f in dataset_dir.rglob("*.parquet"))
+    logger.info(f"Wrote Parquet dataset: {len(partitions)} state partitions → {dataset_dir}")
+    return {
+        "path": dataset_dir.relative_to(output_dir).as_posix(),
+        "partition_by": PARTITION_COLUMN,
+        "bytes": total_bytes,
+        "partitions": partitions,
+    }
+
+
+def _write_sqlite(df: pd.DataFrame, path: Path, output_dir: Path) -> dict:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    with closing(sqlite3.connect(tmp)) as con:
+        # Scratch file until the rename below, so skip journaling and fsyncs
+        con.execute("PRAGMA journal_mode=OFF")
+        con.execute("PRAGMA synchronous=OFF")
+        df.to_sql(DATABASE_TABLE, con, index=False, chunksize=10_000)
+        for col in DATABASE_INDEXES:
+            con.execute(f"CREATE INDEX idx_{DATABASE_TABLE}_{col} ON {DATABASE_TABLE} ({col})")
+        con.commit()
+    os.replace(tmp, path)
+    logger.info(f"Wrote SQLite database: {len(df):,} rows → {path}")
+    return {"engine": "sqlite", "table": DATABASE_TABLE, "indexes": DATABASE_INDEXES, **_file_entry(path, output_dir)}
+
+
+def _write_duckdb(table: pa.Table, path: Path, output_dir: Path) -> dict | None:
+    try:
+        import duckdb
+    except ImportError:
+        logger.warning("duckdb is not installed; skipping database output (pip install duckdb)")
+        return None
+
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    con = duckdb.connect(str(tmp))
+    try:
+        con.register("directory", table)
+        con.execute(f"CREATE TABLE {DATABASE_TABLE} AS SELECT * FROM directory")
+        for col in DATABASE_INDEXES:
+            con.execute(f"CREATE INDEX idx_{DATABASE_TABLE}_{col} ON {DATABASE_TABLE} ({col})")
+    finally:
+        con.close()
+    os.replace(tmp, path)
+    logger.info(f"Wrote DuckDB database: {table.num_rows:,} rows → {path}")
+    return {"engine": "duckdb", "table": DATABASE_TABLE, "indexes": DATABASE_INDEXES, **_file_entry(path, output_dir)}
+
+
+def read_directory(
+    state: str | None = None,
+    columns: list[str] | None = None,
+    output_dir: Path = OUTPUT_DIR,
+) -> pd.DataFrame:
+    """Load the final directory, or one state of it, with schema dtypes.
+
+    Reads only the matching partition of the Parquet dataset; falls back to
+    the CSV when no dataset has been written yet.
+    """
+    dataset_dir = output_dir / DATASET_DIRNAME
+    if dataset_dir.exists():
+        dataset = ds.dataset(dataset_dir, format="parquet", partitioning=_PARTITIONING)
+        row_filter = ds.field(PARTITION_COLUMN) == state if state is not None else None
+        df = dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+    else:
+        csv_path = output_dir / f"{DIRECTORY_STEM}.csv"
+        logger.info(f"No Parquet dataset in {output_dir}; reading {csv_path}")
+        df = pd.read_csv(csv_path, dtype=str, low_memory=False)
+        if state is not None:
+            df = df[df[PARTITION_COLUMN] == state].reset_index(drop=True)
+        if columns is not None:
+            df = df[columns]
+
+    if columns is None:
+        df = coerce_schema(df)
+    return df
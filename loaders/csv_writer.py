@@ -1,9 +1,9 @@
 """Final CSV output with confidence scores and summary report."""
 
-import json
 import logging
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from config.schema import (
@@ -11,30 +11,56 @@ from config.schema import (
     CONFIDENCE_TIERS,
     CONFIDENCE_WEIGHTS,
     FIELD_GROUPS,
+    FILLED_COLUMNS,
     GRADE_INFO,
     coerce_schema,
-    revenue_to_range,
+    encode_confidence_sources,
 )
 from config.settings import OUTPUT_DIR
+from loaders.artifacts import write_artifacts
+from loaders.cube import write_cube
+from loaders.stats import collect_stats, write_stats
+from utils.buckets import revenue_bucket
 
 logger = logging.getLogger(__name__)
 
 
-def calculate_confidence(df: pd.DataFrame) -> pd.Series:
+def filled_matrix(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """Boolean frame with one column per name: non-null and not blank.
+
+    Columns missing from df are all False.
+    """
+    filled = {}
+    for col in columns:
+        if col in filled:
+            continue
+        if col not in df.columns:
+            filled[col] = np.zeros(len(df), dtype=bool)
+            continue
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values):
+            filled[col] = values.notna().to_numpy()
+        else:
+            text = values.astype("string").str.strip()
+            filled[col] = text.ne("").fillna(False).to_numpy(dtype=bool)
+    return pd.DataFrame(filled, index=df.index)
+
+
+def calculate_confidence(df: pd.DataFrame, filled: pd.DataFrame | None = None) -> pd.Series:
     """Calculate a confidence score (0.0–1.0) per row based on field completeness."""
-    scores = pd.Series(0.0, index=df.index, dtype="float64")
+    weights = pd.Series(CONFIDENCE_WEIGHTS, dtype="float64")
+    present = [col for col in weights.index if col in df.columns]
+    if filled is None:
+        filled = filled_matrix(df, present)
 
-    for col, weight in CONFIDENCE_WEIGHTS.items():
-        if col in df.columns:
-            filled = df[col].notna() & (df[col].astype(str).str.strip() != "")
-            scores += filled.astype(float) * weight
+    scores = filled[present].to_numpy(dtype="float64") @ weights[present].to_numpy()
 
     # Normalize to 0-1 (weights should sum to ~1.0 already)
-    total_weight = sum(CONFIDENCE_WEIGHTS.values())
+    total_weight = weights.sum()
     if total_weight > 0:
         scores = scores / total_weight
 
-    return scores.round(3)
+    return pd.Series(scores, index=df.index, dtype="float64").round(3)
 
 
 # Source heuristic: map field group → likely data source
@@ -50,86 +76,75 @@ _GROUP_SOURCE_MAP = {
     "personnel": "propublica",
 }
 
+GRADES = ["A", "B", "C", "D", "F"]
 
-def _row_has(row, col):
-    """Check if a row value is non-null and non-empty."""
-    val = row.get(col)
-    if val is None:
-        return False
-    try:
-        if pd.isna(val):
-            return False
-    except (ValueError, TypeError):
-        pass
-    return str(val).strip() != ""
-
-
-def assign_grade(row) -> str:
-    """Assign a letter grade A-F based on what field groups are present."""
-    has_name = _row_has(row, "org_name")
-    has_ein = _row_has(row, "ein")
-    has_address = _row_has(row, "street_address") or (_row_has(row, "city") and _row_has(row, "state"))
-    has_financials = _row_has(row, "total_revenue")
-    has_ntee = _row_has(row, "ntee_code")
-    has_contact = _row_has(row, "phone") or _row_has(row, "email") or _row_has(row, "website")
-    has_rating = _row_has(row, "charity_navigator_rating") or (row.get("va_accredited") == "Yes")
-
-    has_identity = has_name and has_ein and has_address
-
-    if has_identity and has_financials and has_contact and has_rating:
-        return "A"
-    elif has_identity and has_financials and has_ntee:
-        return "B"
-    elif has_identity and (has_financials or has_ntee):
-        return "C"
-    elif has_name and has_ein and has_address:
-        return "D"
-    else:
-        return "F"
+# Fields read by assign_grades()
+_GRADE_FIELDS = [
+    "org_name", "ein", "street_address", "city", "state", "total_revenue", "ntee_code",
+    "phone", "email", "website", "charity_navigator_rating",
+]
 
+# Every field needed for scores, grades and the per-group breakdown
+_SCORED_FIELDS = list(dict.fromkeys(
+    list(CONFIDENCE_WEIGHTS) + _GRADE_FIELDS
+    + [f for gdef in FIELD_GROUPS.values() for f in gdef["fields"]]
+))
 
-def calculate_confidence_detail(df: pd.DataFrame) -> pd.Series:
-    """Calculate per-field-group breakdown as JSON for each row.
 
-    Returns a Series of JSON strings with structure:
-    {
-        "grade": "B",
-        "groups": {
-            "identity": {"filled": 3, "total": 3, "source": "irs_bmf"},
-            "financials": {"filled": 2, "total": 4, "source": "propublica"},
-            ...
-        }
-    }
+def assign_grades(filled: pd.DataFrame, va_accredited: pd.Series | None = None) -> np.ndarray:
+    """Letter grade A-F per row from a filled_matrix() over _GRADE_FIELDS.
+
+    Returns positions into GRADES. va_accredited only counts when it is "Yes".
     """
-    def _detail_for_row(row):
-        groups = {}
-        for gkey, gdef in FIELD_GROUPS.items():
-            fields = gdef["fields"]
-            filled = sum(1 for f in fields if _row_has(row, f))
-            # Infer source from data_sources column if available
-            source = gdef["source_hint"]
-            ds = row.get("data_sources")
-            if ds and isinstance(ds, str):
-                ds_lower = ds.lower()
-                if gkey == "financials" and "propublica" in ds_lower:
-                    source = "propublica"
-                elif gkey in ("identity", "location", "classification") and "irs_bmf" in ds_lower:
-                    source = "irs_bmf"
-                elif gkey == "contact" and ("va_vso" in ds_lower or "web" in ds_lower):
-                    source = "va_vso" if "va_vso" in ds_lower else "web_enrichment"
-                elif gkey == "ratings" and "charity_nav" in ds_lower:
-                    source = "charity_nav"
-
-            groups[gkey] = {
-                "filled": filled,
-                "total": len(fields),
-                "source": source,
-            }
-
-        grade = assign_grade(row)
-        return json.dumps({"grade": grade, "groups": groups})
-
-    return df.apply(_detail_for_row, axis=1)
+    has = {col: filled[col].to_numpy() for col in _GRADE_FIELDS}
+    va_yes = (
+        va_accredited.eq("Yes").fillna(False).to_numpy(dtype=bool)
+        if va_accredited is not None else np.zeros(len(filled), dtype=bool)
+    )
+
+    has_address = has["street_address"] | (has["city"] & has["state"])
+    has_financials = has["total_revenue"]
+    has_ntee = has["ntee_code"]
+    has_contact = has["phone"] | has["email"] | has["website"]
+    has_rating = has["charity_navigator_rating"] | va_yes
+
+    has_identity = has["org_name"] & has["ein"] & has_address
+
+    return np.select(
+        [
+            has_identity & has_financials & has_contact & has_rating,
+            has_identity & has_financials & has_ntee,
+            has_identity & (has_financials | has_ntee),
+            has_identity,
+        ],
+        [0, 1, 2, 3],
+        default=4,
+    )
+
+
+def calculate_confidence_groups(df: pd.DataFrame, filled: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Per-field-group filled counts plus the confidence_sources bitmask.
+
+    Returns one Int64 column per FILLED_COLUMNS entry and confidence_sources;
+    config.schema.decode_confidence_detail() turns a row back into the
+    {"grade", "groups": {group: {filled, total, source}}} breakdown.
+    """
+    if filled is None:
+        filled = filled_matrix(df, _SCORED_FIELDS)
+
+    groups = pd.DataFrame(index=df.index)
+    for gkey, col in FILLED_COLUMNS.items():
+        counts = filled[FIELD_GROUPS[gkey]["fields"]].to_numpy().sum(axis=1)
+        groups[col] = pd.array(counts, dtype="Int64")
+
+    # Flags depend only on data_sources, so encode each distinct value once
+    if "data_sources" in df.columns:
+        codes, values = pd.factorize(df["data_sources"])
+        flags = np.array([encode_confidence_sources(v) for v in values] + [0], dtype="int64")[codes]
+    else:
+        flags = np.zeros(len(df), dtype="int64")
+    groups["confidence_sources"] = pd.array(flags, dtype="Int64")
+    return groups
 
 
 def write_csv(df: pd.DataFrame, filename: str = "veteran_org_directory.csv") -> str:
@@ -139,17 +154,16 @@ def write_csv(df: pd.DataFrame, filename: str = "veteran_org_directory.csv") ->
     """
     df = coerce_schema(df.copy())
 
-    # Calculate confidence scores
-    df["confidence_score"] = calculate_confidence(df)
-
-    # Calculate confidence detail and grade
-    df["confidence_detail"] = calculate_confidence_detail(df)
-    df["confidence_grade"] = df["confidence_detail"].apply(
-        lambda x: json.loads(x)["grade"] if pd.notna(x) else "F"
-    )
+    # Confidence scores, grades and group counts from one filled matrix
+    filled = filled_matrix(df, _SCORED_FIELDS)
+    grades = assign_grades(filled, df["va_accredited"])
+    df["confidence_score"] = calculate_confidence(df, filled)
+    groups = calculate_confidence_groups(df, filled)
+    df[groups.columns] = groups
+    df["confidence_grade"] = pd.Series(np.array(GRADES, dtype=object)[grades], index=df.index)
 
     # Calculate revenue ranges
-    df["annual_revenue_range"] = df["total_revenue"].apply(revenue_to_range)
+    df["annual_revenue_range"] = revenue_bucket(df["total_revenue"])
 
     # Set record timestamp
     now = datetime.now().isoformat(timespec="seconds")
@@ -163,8 +177,18 @@ def write_csv(df: pd.DataFrame, filename: str = "veteran_org_directory.csv") ->
     df.to_csv(csv_path, index=False, encoding="utf-8-sig")
     logger.info(f"Wrote {len(df):,} records to {csv_path}")
 
+    # Partitioned Parquet, indexed database and manifest
+    write_artifacts(df, csv_path)
+
+    # Pre-aggregated cube for the dashboard summary tabs
+    cube = write_cube(df)
+
+    # Statistics for the summary report and downstream scripts
+    stats = collect_stats(df, cube)
+    write_stats(stats)
+
     # Generate summary report
-    report = _generate_summary(df)
+    report = render_summary(stats)
     report_path = OUTPUT_DIR / "summary_report.txt"
     report_path.write_text(report)
     logger.info(f"Summary report: {report_path}")
@@ -172,78 +196,76 @@ def write_csv(df: pd.DataFrame, filename: str = "veteran_org_directory.csv") ->
     return str(csv_path)
 
 
-def _generate_summary(df: pd.DataFrame) -> str:
-    """Generate a text summary report of the directory."""
+def render_summary(stats: dict) -> str:
+    """Render the text summary report from collect_stats() output."""
+    coverage = stats["coverage"]
+    confidence = stats["confidence"]
+
+    def _score(value):
+        return f"{value:.3f}" if value is not None else "nan"
+
     lines = [
         "=" * 70,
         "VETERAN ORGANIZATION DIRECTORY — SUMMARY REPORT",
-        f"Generated: {datetime.now().isoformat(timespec='seconds')}",
+        f"Generated: {stats['generated']}",
         "=" * 70,
         "",
-        f"Total organizations: {len(df):,}",
-        f"Unique EINs: {df['ein'].dropna().nunique():,}",
-        f"Records with EIN: {df['ein'].notna().sum():,}",
-        f"Records without EIN: {df['ein'].isna().sum():,}",
+        f"Total organizations: {stats['total']:,}",
+        f"Unique EINs: {stats['ein']['unique']:,}",
+        f"Records with EIN: {stats['ein']['with']:,}",
+        f"Records without EIN: {stats['ein']['without']:,}",
         "",
         "── Coverage ──",
-        f"States/territories represented: {df['state'].dropna().nunique()}",
-        f"Records with phone: {df['phone'].notna().sum():,}",
-        f"Records with email: {df['email'].notna().sum():,}",
-        f"Records with website: {df['website'].notna().sum():,}",
-        f"Records with mission: {df['mission_statement'].notna().sum():,}",
-        f"Records with financials: {df['total_revenue'].notna().sum():,}",
-        f"Records with CN rating: {df['charity_navigator_rating'].notna().sum():,}",
-        f"VA-accredited orgs: {(df['va_accredited'] == 'Yes').sum():,}",
+        f"States/territories represented: {len(stats['states'])}",
+        f"Records with phone: {coverage['phone']:,}",
+        f"Records with email: {coverage['email']:,}",
+        f"Records with website: {coverage['website']:,}",
+        f"Records with mission: {coverage['mission_statement']:,}",
+        f"Records with financials: {coverage['total_revenue']:,}",
+        f"Records with CN rating: {coverage['charity_navigator_rating']:,}",
+        f"VA-accredited orgs: {stats['va_accredited']:,}",
         "",
         "── Confidence Scores ──",
-        f"Mean confidence: {df['confidence_score'].mean():.3f}",
-        f"Median confidence: {df['confidence_score'].median():.3f}",
-        f"High confidence (>0.7): {(df['confidence_score'] > 0.7).sum():,}",
-        f"Medium confidence (0.4-0.7): {((df['confidence_score'] >= 0.4) & (df['confidence_score'] <= 0.7)).sum():,}",
-        f"Low confidence (<0.4): {(df['confidence_score'] < 0.4).sum():,}",
+        f"Mean confidence: {_score(confidence['mean'])}",
+        f"Median confidence: {_score(confidence['median'])}",
+        f"High confidence (>0.7): {confidence['high']:,}",
+        f"Medium confidence (0.4-0.7): {confidence['medium']:,}",
+        f"Low confidence (<0.4): {confidence['low']:,}",
         "",
         "── Confidence Grades ──",
     ]
-    if "confidence_grade" in df.columns:
-        grade_counts = df["confidence_grade"].value_counts()
-        for g in ("A", "B", "C", "D", "F"):
-            cnt = grade_counts.get(g, 0)
-            info = GRADE_INFO.get(g, {})
-            label = info.get("label", "")
-            lines.append(f"  {g} ({label}): {cnt:,}")
+    for g in ("A", "B", "C", "D", "F"):
+        cnt = stats["grades"].get(g, 0)
+        info = GRADE_INFO.get(g, {})
+        label = info.get("label", "")
+        lines.append(f"  {g} ({label}): {cnt:,}")
+
     lines.extend([
         "",
         "── By State (top 15) ──",
     ])
-
-    state_counts = df["state"].value_counts().head(15)
-    for state, count in state_counts.items():
+    for state, count in list(stats["states"].items())[:15]:
         lines.append(f"  {state}: {count:,}")
 
     lines.extend([
         "",
         "── By Organization Type ──",
     ])
-    type_counts = df["org_type"].value_counts().head(10)
-    for otype, count in type_counts.items():
+    for otype, count in list(stats["org_types"].items())[:10]:
         lines.append(f"  {otype}: {count:,}")
 
     lines.extend([
         "",
         "── By Revenue Range ──",
     ])
-    rev_counts = df["annual_revenue_range"].value_counts()
-    for rev_range, count in rev_counts.items():
-        if pd.notna(rev_range):
-            lines.append(f"  {rev_range}: {count:,}")
+    for rev_range, count in stats["revenue_ranges"].items():
+        lines.append(f"  {rev_range}: {count:,}")
 
     lines.extend([
         "",
         "── Data Sources ──",
     ])
-    all_sources = df["data_sources"].dropna().str.split(";").explode().str.strip()
-    source_counts = all_sources[all_sources != ""].value_counts()
-    for source, count in source_counts.items():
+    for source, count in stats["data_sources"].items():
         lines.append(f"  {source}: {count:,}")
 
     lines.extend([
@@ -0,0 +1,156 @@
+"""Pre-aggregated directory cube for the dashboard's summary charts.
+
+Stage 8 collapses the directory to one row per combination of
+state × confidence grade × org type × revenue range × VA flag, carrying
+counts and additive revenue/confidence measures. The dashboard's Overview
+and Gap Analysis tabs read totals, breakdowns and per-state summaries from
+a slice of this cube instead of re-aggregating the full row set on every
+rerun.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from config.settings import OUTPUT_DIR
+
+logger = logging.getLogger(__name__)
+
+CUBE_FILENAME = "directory_cube.csv"
+
+CUBE_DIMENSIONS = ["state", "confidence_grade", "org_type", "annual_revenue_range", "va_accredited"]
+
+# All measures are additive so any slice or roll-up is a plain sum
+CUBE_MEASURES = ["org_count", "revenue_sum", "revenue_count", "confidence_sum", "confidence_count"]
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate directory rows into the cube.
+
+    The VA dimension is collapsed to "Yes"/"No" (anything other than "Yes"
+    counts as No). Missing dimension values are kept as their own cells.
+    """
+    revenue = pd.to_numeric(df["total_revenue"], errors="coerce")
+    confidence = (
+        pd.to_numeric(df["confidence_score"], errors="coerce")
+        if "confidence_score" in df.columns else pd.Series(float("nan"), index=df.index)
+    )
+    va = df["va_accredited"] if "va_accredited" in df.columns else pd.Series(None, index=df.index)
+
+    rows = pd.DataFrame({
+        "state": df["state"],
+        "confidence_grade": df["confidence_grade"] if "confidence_grade" in df.columns else None,
+        "org_type": df["org_type"],
+        "annual_revenue_range": df["annual_revenue_range"] if "annual_revenue_range" in df.columns else None,
+        "va_accredited": (va == "Yes").map({True: "Yes", False: "No"}),
+        "org_count": 1,
+        "revenue_sum": revenue.fillna(0.0),
+        "revenue_count": revenue.notna().astype("int64"),
+        "confidence_sum": confidence.fillna(0.0),
+        "confidence_count": confidence.notna().astype("int64"),
+    }, index=df.index)
+    return _aggregate(rows)
+
+
+def _aggregate(rows: pd.DataFrame) -> pd.DataFrame:
+    cube = rows.groupby(CUBE_DIMENSIONS, dropna=False, sort=True, observed=True)[CUBE_MEASURES].sum().reset_index()
+    for col in ("org_count", "revenue_count", "confidence_count"):
+        cube[col] = cube[col].astype("int64")
+    return cube
+
+
+def remap_dimension(cube: pd.DataFrame, dim: str, mapping: dict, default=None) -> pd.DataFrame:
+    """Relabel one dimension (e.g. legacy grades → display tiers) and re-sum."""
+    cube = cube.copy()
+    cube[dim] = cube[dim].map(mapping)
+    if default is not None:
+        cube[dim] = cube[dim].fillna(default)
+    return _aggregate(cube)
+
+
+def write_cube(df: pd.DataFrame, filename: str = CUBE_FILENAME) -> pd.DataFrame:
+    """Build the cube from the final directory, write it next to the CSV and return it."""
+    cube = build_cube(df)
+    cube_path = OUTPUT_DIR / filename
+    cube.to_csv(cube_path, index=False)
+    logger.info(f"Wrote directory cube: {len(cube):,} cells for {len(df):,} records → {cube_path}")
+    return cube
+
+
+def load_cube(path: Path) -> pd.DataFrame:
+    """Read a cube file written by write_cube()."""
+    dtypes = {dim: str for dim in CUBE_DIMENSIONS}
+    dtypes.update({m: "float64" for m in CUBE_MEASURES})
+    cube = pd.read_csv(path, dtype=dtypes)
+    for col in ("org_count", "revenue_count", "confidence_count"):
+        cube[col] = cube[col].astype("int64")
+    return cube
+
+
+# ── Queries ───────────────────────────────────────────────────────────
+
+def slice_cube(
+    cube: pd.DataFrame,
+    states: list[str] | None = None,
+    grades: list[str] | None = None,
+    org_types: list[str] | None = None,
+    va: str = "Any",
+    revenue_ranges: list[str] | None = None,
+) -> pd.DataFrame:
+    """Restrict the cube to the selected dimension members."""
+    mask = pd.Series(True, index=cube.index)
+    if states:
+        mask &= cube["state"].isin(states)
+    if grades:
+        mask &= cube["confidence_grade"].isin(grades)
+    if org_types:
+        mask &= cube["org_type"].isin(org_types)
+    if va in ("Yes", "No"):
+        mask &= cube["va_accredited"] == va
+    if revenue_ranges:
+        mask &= cube["annual_revenue_range"].isin(revenue_ranges)
+    return cube[mask]
+
+
+def cube_totals(cube: pd.DataFrame) -> dict:
+    """Headline totals for a cube slice."""
+    confidence_count = int(cube["confidence_count"].sum())
+    return {
+        "org_count": int(cube["org_count"].sum()),
+        "revenue_sum": float(cube["revenue_sum"].sum()),
+        "with_financials": int(cube["revenue_count"].sum()),
+        "va_accredited": int(cube.loc[cube["va_accredited"] == "Yes", "org_count"].sum()),
+        "avg_confidence": (
+            float(cube["confidence_sum"].sum()) / confidence_count if confidence_count else float("nan")
+        ),
+    }
+
+
+def cube_counts(cube: pd.DataFrame, dim: str) -> pd.Series:
+    """Org counts per member of one dimension, largest first (like value_counts)."""
+    counts = cube.groupby(dim, observed=True)["org_count"].sum()
+    counts = counts[counts > 0]
+    return counts.sort_values(ascending=False, kind="stable")
+
+
+def cube_state_summary(cube: pd.DataFrame) -> pd.DataFrame:
+    """Per-state org counts, revenue and VA totals for the choropleths."""
+    by_state = cube.assign(
+        va_count=cube["org_count"].where(cube["va_accredited"] == "Yes", 0),
+    ).groupby("state").agg(
+        org_count=("org_count", "sum"),
+        total_revenue=("revenue_sum", "sum"),
+        revenue_count=("revenue_count", "sum"),
+        va_accredited=("va_count", "sum"),
+    )
+    by_state = by_state[by_state["org_count"] > 0]
+    by_state["avg_revenue"] = by_state["total_revenue"] / by_state["revenue_count"].where(
+        by_state["revenue_count"] > 0
+    )
+    by_state = by_state.rename(columns={"revenue_count": "with_financials"})
+    return by_state.reset_index()[
+        ["state", "org_count", "total_revenue", "avg_revenue", "va_accredited", "with_financials"]
+    ]
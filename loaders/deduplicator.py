@@ -1,186 +1,450 @@
-"""Three-tier deduplication: EIN exact → fuzzy name+city → URL domain."""
+"""Entity resolution: candidate edges from every tier → union-find → one merge.
+
+Each tier links row positions that look like the same organization:
+
+- EIN: identical EINs;
+- phone: identical normalized phone numbers;
+- address: identical ``address_key`` (transformers/address.py);
+- URL domain: identical website domains (without ``www.``);
+- fuzzy name+city: org_name token_sort_ratio ≥ threshold within one
+  state|city group.
+
+The exact-key tiers are hash joins that run first. Phone and address link
+EIN-less rows (VA VSO, NRD, VA Facilities) to the one EIN row sharing
+their key, or to each other, but never join two different EINs — orgs
+share halls and switchboards. That holds across tiers too: an EIN-less
+row with one EIN's phone and another's address would bridge the two, so
+a contact tier's edges inside any component that would end up with two
+EINs are dropped (order-independently, before they are applied). Phones, addresses and domains shared by
+more than DEDUP_SHARED_KEY_MAX_GROUP rows (national hotlines, a national
+site listed by every chapter) are ignored; through transitivity they
+would otherwise chain hundreds of chapters into one record.
+
+Exact-key tiers link every row to one anchor row per key, so they emit
+O(n) edges. The connected components of all edges are the clusters, which
+makes them transitive and independent of row order (A~B and B~C always
+land together). Each cluster is merged once: the first row's fields,
+gaps filled from later members, data_sources unioned.
+
+The fuzzy tier then only scores state|city groups whose rows are not
+already one cluster. Groups never span states, so with DEDUP_WORKERS > 1
+and enough candidates it is sharded by state across a process pool.
+Clusters do not depend on edge order, so the parallel result is identical
+to the serial one.
+
+Runs are incremental. The exact tiers are cheap and always cover every
+row, but fuzzy edges are persisted (DEDUP_STATE_PATH) as pairs of record
+ids — hashes of the fields the tiers read — together with the groups that
+were fully scored. The next run replays pairs between records it has seen
+before and scores only new or changed records against their state|city
+group, so the clusters equal a full rebuild. A missing or incompatible
+state, too many new records, or ``full=True`` (``--full-dedup``) rebuilds
+from scratch.
+
+Every merged row gets an ``org_id`` (loaders/org_ids.py). The state keeps
+each record's id and EIN, so clusters carry their id across runs (by EIN
+first, then by unchanged records), full rebuilds included.
+"""
+
+from __future__ import annotations
 
 import logging
-from urllib.parse import urlparse
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+
+from config.settings import (
+    DEDUP_INCREMENTAL,
+    DEDUP_INCREMENTAL_MAX_NEW,
+    DEDUP_PARALLEL_MIN_ROWS,
+    DEDUP_SHARED_KEY_MAX_GROUP,
+    DEDUP_STATE_PATH,
+    DEDUP_WORKERS,
+)
+from loaders.org_ids import assign_org_ids
+from transformers.normalizer import normalize_phone_series
+from utils.union_find import UnionFind
 
 logger = logging.getLogger(__name__)
 
+# Rows per rapidfuzz cdist block (bounds the score matrix for big cities)
+FUZZY_BLOCK_ROWS = 2000
 
-def deduplicate(df: pd.DataFrame) -> pd.DataFrame:
-    """Run all three dedup tiers in sequence."""
-    logger.info(f"Deduplication starting with {len(df):,} records")
-
-    df = _tier1_exact_ein(df)
-    logger.info(f"After EIN dedup: {len(df):,} records")
-
-    df = _tier2_fuzzy_name_city(df)
-    logger.info(f"After fuzzy name+city dedup: {len(df):,} records")
-
-    df = _tier3_url_domain(df)
-    logger.info(f"After URL domain dedup: {len(df):,} records")
-
-    return df.reset_index(drop=True)
-
-
-def _merge_rows(group: pd.DataFrame) -> pd.Series:
-    """Merge a group of duplicate rows, keeping the most complete fields."""
-    if len(group) == 1:
-        return group.iloc[0]
+# Fields any tier reads; a record id changes when one of them does
+MATCH_COLUMNS = ["ein", "org_name", "city", "state", "phone", "website", "address_key"]
+STATE_VERSION = 2
 
-    result = group.iloc[0].copy()
-    for col in group.columns:
-        if pd.isna(result[col]):
-            # Find first non-null value
-            non_null = group[col].dropna()
-            if len(non_null) > 0:
-                result[col] = non_null.iloc[0]
 
-    # Merge data_sources
-    sources = set()
-    for val in group["data_sources"].dropna():
-        sources.update(val.split(";"))
-    sources.discard("")
-    result["data_sources"] = ";".join(sorted(sources))
-
-    return result
-
-
-def _tier1_exact_ein(df: pd.DataFrame) -> pd.DataFrame:
-    """Tier 1: Merge records with identical EINs."""
-    has_ein = df["ein"].notna() & (df["ein"] != "")
-    with_ein = df[has_ein]
-    without_ein = df[~has_ein]
-
-    if with_ein.empty:
-        return df
+def deduplicate(
+    df: pd.DataFrame,
+    threshold: float = 85.0,
+    workers: int = DEDUP_WORKERS,
+    state_path: Path | None = DEDUP_STATE_PATH,
+    full: bool = not DEDUP_INCREMENTAL,
+) -> pd.DataFrame:
+    """Cluster records over all tiers and merge each cluster into one row.
 
-    dupes = with_ein.duplicated(subset=["ein"], keep=False)
-    unique = with_ein[~dupes]
-    duplicated = with_ein[dupes]
-
-    if duplicated.empty:
+    With state_path, fuzzy-tier work from the previous run is reused unless
+    full is set, org_ids are inherited from it, and the state for the next
+    run is written back.
+    """
+    logger.info(f"Deduplication starting with {len(df):,} records")
+    df = df.reset_index(drop=True)
+    if df.empty:
         return df
 
-    logger.info(f"Tier 1: Merging {len(duplicated):,} records with duplicate EINs")
-    merged = duplicated.groupby("ein", group_keys=False).apply(_merge_rows)
-    merged = merged.reset_index(drop=True) if isinstance(merged, pd.DataFrame) else merged.to_frame().T
+    rids = record_ids(df)
+    state = load_dedup_state(state_path) if state_path is not None else None
+    reuse = state is not None and not full
+    if reuse and state["threshold"] != threshold:
+        logger.info("Dedup state is from another threshold; rebuilding fuzzy matches from scratch")
+        reuse = False
+    new = None
+    if reuse:
+        new = ~np.isin(rids, state["rids"])
+        gone = len(state["rids"]) - int((~new).sum())
+        if not pd.Index(rids).is_unique or new.mean() > DEDUP_INCREMENTAL_MAX_NEW:
+            logger.info(f"{new.sum():,} of {len(df):,} records are new; rebuilding from scratch")
+            reuse, new = False, None
+        else:
+            logger.info(f"Incremental dedup: {new.sum():,} new or changed records, {gone:,} gone since last run")
+
+    uf = UnionFind(len(df))
+    ein = _ein_key(df)
+    tiers = [
+        ("EIN", lambda: _key_edges(ein)),
+        ("phone", lambda: _without_ein_conflicts(uf, _contact_edges(_phone_key(df), ein), ein)),
+        ("address", lambda: _without_ein_conflicts(uf, _contact_edges(_address_key(df), ein), ein)),
+        ("URL domain", lambda: _key_edges(_domain_key(df), max_group=DEDUP_SHARED_KEY_MAX_GROUP)),
+    ]
+    replayed = np.empty((0, 2), dtype=np.int64)
+    if reuse:
+        replayed = _replay_edges(state["edges"], rids)
+        tiers.append(("replayed fuzzy", lambda: replayed))
+    for name, edges in tiers:
+        edges = edges()
+        joined = uf.union_edges(edges)
+        logger.info(f"{name}: {len(edges):,} candidate edges, {joined:,} new links")
+
+    scored = state["scored_groups"] if reuse else None
+    pairs, scored = _fuzzy_edges(df, threshold, workers, uf, new=new, scored=scored)
+    joined = uf.union_edges(pairs)
+    logger.info(f"fuzzy name+city: {len(pairs):,} candidate edges, {joined:,} new links")
+
+    labels = uf.labels()
+    eins = ein.to_numpy()
+    if state is not None:
+        org_ids = assign_org_ids(rids, labels, eins, state["rids"], state["org_ids"], state.get("eins"))
+    else:
+        org_ids = assign_org_ids(rids, labels, eins)
+    if state_path is not None:
+        fuzzy = np.concatenate([replayed, np.asarray(pairs, dtype=np.int64).reshape(-1, 2)])
+        next_state = {
+            "version": STATE_VERSION,
+            "threshold": threshold,
+            "rids": rids,
+            "edges": rids[fuzzy],
+            "scored_groups": scored,
+            "clusters": rids[labels],
+            "org_ids": org_ids,
+            "eins": eins,
+        }
+        if state is not None:
+            logger.info(f"{_changed_clusters(state, next_state):,} clusters new or changed since last run")
+        save_dedup_state(next_state, state_path)
+
+    df["org_id"] = pd.array(org_ids, dtype="string")
+    result = merge_clusters(df, labels)
+    logger.info(f"After dedup: {len(result):,} records")
+    return result
 
-    return pd.concat([unique, merged, without_ein], ignore_index=True)
 
+# ── Incremental state ─────────────────────────────────────────────────
 
-def _tier2_fuzzy_name_city(df: pd.DataFrame, threshold: float = 85.0) -> pd.DataFrame:
-    """Tier 2: Fuzzy match on org_name within same city+state."""
-    has_location = df["city"].notna() & df["state"].notna() & df["org_name"].notna()
-    candidates = df[has_location].copy()
-    no_location = df[~has_location]
+def record_ids(df: pd.DataFrame) -> np.ndarray:
+    """64-bit id per row from its match fields (repeats numbered apart)."""
+    cols = [c for c in MATCH_COLUMNS if c in df.columns]
+    fingerprint = pd.util.hash_pandas_object(df[cols].astype("string"), index=False).to_numpy()
+    repeat = pd.Series(fingerprint).groupby(fingerprint).cumcount().to_numpy()
+    ids = pd.DataFrame({"fingerprint": fingerprint, "repeat": repeat})
+    return pd.util.hash_pandas_object(ids, index=False).to_numpy()
 
-    if candidates.empty or len(candidates) < 2:
-        return df
 
-    # Group by state+city, then fuzzy match within groups
-    candidates["_group_key"] = (
-        candidates["state"].str.upper() + "|" + candidates["city"].str.upper()
-    )
+def load_dedup_state(path: Path) -> dict | None:
+    """The previous run's state, or None if missing, unreadable or from another version."""
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Could not read dedup state {path}: {e}")
+        return None
+    if state.get("version") != STATE_VERSION:
+        logger.info("Dedup state is from another version; rebuilding from scratch")
+        return None
+    return state
 
-    merge_map = {}  # index → group_id
-    group_counter = 0
 
-    for group_key, group in candidates.groupby("_group_key"):
+def save_dedup_state(state: dict, path: Path) -> None:
+    """Write the state atomically (temp file + rename)."""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _replay_edges(edges: np.ndarray, rids: np.ndarray) -> np.ndarray:
+    """Stored record-id pairs as current positions, dropping gone records."""
+    positions = pd.Index(rids).get_indexer(edges.ravel()).reshape(-1, 2)
+    return positions[(positions >= 0).all(axis=1)]
+
+
+def _changed_clusters(before: dict, after: dict) -> int:
+    """Clusters in after whose member set did not exist in before."""
+    def member_sets(state):
+        members = pd.Series(state["rids"], index=state["clusters"])
+        members = members[members.index.duplicated(keep=False)]
+        return set(members.groupby(level=0).agg(frozenset))
+
+    return len(member_sets(after) - member_sets(before))
+
+
+# ── Keys ──────────────────────────────────────────────────────────────
+
+def _text_key(series: pd.Series) -> pd.Series:
+    key = series.astype("string").str.strip()
+    return key.where(key != "")
+
+
+def _ein_key(df: pd.DataFrame) -> pd.Series:
+    return _text_key(df["ein"])
+
+
+def _phone_key(df: pd.DataFrame) -> pd.Series:
+    if "phone" not in df.columns:
+        return pd.Series(pd.NA, index=df.index, dtype="string")
+    return _text_key(normalize_phone_series(df["phone"]))
+
+
+def _address_key(df: pd.DataFrame) -> pd.Series:
+    if "address_key" not in df.columns:
+        return pd.Series(pd.NA, index=df.index, dtype="string")
+    return _text_key(df["address_key"])
+
+
+def _domain_key(df: pd.DataFrame) -> pd.Series:
+    """Website host, lowercased, without ``www.`` (scheme-less URLs included)."""
+    url = df["website"].astype("string").str.strip().str.lower()
+    host = url.str.replace(r"^[a-z][a-z0-9+.\-]*://", "", regex=True).str.extract(r"^([^/?#\s]+)", expand=False)
+    return _text_key(host.str.removeprefix("www."))
+
+
+# ── Edges ─────────────────────────────────────────────────────────────
+
+def _key_edges(key: pd.Series, max_group: int | None = None) -> np.ndarray:
+    """(position, first position with the same key) for rows sharing a key."""
+    key = key.reset_index(drop=True).dropna()
+    if key.empty:
+        return np.empty((0, 2), dtype=np.int64)
+    positions = pd.Series(key.index, index=key.index)
+    grouped = positions.groupby(key.to_numpy())
+    first = grouped.transform("min")
+    linked = positions != first
+    if max_group:
+        linked &= grouped.transform("size") <= max_group
+    return np.column_stack([positions[linked].to_numpy(), first[linked].to_numpy()])
+
+
+def _contact_edges(
+    key: pd.Series, ein: pd.Series, max_group: int = DEDUP_SHARED_KEY_MAX_GROUP
+) -> np.ndarray:
+    """Edges for rows sharing a phone / address key, never across two EINs.
+
+    Each row links to its key's anchor: the first EIN row, or the first
+    row when none has an EIN. Keys held by two or more distinct EINs, or
+    by more than max_group rows, are skipped.
+    """
+    frame = pd.DataFrame({"key": key.to_numpy(), "ein": ein.to_numpy()}).dropna(subset=["key"])
+    if frame.empty:
+        return np.empty((0, 2), dtype=np.int64)
+    grouped = frame.groupby("key")
+    keep = (grouped["key"].transform("size") <= max_group) & (grouped["ein"].transform("nunique") <= 1)
+    frame = frame[keep]
+
+    frame["pos"] = frame.index
+    frame["no_ein"] = frame["ein"].isna()
+    anchors = frame.sort_values(["no_ein", "pos"]).groupby("key")["pos"].first()
+    anchor = frame["key"].map(anchors)
+    linked = frame["pos"] != anchor
+    attached = int((linked & frame["no_ein"] & ~anchor.map(frame["no_ein"])).sum())
+    if attached:
+        logger.info(f"  {attached:,} EIN-less rows attached to EIN records")
+    return np.column_stack([frame["pos"][linked].to_numpy(), anchor[linked].to_numpy()])
+
+
+def _without_ein_conflicts(uf: UnionFind, edges: np.ndarray, ein: pd.Series) -> np.ndarray:
+    """Drop a contact tier's edges inside components they would give two EINs.
+
+    The tier is applied to a copy of uf first; every edge landing in a
+    component with more than one distinct EIN is discarded, so which edges
+    survive does not depend on edge order.
+    """
+    if not len(edges):
+        return edges
+    trial = uf.copy()
+    trial.union_edges(edges)
+    roots = trial.roots()
+    eins_per_root = pd.Series(ein.to_numpy()).groupby(roots).nunique()
+    conflicted = eins_per_root.index[eins_per_root > 1].to_numpy()
+    keep = ~np.isin(roots[edges[:, 0]], conflicted)
+    if not keep.all():
+        logger.info(f"  {int((~keep).sum()):,} edges dropped: they would join two different EINs")
+    return edges[keep]
+
+
+def _fuzzy_pairs(rows: list[tuple], threshold: float) -> list[tuple[int, int]]:
+    """Pairs of positions whose names match within the same group key.
+
+    rows are (position, group_key, org_name, new). Every pair in a group is
+    scored (vectorized with rapidfuzz.process.cdist), so matches do not
+    depend on the order rows are visited in. In groups whose rows carry a
+    True/False ``new`` flag, only pairs involving a new row are scored; the
+    rest are known from the previous run. ``None`` scores the whole group.
+    """
+    groups: dict[str, list[tuple]] = {}
+    for pos, key, name, new in rows:
+        groups.setdefault(key, []).append((pos, name, new))
+
+    pairs = []
+    for group in groups.values():
         if len(group) < 2:
             continue
-
-        indices = group.index.tolist()
-        names = group["org_name"].tolist()
-
-        matched = set()
-        for i in range(len(indices)):
-            if indices[i] in matched:
-                continue
-            cluster = [indices[i]]
-            for j in range(i + 1, len(indices)):
-                if indices[j] in matched:
-                    continue
-                score = fuzz.token_sort_ratio(names[i], names[j])
-                if score >= threshold:
-                    cluster.append(indices[j])
-                    matched.add(indices[j])
-
-            if len(cluster) > 1:
-                for idx in cluster:
-                    merge_map[idx] = group_counter
-                group_counter += 1
-
-    if not merge_map:
-        candidates.drop(columns=["_group_key"], inplace=True)
-        return pd.concat([candidates, no_location], ignore_index=True)
-
-    logger.info(f"Tier 2: Found {len(merge_map):,} records in {group_counter} fuzzy groups")
-
-    # Separate merged and unmerged
-    to_merge_idx = set(merge_map.keys())
-    unmerged = candidates[~candidates.index.isin(to_merge_idx)]
-    to_merge = candidates[candidates.index.isin(to_merge_idx)].copy()
-    to_merge["_merge_group"] = to_merge.index.map(merge_map)
-
-    merged = (
-        to_merge.drop(columns=["_group_key"])
-        .groupby("_merge_group", group_keys=False)
-        .apply(_merge_rows)
+        positions = np.array([pos for pos, _, _ in group])
+        names = [name for _, name, _ in group]
+        is_query = np.array([new is None or new for _, _, new in group])
+        queries = np.flatnonzero(is_query)
+        for start in range(0, len(queries), FUZZY_BLOCK_ROWS):
+            block = queries[start:start + FUZZY_BLOCK_ROWS]
+            scores = process.cdist(
+                [names[k] for k in block], names,
+                scorer=fuzz.token_sort_ratio, score_cutoff=threshold, dtype=np.float32,
+            )
+            i, j = np.nonzero(scores >= threshold)
+            i = block[i]
+            # Each pair once: query pairs in one direction, query × known always
+            keep = (j > i) | ~is_query[j]
+            pairs.extend(zip(positions[i[keep]].tolist(), positions[j[keep]].tolist()))
+    return pairs
+
+
+def _fuzzy_pairs_shard(args: tuple) -> list[tuple[int, int]]:
+    rows, threshold = args
+    return _fuzzy_pairs(rows, threshold)
+
+
+def _fuzzy_edges(
+    df: pd.DataFrame,
+    threshold: float,
+    workers: int,
+    uf: UnionFind | None = None,
+    new: np.ndarray | None = None,
+    scored: set[str] | None = None,
+) -> tuple[list[tuple[int, int]], set[str]]:
+    """Fuzzy name pairs within state|city, serially or sharded by state.
+
+    With uf, groups whose rows the earlier tiers already put in one cluster
+    are skipped. With new (a per-position flag) and scored (groups whose
+    pairs were all scored last run), those groups only score new rows.
+    Returns the pairs and the groups whose pairs are now all known.
+
+    Group keys start with the state, so no group spans two shards. Workers
+    only receive (position, group key, name, new) tuples.
+    """
+    has_location = df["city"].notna() & df["state"].notna() & df["org_name"].notna()
+    candidates = df[has_location]
+    states = candidates["state"].str.upper()
+    group_keys = states + "|" + candidates["city"].str.upper()
+
+    if new is not None and scored:
+        group_new = pd.Series(new[candidates.index], index=candidates.index).groupby(group_keys).transform("any")
+        incremental = group_keys.isin(scored).to_numpy()
+        flags = np.where(incremental, new[candidates.index], None)
+    else:
+        group_new = pd.Series(True, index=candidates.index)
+        incremental = np.zeros(len(candidates), dtype=bool)
+        flags = np.full(len(candidates), None)
+    # Scored groups without new rows stay known even when they are skipped
+    known = set(group_keys[incremental & ~group_new.to_numpy()])
+
+    work = ~(incremental & ~group_new.to_numpy())
+    if uf is not None and len(candidates):
+        roots = pd.Series([uf.find(pos) for pos in candidates.index], index=candidates.index)
+        work &= (roots.groupby(group_keys).transform("nunique") > 1).to_numpy()
+    candidates, states, group_keys, flags = candidates[work], states[work], group_keys[work], flags[work]
+    logger.info(
+        f"Fuzzy tier: {len(candidates):,} candidates in {group_keys.nunique():,} groups to score"
+        + (f", {int(np.sum(flags == True)):,} of them new" if new is not None else "")  # noqa: E712
     )
-    if isinstance(merged, pd.Series):
-        merged = merged.to_frame().T
-    merged = merged.reset_index(drop=True)
-    if "_merge_group" in merged.columns:
-        merged.drop(columns=["_merge_group"], inplace=True)
-
-    unmerged.drop(columns=["_group_key"], inplace=True)
-
-    return pd.concat([unmerged, merged, no_location], ignore_index=True)
+    known |= set(group_keys)
+    if len(candidates) < 2:
+        return [], known
+
+    rows = list(zip(candidates.index, group_keys, candidates["org_name"], flags))
+
+    if workers <= 1 or len(rows) < DEDUP_PARALLEL_MIN_ROWS or states.nunique() < 2:
+        return _fuzzy_pairs(rows, threshold), known
+
+    shards: dict[str, list[tuple]] = {}
+    for row, state in zip(rows, states):
+        shards.setdefault(state, []).append(row)
+    # Largest states first so the pool is not left waiting on CA at the end
+    tasks = sorted(shards.values(), key=len, reverse=True)
+
+    workers = min(workers, len(tasks))
+    logger.info(f"Fuzzy tier: {len(rows):,} candidates in {len(tasks)} state shards on {workers} workers")
+    pairs = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_fuzzy_pairs_shard, [(shard, threshold) for shard in tasks]):
+            pairs.extend(result)
+    return pairs, known
+
+
+# ── Merge ─────────────────────────────────────────────────────────────
+
+def merge_clusters(df: pd.DataFrame, labels: np.ndarray) -> pd.DataFrame:
+    """Collapse rows sharing a label into one, keeping the most complete fields.
+
+    The merged row takes each column from the first member (in row order)
+    where it is not null and unions data_sources. Rows keep the position of
+    their cluster's first member.
+    """
+    df = df.reset_index(drop=True)
+    labels = np.asarray(labels)
+    in_cluster = pd.Series(labels).duplicated(keep=False).to_numpy()
+    if not in_cluster.any():
+        return df
 
+    singles = df[~in_cluster]
+    members = df[in_cluster]
+    member_labels = labels[in_cluster]
+    logger.info(f"Merging {len(members):,} records into {len(np.unique(member_labels)):,} clusters")
 
-def _tier3_url_domain(df: pd.DataFrame) -> pd.DataFrame:
-    """Tier 3: Merge records with the same root URL domain."""
-    has_url = df["website"].notna() & (df["website"] != "")
-    with_url = df[has_url].copy()
-    without_url = df[~has_url]
+    merged = members.groupby(member_labels, sort=True).first()
 
-    if with_url.empty or len(with_url) < 2:
-        return df
+    sources = pd.DataFrame({
+        "label": member_labels,
+        "source": members["data_sources"].to_numpy(),
+    }).dropna()
+    sources["source"] = sources["source"].astype(str).str.split(";")
+    sources = sources.explode("source")
+    sources = sources[sources["source"] != ""].drop_duplicates().sort_values(["label", "source"])
+    joined = sources.groupby("label")["source"].agg(";".join)
+    merged["data_sources"] = joined.reindex(merged.index).fillna("").to_numpy()
 
-    # Extract root domain
-    def get_domain(url):
-        try:
-            parsed = urlparse(str(url))
-            domain = parsed.netloc.lower()
-            # Remove www.
-            if domain.startswith("www."):
-                domain = domain[4:]
-            return domain
-        except Exception:
-            return ""
-
-    with_url["_domain"] = with_url["website"].apply(get_domain)
-    with_url = with_url[with_url["_domain"] != ""]
-
-    dupes = with_url.duplicated(subset=["_domain"], keep=False)
-    unique = with_url[~dupes]
-    duplicated = with_url[dupes]
-
-    if duplicated.empty:
-        with_url.drop(columns=["_domain"], inplace=True)
-        return pd.concat([with_url, without_url], ignore_index=True)
-
-    logger.info(f"Tier 3: Merging {len(duplicated):,} records with duplicate domains")
-    merged = duplicated.groupby("_domain", group_keys=False).apply(_merge_rows)
-    if isinstance(merged, pd.Series):
-        merged = merged.to_frame().T
-    merged = merged.reset_index(drop=True)
-
-    for part in (unique, merged):
-        if "_domain" in part.columns:
-            part.drop(columns=["_domain"], inplace=True, errors="ignore")
-
-    return pd.concat([unique, merged, without_url], ignore_index=True)
+    return pd.concat([singles, merged[df.columns]]).sort_index(kind="stable").reset_index(drop=True)
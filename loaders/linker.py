@@ -0,0 +1,171 @@
+"""Record linkage of EIN-less sources onto IRS records.
+
+VA VSO, NRD and VA Facilities rows carry no EIN, so merge_all used to
+append them as separate rows even when they describe an org already in
+the IRS base. link_to_base() finds each source row's IRS counterpart:
+
+1. a source row whose EIN is in the base links to it directly;
+2. otherwise candidates come from blocks keyed by state + name token
+   (``KY|4076``, ``KY|CORBIN``). Stop words never block, and blocks with
+   more than LINK_MAX_BLOCK base rows are too generic to be used;
+3. candidate pairs in different cities (when both are known) or with
+   different numbers in their names (Post 222 vs Post 2222 scores 97) are
+   dropped, the rest are scored in one vectorized rapidfuzz cpdist call,
+   and the best pair at or above LINK_THRESHOLD wins (ties → first base
+   row).
+
+fold_into_base() then fills blank base fields from the linked rows and adds
+the source to data_sources; merge_all appends only the unlinked rows.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz
+from rapidfuzz.process import cpdist
+
+from config.settings import LINK_MAX_BLOCK, LINK_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Tokens too common to identify an org on their own
+STOP_TOKENS = {
+    "THE", "OF", "AND", "FOR", "IN", "AT", "NO", "INC", "INCORPORATED", "CORP",
+    "CORPORATION", "CO", "LLC", "LTD", "FOUNDATION", "ASSOCIATION", "ASSN",
+    "ASSOC", "CLUB", "SOCIETY", "ORGANIZATION", "ORG", "CHAPTER", "CHAPT",
+    "POST", "DEPARTMENT", "DEPT", "UNIT", "AUXILIARY", "AUX", "USA", "US",
+}
+
+
+def clean_names(names: pd.Series) -> pd.Series:
+    """Uppercase names with punctuation removed and leading zeros dropped."""
+    cleaned = names.astype("string").str.upper().str.replace(r"[^A-Z0-9]+", " ", regex=True)
+    cleaned = cleaned.str.replace(r"\b0+(\d)", r"\1", regex=True)
+    return cleaned.str.strip()
+
+
+def _block_keys(names: pd.Series, states: pd.Series) -> pd.DataFrame:
+    """(pos, key) rows, one per distinct state|token of each name."""
+    tokens = names.str.split().explode().dropna()
+    tokens = tokens[~tokens.isin(STOP_TOKENS) & (tokens.str.len() > 1)]
+    keys = states.reindex(tokens.index) + "|" + tokens
+    blocks = pd.DataFrame({"pos": tokens.index, "key": keys.to_numpy()}).dropna()
+    return blocks.drop_duplicates()
+
+
+def _numbers(names: pd.Series) -> pd.Series:
+    """Sorted distinct digit tokens of each cleaned name ("" when none)."""
+    digits = names.str.findall(r"\b\d+\b")
+    return digits.map(lambda found: " ".join(sorted(set(found))) if isinstance(found, list) else "")
+
+
+def _upper(series: pd.Series) -> pd.Series:
+    text = series.astype("string").str.strip().str.upper()
+    return text.where(text != "")
+
+
+def link_to_base(
+    base: pd.DataFrame,
+    source: pd.DataFrame,
+    threshold: float = LINK_THRESHOLD,
+    max_block: int = LINK_MAX_BLOCK,
+) -> pd.Series:
+    """Base index label of each source row's IRS counterpart (NA if none)."""
+    links = pd.Series(pd.NA, index=source.index, dtype="Int64")
+    if base.empty or source.empty:
+        return links
+
+    base_ein = _upper(base["ein"])
+    targets = base[base_ein.notna()]
+    if targets.empty:
+        return links
+
+    # 1. Source rows that already carry a base EIN
+    if "ein" in source.columns:
+        by_ein = pd.Series(targets.index, index=base_ein[targets.index].to_numpy())
+        by_ein = by_ein[~by_ein.index.duplicated()]
+        src_ein = _upper(source["ein"])
+        links[:] = src_ein.map(by_ein).astype("Int64")
+
+    # 2. Blocked candidates for the rest
+    pending = source[links.isna() & source["org_name"].notna() & source["state"].notna()]
+    if pending.empty:
+        return links
+
+    base_names = clean_names(targets["org_name"])
+    base_states = _upper(targets["state"])
+    src_names = clean_names(pending["org_name"])
+    src_states = _upper(pending["state"])
+
+    base_blocks = _block_keys(base_names, base_states)
+    sizes = base_blocks["key"].map(base_blocks["key"].value_counts())
+    base_blocks = base_blocks[sizes <= max_block]
+    pairs = _block_keys(src_names, src_states).merge(base_blocks, on="key", suffixes=("_src", "_base"))
+    pairs = pairs[["pos_src", "pos_base"]].drop_duplicates()
+
+    # 3. Same city (when both known) and same numbers, then score
+    src_city = _upper(pending["city"]).reindex(pairs["pos_src"]).reset_index(drop=True)
+    base_city = _upper(targets["city"]).reindex(pairs["pos_base"]).reset_index(drop=True)
+    city_ok = (src_city.isna() | base_city.isna() | (src_city == base_city)).fillna(False)
+    src_numbers = _numbers(src_names).reindex(pairs["pos_src"]).to_numpy()
+    base_numbers = _numbers(base_names).reindex(pairs["pos_base"]).to_numpy()
+    pairs = pairs[city_ok.to_numpy(dtype=bool) & (src_numbers == base_numbers)]
+    if pairs.empty:
+        return links
+
+    scores = cpdist(
+        src_names.reindex(pairs["pos_src"]).fillna("").tolist(),
+        base_names.reindex(pairs["pos_base"]).fillna("").tolist(),
+        scorer=fuzz.token_sort_ratio, score_cutoff=threshold, dtype=np.float32, workers=-1,
+    )
+    pairs = pairs.assign(score=scores)
+    pairs = pairs[pairs["score"] >= threshold]
+    best = (
+        pairs.sort_values(["pos_src", "score", "pos_base"], ascending=[True, False, True])
+        .drop_duplicates("pos_src")
+    )
+    links.loc[best["pos_src"].to_numpy()] = best["pos_base"].to_numpy()
+    logger.info(
+        f"Linker: {len(pending):,} rows without an EIN match, "
+        f"{len(pairs):,} scored pairs ≥ {threshold:g}, {len(best):,} linked by name"
+    )
+    return links
+
+
+def fold_into_base(
+    base: pd.DataFrame, source: pd.DataFrame, links: pd.Series, source_name: str
+) -> pd.DataFrame:
+    """Fill blank base fields from linked source rows; add source_name to data_sources.
+
+    When several source rows link to one base row, the first non-null
+    value (in source order) wins, as in dedup merges.
+    """
+    linked = source[links.notna()].assign(_target=links[links.notna()].to_numpy())
+    if linked.empty:
+        return base
+
+    values = linked.groupby("_target", sort=False).first()
+    for col in values.columns:
+        if col in ("data_sources", "ein") or col not in base.columns:
+            continue
+        incoming = values[col].dropna()
+        if incoming.empty:
+            continue
+        current = base.loc[incoming.index, col]
+        blank = current.isna()
+        if pd.api.types.is_string_dtype(current.dtype) or current.dtype == object:
+            blank |= current.astype("string").fillna("") == ""
+        fill = incoming[blank.to_numpy()]
+        if not fill.empty:
+            base.loc[fill.index, col] = fill.to_numpy()
+
+    targets = values.index
+    sources = base.loc[targets, "data_sources"].astype("string").fillna("")
+    base.loc[targets, "data_sources"] = [
+        ";".join(sorted(set(filter(None, existing.split(";"))) | {source_name}))
+        for existing in sources
+    ]
+    return base
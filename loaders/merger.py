@@ -1,7 +1,9 @@
 """Multi-source merge with priority rules.
 
 IRS BMF is the base; other sources fill in blanks without overwriting
-higher-priority data.
+higher-priority data. EIN sources join on EIN; EIN-less sources are first
+linked to IRS records by name (loaders/linker.py) and only their unmatched
+rows are appended.
 """
 
 from __future__ import annotations
@@ -11,6 +13,7 @@ import logging
 import pandas as pd
 
 from config.schema import COLUMN_NAMES, coerce_schema
+from loaders.linker import fold_into_base, link_to_base
 
 logger = logging.getLogger(__name__)
 
@@ -54,16 +57,22 @@ def merge_all(
         result = _smart_merge_on_ein(result, src_df, name)
         logger.info(f"After {name} merge: {len(result):,} records")
 
-    # Outer-merge non-EIN sources
+    # Link non-EIN sources to IRS records, append what doesn't link
     for name, src_df in non_ein_sources.items():
         if src_df.empty:
             logger.info(f"Skipping empty source: {name}")
             continue
 
         src_df = coerce_schema(src_df.copy())
-        logger.info(f"Appending {name}: {len(src_df):,} records")
-
-        result = pd.concat([result, src_df], ignore_index=True)
+        links = link_to_base(result, src_df)
+        result = fold_into_base(result, src_df, links, name)
+        unlinked = src_df[links.isna()]
+        logger.info(
+            f"Linking {name}: {len(src_df) - len(unlinked):,} of {len(src_df):,} records "
+            f"folded into EIN records, appending {len(unlinked):,}"
+        )
+
+        result = pd.concat([result, unlinked], ignore_index=True)
         logger.info(f"After {name} append: {len(result):,} records")
 
     return result
@@ -0,0 +1,125 @@
+"""Stable organization ids for deduplicated clusters.
+
+Row positions change whenever an upstream source reorders or adds rows, so
+they cannot key anything that outlives a run (enrichment checkpoints,
+overlays, dashboard links). Each dedup cluster instead gets an ``org_id``:
+
+1. clusters holding an EIN inherit the id that EIN's cluster had in the
+   previous run (dedup state), whatever else about the org changed —
+   phone, address, name;
+2. remaining clusters inherit by record overlap: the id carried last run
+   by their EIN-less records whose match fields are unchanged;
+3. clusters with no inherited id get a fresh one hashed from their
+   smallest EIN (or, without one, their smallest record id), so a rebuild
+   of the same data mints the same ids.
+
+In steps 1 and 2, when a cluster's records held several ids (clusters
+merged), the id held by most of them wins; when several clusters claim one
+id (a cluster split), the cluster holding most of its records keeps it.
+Ties go to the smaller id / smaller anchor, never row order.
+
+Ids are 16 hex characters and never reused for two clusters in one run.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def assign_org_ids(
+    rids: np.ndarray,
+    labels: np.ndarray,
+    eins: np.ndarray,
+    prev_rids: np.ndarray | None = None,
+    prev_ids: np.ndarray | None = None,
+    prev_eins: np.ndarray | None = None,
+) -> np.ndarray:
+    """org_id per row, given record ids, cluster labels, EINs and the previous run's ids."""
+    frame = pd.DataFrame({
+        "cluster": np.asarray(labels),
+        "rid": np.asarray(rids, dtype=np.uint64),
+        "ein": pd.array(eins, dtype="string"),
+    })
+    anchors = _anchors(frame)
+    ids = pd.Series(pd.NA, index=anchors.index, dtype=object)
+    inherited: dict[int, str] = {}
+    taken: set[str] = set()
+
+    if prev_rids is not None and len(prev_rids):
+        prev_ids = np.asarray(prev_ids, dtype=object)
+        matched = pd.Series(False, index=frame.index)
+
+        # 1. By EIN
+        if prev_eins is not None:
+            prev_eins = pd.array(prev_eins, dtype="string")
+            has_ein = ~pd.isna(prev_eins)
+            by_ein = pd.Series(prev_ids[has_ein], index=np.asarray(prev_eins[has_ein], dtype=object))
+            by_ein = by_ein[~by_ein.index.duplicated()]
+            frame["prev"] = frame["ein"].map(by_ein)
+            matched = frame["prev"].notna()
+            _claim(_votes(frame[matched], anchors), inherited, taken)
+        by_ein_count = len(inherited)
+
+        # 2. By unchanged EIN-less records
+        by_rid = pd.Series(prev_ids, index=np.asarray(prev_rids, dtype=np.uint64))
+        by_rid = by_rid[~by_rid.index.duplicated()]
+        frame["prev"] = by_rid.reindex(frame["rid"].to_numpy()).to_numpy()
+        rest = frame[~matched & frame["ein"].isna() & frame["prev"].notna()]
+        _claim(_votes(rest, anchors), inherited, taken)
+
+        ids.loc[list(inherited)] = list(inherited.values())
+        logger.info(
+            f"Org ids: {len(inherited):,} of {len(ids):,} clusters kept their id from the last run "
+            f"({by_ein_count:,} by EIN, {len(inherited) - by_ein_count:,} by record)"
+        )
+
+    fresh = ids.index[ids.isna().to_numpy()]
+    salt = 0
+    while len(fresh):
+        minted = _mint(anchors[fresh].to_numpy(), salt)
+        # A fresh id may collide with an inherited one (or, rarely, another fresh one)
+        clash = pd.Series(minted).duplicated(keep=False).to_numpy() | np.isin(minted, list(taken))
+        ids.loc[fresh[~clash]] = minted[~clash]
+        taken.update(minted[~clash].tolist())
+        fresh = fresh[clash]
+        salt += 1
+
+    return ids.reindex(frame["cluster"].to_numpy()).to_numpy()
+
+
+def _anchors(frame: pd.DataFrame) -> pd.Series:
+    """Per cluster, its smallest EIN or (without one) its smallest record id."""
+    by_rid = "R" + frame.groupby("cluster")["rid"].min().astype(str)
+    # sort + first occurrence: groupby().min() on strings is a Python loop
+    with_ein = frame.dropna(subset=["ein"]).sort_values("ein").drop_duplicates("cluster")
+    by_ein = "E" + with_ein.set_index("cluster")["ein"]
+    return by_ein.reindex(by_rid.index).fillna(by_rid).astype(str)
+
+
+def _votes(rows: pd.DataFrame, anchors: pd.Series) -> pd.DataFrame:
+    """(cluster, prev) candidates, strongest claims first."""
+    votes = rows.groupby(["cluster", "prev"]).size().rename("votes").reset_index()
+    votes["anchor"] = votes["cluster"].map(anchors)
+    return votes.sort_values(["votes", "prev", "anchor"], ascending=[False, True, True])
+
+
+def _claim(votes: pd.DataFrame, inherited: dict[int, str], taken: set[str]) -> None:
+    """Give each cluster at most one previous id and each id at most one cluster."""
+    for cluster, prev in zip(votes["cluster"].tolist(), votes["prev"].tolist()):
+        if prev in taken or cluster in inherited:
+            continue
+        inherited[cluster] = prev
+        taken.add(prev)
+
+
+def _mint(anchors: np.ndarray, salt: int) -> np.ndarray:
+    hashed = pd.util.hash_pandas_object(
+        pd.DataFrame({"anchor": anchors, "salt": np.full(len(anchors), salt, dtype=np.uint64)}),
+        index=False,
+    ).to_numpy()
+    return np.array([f"{h:016x}" for h in hashed.tolist()], dtype=object)
@@ -0,0 +1,115 @@
+"""One-pass directory statistics for reports.
+
+collect_stats() gathers everything the Stage 8 summary report and the
+Active Heroes dashboard print: field coverage (overall and per state),
+EIN counts, confidence distribution, and org counts by grade, state, type,
+revenue range and data source. Dimension counts come from the directory
+cube, coverage from a single notna() over the coverage columns, and source
+counts from splitting each distinct data_sources value once.
+
+The result is plain JSON-serializable data; write_stats() saves it next
+to the CSV for machine consumers.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config.settings import OUTPUT_DIR
+from loaders.cube import build_cube, cube_counts, cube_totals
+
+logger = logging.getLogger(__name__)
+
+STATS_FILENAME = "directory_stats.json"
+
+COVERAGE_COLUMNS = [
+    "phone", "email", "website", "mission_statement",
+    "total_revenue", "charity_navigator_rating",
+]
+
+
+def collect_stats(df: pd.DataFrame, cube: pd.DataFrame | None = None) -> dict:
+    """Compute every report statistic for a final directory frame.
+
+    Pass the already-built directory cube to avoid aggregating twice.
+    """
+    if cube is None:
+        cube = build_cube(df)
+    totals = cube_totals(cube)
+
+    # Empty strings count as missing, as they do once the CSV is read back
+    present = [col for col in COVERAGE_COLUMNS if col in df.columns]
+    block = df[present]
+    filled = block.notna() & (block != "").astype("boolean").fillna(False).astype(bool)
+    state_coverage = filled.groupby(df["state"]).sum()
+
+    eins = df["ein"].dropna()
+    scores = pd.to_numeric(df["confidence_score"], errors="coerce").dropna().to_numpy(dtype="float64")
+
+    return {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "total": len(df),
+        "ein": {
+            "unique": int(eins.nunique()),
+            "with": len(eins),
+            "without": len(df) - len(eins),
+        },
+        "coverage": {col: int(n) for col, n in filled.sum().items()},
+        "va_accredited": totals["va_accredited"],
+        "confidence": {
+            "mean": float(scores.mean()) if len(scores) else None,
+            "median": float(np.median(scores)) if len(scores) else None,
+            "high": int((scores > 0.7).sum()),
+            "medium": int(((scores >= 0.4) & (scores <= 0.7)).sum()),
+            "low": int((scores < 0.4).sum()),
+        },
+        "grades": _counts(cube_counts(cube, "confidence_grade")),
+        "states": _counts(cube_counts(cube, "state")),
+        "org_types": _counts(cube_counts(cube, "org_type")),
+        "revenue_ranges": _counts(cube_counts(cube, "annual_revenue_range")),
+        "data_sources": _source_counts(df["data_sources"]),
+        "state_coverage": {
+            state: {col: int(n) for col, n in row.items()}
+            for state, row in state_coverage.iterrows()
+        },
+    }
+
+
+def _counts(counts: pd.Series) -> dict[str, int]:
+    return {str(k): int(v) for k, v in counts.items()}
+
+
+def _source_counts(data_sources: pd.Series) -> dict[str, int]:
+    """Occurrences of each ';'-separated source, largest first."""
+    codes, values = pd.factorize(data_sources.dropna())
+    per_value = np.bincount(codes, minlength=len(values))
+
+    counts: dict[str, int] = {}
+    for value, n in zip(values, per_value.tolist()):
+        for source in value.split(";"):
+            source = source.strip()
+            if source:
+                counts[source] = counts.get(source, 0) + n
+    return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+
+def write_stats(stats: dict, filename: str = STATS_FILENAME) -> Path:
+    """Save stats as JSON in the output directory."""
+    stats_path = OUTPUT_DIR / filename
+    stats_path.write_text(json.dumps(stats, indent=2))
+    logger.info(f"Directory stats: {stats_path}")
+    return stats_path
+
+
+def load_stats(path: Path) -> dict | None:
+    """Read a stats file written by write_stats(), or None if unavailable."""
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
@@ -11,6 +11,8 @@ Usage:
     python main.py --skip-enrichment  # Skip Stage 7 (web scraping)
     python main.py --clean            # Clear all checkpoints and start fresh
     python main.py --stages 1,2,5     # Run only specific stages
+    python main.py --trace            # Also write a Chrome trace of the run
+    python main.py --full-dedup       # Rebuild dedup clusters from scratch
 """
 
 import argparse
@@ -21,8 +23,9 @@ from datetime import datetime
 
 import pandas as pd
 
-from config.settings import LOG_LEVEL, OUTPUT_DIR
+from config.settings import DEDUP_INCREMENTAL, LOG_LEVEL, OUTPUT_DIR, PROFILE_TRACE
 from utils.checkpoint import clear_all_checkpoints
+from utils.profiling import log_summary, profiled, start_run, write_run_report
 
 logger = logging.getLogger("pipeline")
 
@@ -39,6 +42,7 @@ def setup_logging(level: str = LOG_LEVEL):
     )
 
 
+@profiled()
 def stage1_irs_bmf(resume: bool = False):
     """Stage 1: Download and filter IRS BMF data."""
     from extractors.irs_bmf import IrsBmfExtractor
@@ -51,6 +55,7 @@ def stage1_irs_bmf(resume: bool = False):
     return extractor.run(resume=resume)
 
 
+@profiled()
 def stage2_api_enrichment(base_df, resume: bool = False):
     """Stage 2: ProPublica + Charity Navigator API enrichment."""
     from extractors.charity_nav import CharityNavExtractor
@@ -74,6 +79,7 @@ def stage2_api_enrichment(base_df, resume: bool = False):
     return pp_df, cn_df
 
 
+@profiled()
 def stage3_web_scraping(resume: bool = False):
     """Stage 3: VA VSO + NRD web scraping."""
     from extractors.nrd import NrdExtractor
@@ -92,6 +98,7 @@ def stage3_web_scraping(resume: bool = False):
     return vso_df, nrd_df
 
 
+@profiled()
 def stage4_additional_sources(base_df, resume: bool = False):
     """Stage 4: VA Facilities API + NODC data."""
     from extractors.nodc import NodcExtractor
@@ -111,6 +118,7 @@ def stage4_additional_sources(base_df, resume: bool = False):
     return va_fac_df, nodc_df
 
 
+@profiled()
 def stage5_merge(base_df, pp_df, cn_df, vso_df, nrd_df, va_fac_df, nodc_df):
     """Stage 5: Merge all sources."""
     from loaders.merger import merge_all
@@ -136,19 +144,26 @@ def stage5_merge(base_df, pp_df, cn_df, vso_df, nrd_df, va_fac_df, nodc_df):
     return merged
 
 
-def stage6_dedup(df):
-    """Stage 6: Three-tier deduplication."""
+@profiled()
+def stage6_dedup(df, full=not DEDUP_INCREMENTAL):
+    """Stage 6: Address standardization + union-find deduplication.
+
+    Unless full is set, fuzzy matches from the previous run are reused.
+    """
     from loaders.deduplicator import deduplicate
+    from transformers.address import standardize_addresses
 
     logger.info("=" * 60)
     logger.info("STAGE 6: Deduplication")
     logger.info("=" * 60)
 
-    deduped = deduplicate(df)
+    df = standardize_addresses(df)
+    deduped = deduplicate(df, full=full)
     logger.info(f"After dedup: {len(deduped):,} records (removed {len(df) - len(deduped):,})")
     return deduped
 
 
+@profiled()
 def filter_by_state(df: pd.DataFrame, state_code: str) -> pd.DataFrame:
     """Filter DataFrame to orgs in a specific state before enrichment."""
     logger.info("=" * 60)
@@ -169,6 +184,7 @@ def filter_by_state(df: pd.DataFrame, state_code: str) -> pd.DataFrame:
     return filtered
 
 
+@profiled()
 def stage7_enrichment(df):
     """Stage 7: Web enrichment for social media and email."""
     from transformers.enricher import WebEnricher
@@ -182,6 +198,7 @@ def stage7_enrichment(df):
     return enriched
 
 
+@profiled()
 def stage8_output(df):
     """Stage 8: Normalize, calculate confidence, write CSV + report."""
     from loaders.csv_writer import write_csv
@@ -221,9 +238,18 @@ def main():
         "--state-filter", type=str, default=None,
         help="Filter to specific state before enrichment (e.g., 'KY' for Kentucky)"
     )
+    parser.add_argument(
+        "--trace", action="store_true", default=PROFILE_TRACE,
+        help="Write a Chrome trace (run_trace.json) alongside the run report"
+    )
+    parser.add_argument(
+        "--full-dedup", action="store_true", default=not DEDUP_INCREMENTAL,
+        help="Rebuild dedup clusters from scratch instead of reusing the last run's fuzzy matches"
+    )
     args = parser.parse_args()
 
     setup_logging()
+    profile = start_run(trace=args.trace)
 
     if args.clean:
         logger.info("Cleaning all checkpoints...")
@@ -305,7 +331,7 @@ def main():
 
         # Stage 6: Dedup
         if 6 in run_stages:
-            merged = stage6_dedup(merged)
+            merged = stage6_dedup(merged, full=args.full_dedup)
 
         # Stage 7: Web enrichment (optional)
         if 7 in run_stages:
@@ -337,6 +363,10 @@ def main():
     except Exception as e:
         logger.exception(f"Pipeline failed: {e}")
         sys.exit(1)
+    finally:
+        logger.info("Stage profile:")
+        log_summary(profile)
+        write_run_report(OUTPUT_DIR, profile)
 
 
 if __name__ == "__main__":
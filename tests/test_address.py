@@ -0,0 +1,15 @@
+"""Canonical street lines in transformers.address."""
+
+import pytest
+
+from transformers.address import canonical_street, parse_address
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("1 Main St #5, Louisville, KY 40202", "1 MAIN ST # 5"),
+    ("1 Main St # 5, Louisville, KY 40202", "1 MAIN ST # 5"),
+    ("1 Main St Apt #5, Louisville, KY 40202", "1 MAIN ST APT 5"),
+    ("1 Main St Apt 5, Louisville, KY 40202", "1 MAIN ST APT 5"),
+])
+def test_unit_number_has_single_spaces(raw, expected):
+    assert canonical_street(parse_address(raw)) == expected
@@ -0,0 +1,24 @@
+"""Cross-tier EIN safety in loaders.deduplicator."""
+
+import pandas as pd
+
+from loaders.deduplicator import deduplicate
+
+
+def test_einless_row_does_not_bridge_two_eins():
+    # Row 2 has no EIN, EIN A's phone and EIN B's address key
+    df = pd.DataFrame({
+        "org_name": ["Hardin County Honor Guard", "Elizabethtown Veterans Hall", "Veterans Outreach"],
+        "ein": ["11-1111111", "22-2222222", pd.NA],
+        "city": ["Radcliff", "Elizabethtown", "Vine Grove"],
+        "state": ["KY", "KY", "KY"],
+        "phone": ["(270) 555-0101", "(270) 555-0199", "(270) 555-0101"],
+        "website": [pd.NA, pd.NA, pd.NA],
+        "address_key": [pd.NA, "100 MAIN ST|42701", "100 MAIN ST|42701"],
+        "data_sources": ["IRS_BMF", "IRS_BMF", "NRD"],
+    }, dtype="string")
+
+    result = deduplicate(df, state_path=None)
+
+    assert set(result["ein"].dropna()) == {"11-1111111", "22-2222222"}
+    assert len(result) == 2
@@ -0,0 +1,41 @@
+"""org_id carry-over between dedup runs."""
+
+import pandas as pd
+
+from loaders.deduplicator import deduplicate
+
+
+def _orgs():
+    return pd.DataFrame({
+        "org_name": ["American Legion Post 12", "VFW Post 4076", "Corbin Veterans Center"],
+        "ein": ["11-1111111", "22-2222222", pd.NA],
+        "city": ["Louisville", "Corbin", "Corbin"],
+        "state": ["KY", "KY", "KY"],
+        "phone": ["(502) 555-0101", "(606) 555-0102", "(606) 555-0103"],
+        "website": [pd.NA, pd.NA, pd.NA],
+        "address_key": [pd.NA, pd.NA, pd.NA],
+        "data_sources": ["IRS_BMF", "IRS_BMF", "NRD"],
+    }, dtype="string")
+
+
+def _ids(df):
+    return dict(zip(df["org_name"].str.replace(" Inc", ""), df["org_id"]))
+
+
+def test_ein_org_keeps_id_when_phone_and_name_change(tmp_path):
+    state = tmp_path / "dedup_state.pkl"
+    before = _ids(deduplicate(_orgs(), state_path=state))
+
+    changed = _orgs()
+    changed.loc[0, "phone"] = "(502) 555-0199"
+    changed.loc[1, "org_name"] = "VFW Post 4076 Inc"
+    after = _ids(deduplicate(changed.iloc[::-1], state_path=state))
+
+    assert after == before
+
+
+def test_ids_are_deterministic_without_state():
+    first = deduplicate(_orgs(), state_path=None)
+    again = deduplicate(_orgs().iloc[::-1], state_path=None)
+    assert _ids(first) == _ids(again)
+    assert first["org_id"].is_unique
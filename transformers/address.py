@@ -0,0 +1,193 @@
+"""Street address parsing and standardization (runs before dedup).
+
+Each distinct raw ``street_address`` is tagged with usaddress and reduced
+to a USPS-style canonical street line (``123 N MAIN ST STE 200``,
+``PO BOX 4411``). Combined with the 5-digit ZIP (or city/state when the
+ZIP is missing) that gives ``address_key``, a join key that survives the
+formatting differences between IRS, VA and NRD sources.
+
+Parses are memoized in a persistent pickle keyed by the raw string. It
+lives outside the checkpoint directory, so ``--clean`` keeps it and
+monthly reruns only parse addresses they have not seen before. Cache
+misses are parsed in a process pool, one chunk per task.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import usaddress
+
+from config.settings import ADDRESS_CACHE_PATH, ADDRESS_CHUNK_SIZE, ADDRESS_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# USPS Publication 28 abbreviations for the common cases
+STREET_SUFFIXES = {
+    "ALLEY": "ALY", "AVENUE": "AVE", "AV": "AVE", "BOULEVARD": "BLVD", "BYPASS": "BYP",
+    "CIRCLE": "CIR", "COURT": "CT", "COVE": "CV", "CROSSING": "XING", "DRIVE": "DR",
+    "EXPRESSWAY": "EXPY", "FREEWAY": "FWY", "HEIGHTS": "HTS", "HIGHWAY": "HWY", "HWAY": "HWY",
+    "LANE": "LN", "PARKWAY": "PKWY", "PKY": "PKWY",
+    "PLACE": "PL", "PLAZA": "PLZ", "POINT": "PT", "ROAD": "RD", "ROUTE": "RTE",
+    "SQUARE": "SQ", "STREET": "ST", "STR": "ST", "TERRACE": "TER", "TRAIL": "TRL",
+    "TURNPIKE": "TPKE",
+}
+
+DIRECTIONALS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+}
+
+OCCUPANCY_TYPES = {
+    "SUITE": "STE", "APARTMENT": "APT", "BUILDING": "BLDG", "FLOOR": "FL",
+    "ROOM": "RM", "DEPARTMENT": "DEPT",
+}
+
+# Component labels that make up the canonical street line, in order
+_STREET_LABELS = [
+    "AddressNumberPrefix", "AddressNumber", "AddressNumberSuffix",
+    "StreetNamePreModifier", "StreetNamePreDirectional", "StreetNamePreType",
+    "StreetName", "StreetNamePostType", "StreetNamePostDirectional",
+]
+
+_PUNCT = re.compile(r"[.,]")
+_SPACES = re.compile(r"\s+")
+
+
+def _clean(token: str) -> str:
+    return _SPACES.sub(" ", _PUNCT.sub("", token)).strip().upper()
+
+
+def parse_address(raw: str) -> dict:
+    """Tag a raw street line into usaddress components ({} if unparseable).
+
+    Repeated labels (e.g. two suites) keep their first occurrence.
+    """
+    try:
+        components, _ = usaddress.tag(raw)
+        return dict(components)
+    except usaddress.RepeatedLabelError as e:
+        components = {}
+        for token, label in e.parsed_string:
+            components.setdefault(label, token)
+        return components
+    except Exception:
+        return {}
+
+
+def canonical_street(components: dict) -> str | None:
+    """USPS-style street line from parsed components, or None."""
+    if not components:
+        return None
+
+    if "USPSBoxID" in components:
+        parts = []
+        if "USPSBoxGroupType" in components:
+            parts += [_clean(components["USPSBoxGroupType"]), _clean(components.get("USPSBoxGroupID", ""))]
+        parts += ["PO BOX", _clean(components["USPSBoxID"])]
+        return " ".join(p for p in parts if p)
+
+    if "StreetName" not in components or "AddressNumber" not in components:
+        return None
+
+    parts = []
+    for label in _STREET_LABELS:
+        token = _clean(components.get(label, ""))
+        if not token:
+            continue
+        if label in ("StreetNamePreDirectional", "StreetNamePostDirectional"):
+            token = DIRECTIONALS.get(token, token)
+        elif label == "StreetNamePostType":
+            token = STREET_SUFFIXES.get(token, token)
+        parts.append(token)
+
+    occ_id = _clean(components.get("OccupancyIdentifier", "")).lstrip("#").strip()
+    if occ_id:
+        occ_type = _clean(components.get("OccupancyType", "")) or "#"
+        parts += [OCCUPANCY_TYPES.get(occ_type, occ_type), occ_id]
+    return " ".join(parts)
+
+
+def _parse_chunk(raws: list[str]) -> list[dict]:
+    return [parse_address(raw) for raw in raws]
+
+
+def load_address_cache(path: Path = ADDRESS_CACHE_PATH) -> dict:
+    """Load the raw-string → components cache (empty if missing or unreadable)."""
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Could not read address cache {path}: {e}")
+        return {}
+
+
+def save_address_cache(cache: dict, path: Path = ADDRESS_CACHE_PATH) -> None:
+    """Write the cache atomically (temp file + rename)."""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def parse_addresses(raws: list[str], cache: dict, workers: int = ADDRESS_WORKERS) -> int:
+    """Parse raws missing from cache into it; returns the number parsed."""
+    missing = [raw for raw in raws if raw not in cache]
+    if not missing:
+        return 0
+
+    chunks = [missing[i:i + ADDRESS_CHUNK_SIZE] for i in range(0, len(missing), ADDRESS_CHUNK_SIZE)]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            results = pool.map(_parse_chunk, chunks)
+            for chunk, parsed in zip(chunks, results):
+                cache.update(zip(chunk, parsed))
+    else:
+        for chunk in chunks:
+            cache.update(zip(chunk, _parse_chunk(chunk)))
+    return len(missing)
+
+
+def standardize_addresses(df: pd.DataFrame) -> pd.DataFrame:
+    """Add ``address_key`` (canonical street | ZIP5 or city/state) to df."""
+    if "street_address" not in df.columns or df.empty:
+        df["address_key"] = None
+        return df
+
+    raw = df["street_address"].astype("string").str.strip()
+    raw = raw.where(raw != "")
+    distinct = raw.dropna().unique().tolist()
+
+    cache = load_address_cache()
+    parsed = parse_addresses(distinct, cache)
+    logger.info(
+        f"Address standardization: {len(distinct):,} distinct streets, "
+        f"{len(distinct) - parsed:,} cached, {parsed:,} parsed"
+    )
+    if parsed:
+        save_address_cache(cache)
+
+    canonical = {r: canonical_street(cache[r]) for r in distinct}
+    street = raw.map(canonical)
+
+    # Locality: 5-digit ZIP, falling back to "CITY ST"
+    def _text(col):
+        if col not in df.columns:
+            return pd.Series(pd.NA, index=df.index, dtype="string")
+        return df[col].astype("string").str.strip().str.upper()
+
+    zip5 = _text("zip_code").str.extract(r"^(\d{5})", expand=False)
+    locality = zip5.fillna(_text("city") + " " + _text("state"))
+
+    key = street.astype("string") + "|" + locality
+    df["address_key"] = key.astype(object).where(key.notna(), None)
+    logger.info(f"Address keys assigned: {df['address_key'].notna().sum():,} of {len(df):,}")
+    return df
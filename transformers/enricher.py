@@ -60,14 +60,25 @@ class WebEnricher:
         self.logger = logging.getLogger("enricher")
 
     def enrich(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Enrich DataFrame rows that have a website but are missing social/email."""
+        """Enrich DataFrame rows that have a website but are missing social/email.
+
+        Progress is checkpointed by org_id (assigned in Stage 6), so an
+        interrupted run resumes correctly even if rows were reordered or
+        the frame was rebuilt in between. Frames without org_id fall back
+        to the index.
+        """
         partial = load_checkpoint("enricher_partial")
         if partial is not None:
-            enrichments, done_indices = partial
-            self.logger.info(f"Resuming enrichment from {len(done_indices)} completed")
+            enrichments, done_ids = partial
+            self.logger.info(f"Resuming enrichment from {len(done_ids)} completed")
         else:
             enrichments = {}
-            done_indices = set()
+            done_ids = set()
+
+        if "org_id" in df.columns:
+            org_ids = df["org_id"].astype(object).where(df["org_id"].notna(), pd.Series(df.index, index=df.index))
+        else:
+            org_ids = pd.Series(df.index, index=df.index)
 
         # Find rows that need enrichment
         needs_enrichment = df[
@@ -79,40 +90,48 @@ class WebEnricher:
             )
         ].index
 
-        remaining = [i for i in needs_enrichment if i not in done_indices]
+        remaining = [i for i in needs_enrichment if org_ids[i] not in done_ids]
         self.logger.info(f"Enriching {len(remaining):,} org websites")
 
         for count, idx in enumerate(tqdm(
             remaining,
             desc="Enriching websites",
             unit="org",
-            initial=len(done_indices),
+            initial=len(needs_enrichment) - len(remaining),
             total=len(needs_enrichment),
         )):
             url = df.at[idx, "website"]
+            org_id = org_ids[idx]
             try:
                 data = self._scrape_website(url)
                 if data:
-                    enrichments[idx] = data
+                    enrichments[org_id] = data
             except Exception as e:
                 self.logger.debug(f"Error scraping {url}: {e}")
 
-            done_indices.add(idx)
+            done_ids.add(org_id)
 
             if (count + 1) % CHECKPOINT_INTERVAL == 0:
-                save_checkpoint("enricher_partial", (enrichments, done_indices))
+                save_checkpoint("enricher_partial", (enrichments, done_ids))
                 tqdm.write(
-                    f"  Checkpoint saved: {len(done_indices):,}/{len(needs_enrichment):,} orgs processed"
+                    f"  Checkpoint saved: {len(done_ids):,}/{len(needs_enrichment):,} orgs processed"
                 )
 
         # Apply enrichments
-        for idx, data in enrichments.items():
+        positions = pd.Series(df.index, index=org_ids.to_numpy())
+        positions = positions[~positions.index.duplicated()]
+        applied = 0
+        for org_id, data in enrichments.items():
+            idx = positions.get(org_id)
+            if idx is None:
+                continue
+            applied += 1
             for col, value in data.items():
                 if col in df.columns and pd.isna(df.at[idx, col]):
                     df.at[idx, col] = value
 
         self.logger.info(
-            f"Enrichment complete: {len(enrichments):,} orgs updated"
+            f"Enrichment complete: {applied:,} orgs updated"
         )
         return df
 
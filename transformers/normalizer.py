@@ -6,10 +6,36 @@ import logging
 import re
 from urllib.parse import urlparse
 
+import numpy as np
 import pandas as pd
 
+from utils.unique_map import map_unique
+
 logger = logging.getLogger(__name__)
 
+# Common full names → abbreviations
+STATE_NAME_TO_CODE = {
+    "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR",
+    "CALIFORNIA": "CA", "COLORADO": "CO", "CONNECTICUT": "CT", "DELAWARE": "DE",
+    "FLORIDA": "FL", "GEORGIA": "GA", "HAWAII": "HI", "IDAHO": "ID",
+    "ILLINOIS": "IL", "INDIANA": "IN", "IOWA": "IA", "KANSAS": "KS",
+    "KENTUCKY": "KY", "LOUISIANA": "LA", "MAINE": "ME", "MARYLAND": "MD",
+    "MASSACHUSETTS": "MA", "MICHIGAN": "MI", "MINNESOTA": "MN",
+    "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT", "NEBRASKA": "NE",
+    "NEVADA": "NV", "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ",
+    "NEW MEXICO": "NM", "NEW YORK": "NY", "NORTH CAROLINA": "NC",
+    "NORTH DAKOTA": "ND", "OHIO": "OH", "OKLAHOMA": "OK", "OREGON": "OR",
+    "PENNSYLVANIA": "PA", "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC",
+    "SOUTH DAKOTA": "SD", "TENNESSEE": "TN", "TEXAS": "TX", "UTAH": "UT",
+    "VERMONT": "VT", "VIRGINIA": "VA", "WASHINGTON": "WA",
+    "WEST VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY",
+    "DISTRICT OF COLUMBIA": "DC", "PUERTO RICO": "PR",
+    "VIRGIN ISLANDS": "VI", "GUAM": "GU", "AMERICAN SAMOA": "AS",
+}
+
+# Kept uppercase when they appear as whole words in org names
+ORG_NAME_ACRONYMS = {"VFW", "DAV", "AMVETS", "USO", "VA", "USA", "US", "PTSD", "POW", "MIA"}
+
 
 def normalize_ein(ein) -> str | None:
     """Normalize EIN to XX-XXXXXXX format."""
@@ -64,27 +90,7 @@ def normalize_state(state) -> str | None:
     state = str(state).strip().upper()
     if len(state) == 2:
         return state
-
-    # Common full names → abbreviations
-    state_map = {
-        "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR",
-        "CALIFORNIA": "CA", "COLORADO": "CO", "CONNECTICUT": "CT", "DELAWARE": "DE",
-        "FLORIDA": "FL", "GEORGIA": "GA", "HAWAII": "HI", "IDAHO": "ID",
-        "ILLINOIS": "IL", "INDIANA": "IN", "IOWA": "IA", "KANSAS": "KS",
-        "KENTUCKY": "KY", "LOUISIANA": "LA", "MAINE": "ME", "MARYLAND": "MD",
-        "MASSACHUSETTS": "MA", "MICHIGAN": "MI", "MINNESOTA": "MN",
-        "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT", "NEBRASKA": "NE",
-        "NEVADA": "NV", "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ",
-        "NEW MEXICO": "NM", "NEW YORK": "NY", "NORTH CAROLINA": "NC",
-        "NORTH DAKOTA": "ND", "OHIO": "OH", "OKLAHOMA": "OK", "OREGON": "OR",
-        "PENNSYLVANIA": "PA", "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC",
-        "SOUTH DAKOTA": "SD", "TENNESSEE": "TN", "TEXAS": "TX", "UTAH": "UT",
-        "VERMONT": "VT", "VIRGINIA": "VA", "WASHINGTON": "WA",
-        "WEST VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY",
-        "DISTRICT OF COLUMBIA": "DC", "PUERTO RICO": "PR",
-        "VIRGIN ISLANDS": "VI", "GUAM": "GU", "AMERICAN SAMOA": "AS",
-    }
-    return state_map.get(state, state if len(state) == 2 else None)
+    return STATE_NAME_TO_CODE.get(state)
 
 
 def normalize_zip(zipcode) -> str | None:
@@ -115,11 +121,10 @@ def normalize_org_name(name) -> str | None:
     name = re.sub(r"\s+", " ", name)
 
     # Title case, preserving known acronyms
-    acronyms = {"VFW", "DAV", "AMVETS", "USO", "VA", "USA", "US", "PTSD", "POW", "MIA"}
     words = name.title().split()
     result = []
     for w in words:
-        if w.upper() in acronyms:
+        if w.upper() in ORG_NAME_ACRONYMS:
             result.append(w.upper())
         else:
             result.append(w)
@@ -127,34 +132,163 @@ def normalize_org_name(name) -> str | None:
     return " ".join(result)
 
 
-def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    """Apply all normalizations to a DataFrame in-place."""
-    logger.info(f"Normalizing {len(df):,} records")
+# ── Vectorized column normalizers ─────────────────────────────────────
+# Same outputs as the scalar functions above (object dtype, None for
+# missing), computed with pandas string kernels (pyarrow-backed where
+# pandas uses it) instead of a Python call per cell. Only ASCII values take
+# the kernel path; Unicode case mapping and whitespace rules differ between
+# pyarrow and Python, so anything else goes through the scalar function.
+# `python -m benchmarks.normalizer` checks both paths cell for cell.
 
-    if "ein" in df.columns:
-        df["ein"] = df["ein"].apply(normalize_ein)
+_ASCII = r"[\x00-\x7f]*"
+
+# What str.strip() / re's \s treat as whitespace within ASCII
+_ASCII_WHITESPACE = " \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+# urlparse drops tab/CR/LF, strips leading control characters, splits ';'
+# params off the path and validates '[...]' hosts, so URLs containing any
+# of those take the scalar path.
+_URL_FAST_CHARS = r"[\x20-\x3a\x3c-\x5a\x5c\x5e-\x7e]*"
+
+# Title-cased form → acronym; after .title() an ASCII acronym word can
+# only appear in its capitalized spelling.
+_ACRONYM_WORDS = {a.title(): a for a in ORG_NAME_ACRONYMS}
+
+
+def _present(series: pd.Series) -> pd.Series:
+    """Non-missing values as strings, indexed by their row position."""
+    positions = np.flatnonzero(series.notna().to_numpy())
+    values = series.iloc[positions].astype(str)
+    values.index = positions
+    return values
+
+
+def _normalize_column(series: pd.Series, kernel, scalar, fast_pattern: str = _ASCII) -> pd.Series:
+    """Run kernel over values fully matching fast_pattern and scalar over the rest.
+
+    kernel returns position-indexed results with NaN for invalid values;
+    the combined result is an object Series with None for missing/invalid.
+    """
+    text = _present(series)
+    fast = text.str.fullmatch(fast_pattern).to_numpy(dtype=bool)
+    results = pd.concat([kernel(text[fast]), text[~fast].map(scalar)]).dropna()
+
+    out = np.full(len(series), None, dtype=object)
+    out[results.index.to_numpy()] = results.to_numpy(dtype=object)
+    return pd.Series(out, index=series.index, dtype=object)
+
+
+def _ein_kernel(text: pd.Series) -> pd.Series:
+    digits = text.str.replace(r"[^0-9]", "", regex=True)
+    valid = digits[digits.str.len() == 9]
+    return valid.str[:2] + "-" + valid.str[2:]
+
+
+def _phone_kernel(text: pd.Series) -> pd.Series:
+    digits = text.str.replace(r"[^0-9]", "", regex=True)
+    has_country = (digits.str.len() == 11) & digits.str.startswith("1")
+    digits = digits.where(~has_country, digits.str[1:])
+    valid = digits[digits.str.len() == 10]
+    return "(" + valid.str[:3] + ") " + valid.str[3:6] + "-" + valid.str[6:]
 
-    if "phone" in df.columns:
-        df["phone"] = df["phone"].apply(normalize_phone)
 
-    if "website" in df.columns:
-        df["website"] = df["website"].apply(normalize_url)
+def _url_kernel(text: pd.Series) -> pd.Series:
+    text = text.str.strip(" ")
+    text = text[text != ""]
+    is_http = text.str.startswith("http://")
+    is_https = text.str.startswith("https://")
+    scheme = pd.Series("https", index=text.index).where(~is_http, "http")
+    rest = text.str.replace(r"^https?://", "", regex=True).where(is_http | is_https, text)
+    netloc = rest.str.replace(r"[/?#].*$", "", regex=True)
+    path = rest.str.replace(r"^[^/?#]*", "", regex=True).str.replace(r"[?#].*$", "", regex=True)
+    valid = netloc != ""
+    return (scheme[valid] + "://" + netloc[valid].str.lower() + path[valid]).str.rstrip("/")
 
-    if "state" in df.columns:
-        df["state"] = df["state"].apply(normalize_state)
 
-    if "zip_code" in df.columns:
-        df["zip_code"] = df["zip_code"].apply(normalize_zip)
+def _state_kernel(text: pd.Series) -> pd.Series:
+    text = text.str.strip(_ASCII_WHITESPACE).str.upper()
+    return text.where(text.str.len() == 2, text.map(STATE_NAME_TO_CODE))
 
-    if "org_name" in df.columns:
-        df["org_name"] = df["org_name"].apply(normalize_org_name)
 
-    for url_col in ["facebook_url", "twitter_url", "linkedin_url", "instagram_url", "youtube_url"]:
-        if url_col in df.columns:
-            df[url_col] = df[url_col].apply(normalize_url)
+def _zip_kernel(text: pd.Series) -> pd.Series:
+    z = text.str.replace(r"[^0-9-]", "", regex=True)
+    z = z[z.str.len() >= 5]
+    base = z.str[:5]
+    ext = z.str[5:].str.lstrip("-")
+    return base.where(ext.str.len() != 4, base + "-" + ext)
 
-    if "email" in df.columns:
-        df["email"] = df["email"].str.strip().str.lower()
+
+def _org_name_kernel(text: pd.Series) -> pd.Series:
+    text = text.str.strip(_ASCII_WHITESPACE)
+    text = text[text != ""]
+    text = text.str.replace(f"[{_ASCII_WHITESPACE}]+", " ", regex=True).str.title()
+    # Pad so every word is space-delimited; adjacent hits share a space,
+    # so a second pass catches the ones the first pass skipped.
+    padded = " " + text + " "
+    has_acronym = padded.str.contains(f" (?:{'|'.join(_ACRONYM_WORDS)}) ", regex=True).to_numpy(dtype=bool)
+    hits = padded[has_acronym]
+    for word, acronym in _ACRONYM_WORDS.items():
+        for _ in range(2):
+            hits = hits.str.replace(f" {word} ", f" {acronym} ", regex=False)
+    text[has_acronym] = hits.str[1:-1]
+    return text
+
+
+def normalize_ein_series(series: pd.Series) -> pd.Series:
+    """Vectorized normalize_ein."""
+    return _normalize_column(series, _ein_kernel, normalize_ein)
+
+
+def normalize_phone_series(series: pd.Series) -> pd.Series:
+    """Vectorized normalize_phone."""
+    return _normalize_column(series, _phone_kernel, normalize_phone)
+
+
+def normalize_url_series(series: pd.Series) -> pd.Series:
+    """Vectorized normalize_url."""
+    return _normalize_column(series, _url_kernel, normalize_url, fast_pattern=_URL_FAST_CHARS)
+
+
+def normalize_state_series(series: pd.Series) -> pd.Series:
+    """Vectorized normalize_state."""
+    return _normalize_column(series, _state_kernel, normalize_state)
+
+
+def normalize_zip_series(series: pd.Series) -> pd.Series:
+    """Vectorized normalize_zip."""
+    return _normalize_column(series, _zip_kernel, normalize_zip)
+
+
+def normalize_org_name_series(series: pd.Series) -> pd.Series:
+    """Vectorized normalize_org_name."""
+    return _normalize_column(series, _org_name_kernel, normalize_org_name)
+
+
+def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply all normalizations to a DataFrame in-place."""
+    logger.info(f"Normalizing {len(df):,} records")
+
+    # EINs are unique by construction; every other column repeats enough
+    # that each normalizer runs over its distinct values only
+    if "ein" in df.columns:
+        df["ein"] = normalize_ein_series(df["ein"])
+
+    column_normalizers = {
+        "phone": normalize_phone_series,
+        "website": normalize_url_series,
+        "state": normalize_state_series,
+        "zip_code": normalize_zip_series,
+        "org_name": normalize_org_name_series,
+        "facebook_url": normalize_url_series,
+        "twitter_url": normalize_url_series,
+        "linkedin_url": normalize_url_series,
+        "instagram_url": normalize_url_series,
+        "youtube_url": normalize_url_series,
+        "email": lambda s: s.str.strip().str.lower(),
+    }
+    for col, normalizer in column_normalizers.items():
+        if col in df.columns:
+            df[col] = map_unique(df[col], normalizer)
 
     if "country" in df.columns:
         df["country"] = df["country"].fillna("US")
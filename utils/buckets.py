@@ -0,0 +1,73 @@
+"""Revenue and employee-count buckets shared by the pipeline and dashboard.
+
+Each scale is an ascending list of (lower bound, label); a value belongs
+to the last bucket whose lower bound it reaches. bucketize() assigns a
+whole column with one np.searchsorted call and returns an ordered
+categorical, so sorting follows the scale rather than the label text.
+
+The dashboard's coarse revenue filter options are unions of the fine
+revenue buckets, which keeps filtered rows and the annual_revenue_range
+cube dimension in agreement.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+REVENUE_BUCKETS = [
+    (0, "$0"),
+    (1, "Under $50K"),
+    (50_000, "$50K–$100K"),
+    (100_000, "$100K–$500K"),
+    (500_000, "$500K–$1M"),
+    (1_000_000, "$1M–$5M"),
+    (5_000_000, "$5M–$10M"),
+    (10_000_000, "$10M–$50M"),
+    (50_000_000, "$50M–$100M"),
+    (100_000_000, "$100M+"),
+]
+REVENUE_LABELS = [label for _, label in REVENUE_BUCKETS]
+
+# Dashboard filter option → fine revenue buckets it covers
+REVENUE_FILTER_GROUPS = {
+    "Under $50K": ["$0", "Under $50K"],
+    "$50K–$500K": ["$50K–$100K", "$100K–$500K"],
+    "$500K–$1M": ["$500K–$1M"],
+    "$1M–$10M": ["$1M–$5M", "$5M–$10M"],
+    "$10M–$100M": ["$10M–$50M", "$50M–$100M"],
+    "$100M+": ["$100M+"],
+}
+
+EMPLOYEE_BUCKETS = [
+    (1, "1–10"),
+    (11, "11–50"),
+    (51, "51–200"),
+    (201, "201–1000"),
+    (1001, "1000+"),
+]
+EMPLOYEE_LABELS = [label for _, label in EMPLOYEE_BUCKETS]
+
+
+def bucketize(values, buckets: list[tuple[float, str]]) -> pd.Series:
+    """Ordered categorical of bucket labels; NaN/below-scale values are missing."""
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    x = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+    lower = np.array([low for low, _ in buckets], dtype="float64")
+    codes = np.searchsorted(lower, x, side="right") - 1
+    codes[np.isnan(x)] = -1
+
+    labels = [label for _, label in buckets]
+    categorical = pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+    return pd.Series(categorical, index=series.index, name=series.name)
+
+
+def revenue_bucket(revenue) -> pd.Series:
+    """annual_revenue_range labels for a revenue column."""
+    return bucketize(revenue, REVENUE_BUCKETS)
+
+
+def employee_bucket(employees) -> pd.Series:
+    """Employee-count range labels for a num_employees column."""
+    return bucketize(employees, EMPLOYEE_BUCKETS)
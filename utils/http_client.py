@@ -1,4 +1,12 @@
-"""Rate-limited requests.Session with retry logic and disk cache."""
+"""Rate-limited requests.Session with retry logic and disk cache.
+
+Every call is profiled (utils.profiling) and counted in HTTP_METRICS per
+host and per cache name: latency, bytes, cache hits, 429s, urllib3
+retries and rate-limit sleep.
+
+With MOCK_UPSTREAM_URL set, requests go to the local mock upstream server
+instead (see upstream_url()); metrics and cache keys keep the real URL.
+"""
 
 from __future__ import annotations
 
@@ -7,6 +15,7 @@ import json
 import logging
 import time
 from pathlib import Path
+from urllib.parse import urlsplit
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -17,11 +26,27 @@ from config.settings import (
     DEFAULT_RETRY_BACKOFF,
     DEFAULT_TIMEOUT,
     DISK_CACHE_DIR,
+    MOCK_UPSTREAM_URL,
 )
+from utils import profiling
+from utils.http_metrics import HTTP_METRICS
 
 logger = logging.getLogger(__name__)
 
 
+def upstream_url(url: str) -> str:
+    """Where a request for `url` is actually sent.
+
+    Unchanged normally; with MOCK_UPSTREAM_URL set, the original host and
+    path become the mock's path: https://api.va.gov/x?y → <mock>/api.va.gov/x?y.
+    """
+    if not MOCK_UPSTREAM_URL:
+        return url
+    parts = urlsplit(url)
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{MOCK_UPSTREAM_URL}/{parts.netloc}{parts.path or '/'}{query}"
+
+
 class RateLimitedSession:
     """HTTP session with per-second rate limiting, retries, and optional disk cache."""
 
@@ -35,6 +60,7 @@ class RateLimitedSession:
     ):
         self.min_interval = 1.0 / rate_limit if rate_limit > 0 else 0
         self.timeout = timeout
+        self.cache_name = cache_name
         self._last_request_time = 0.0
 
         self.session = requests.Session()
@@ -56,13 +82,42 @@ class RateLimitedSession:
             self._cache_dir = DISK_CACHE_DIR / cache_name
             self._cache_dir.mkdir(parents=True, exist_ok=True)
 
-    def _wait_for_rate_limit(self):
+    def _wait_for_rate_limit(self, url: str):
         if self.min_interval > 0:
             elapsed = time.time() - self._last_request_time
             if elapsed < self.min_interval:
-                time.sleep(self.min_interval - elapsed)
+                pause = self.min_interval - elapsed
+                time.sleep(pause)
+                HTTP_METRICS.record_sleep(urlsplit(url).netloc, self.cache_name, pause)
         self._last_request_time = time.time()
 
+    def _send(self, method: str, url: str, stream: bool = False, **kwargs) -> requests.Response:
+        """Issue one request inside a light 'http' span and record its metrics.
+
+        Latency includes any urllib3 retries and their backoff.
+        """
+        host = urlsplit(url).netloc
+        profiling.count("http.requests")
+        start = time.perf_counter()
+        with profiling.span(f"http.{method.lower()}", category="http", light=True, host=host):
+            try:
+                resp = self.session.request(method, upstream_url(url), stream=stream, **kwargs)
+            except requests.RequestException:
+                HTTP_METRICS.record_request(host, self.cache_name, time.perf_counter() - start)
+                raise
+        latency = time.perf_counter() - start
+
+        retries = getattr(getattr(resp.raw, "retries", None), "history", None) or ()
+        throttled = sum(1 for attempt in retries if attempt.status == 429)
+        HTTP_METRICS.record_request(
+            host, self.cache_name, latency,
+            status=resp.status_code,
+            nbytes=0 if stream else len(resp.content or b""),
+            retries=len(retries),
+            throttled=throttled + (resp.status_code == 429),
+        )
+        return resp
+
     def _cache_key(self, method: str, url: str, **kwargs) -> str:
         key_data = f"{method}:{url}:{json.dumps(kwargs.get('params', {}), sort_keys=True)}"
         return hashlib.sha256(key_data.encode()).hexdigest()
@@ -90,17 +145,21 @@ class RateLimitedSession:
     def get(self, url: str, use_cache: bool = True, **kwargs) -> requests.Response:
         if use_cache and self._cache_dir:
             key = self._cache_key("GET", url, **kwargs)
+            start = time.perf_counter()
             cached = self._get_cached(key)
+            HTTP_METRICS.record_cache(urlsplit(url).netloc, self.cache_name, cached is not None,
+                                      time.perf_counter() - start)
             if cached is not None:
+                profiling.count("http.cache_hits")
                 resp = requests.Response()
                 resp.status_code = cached.get("status_code", 200)
                 resp._content = cached.get("content", "").encode()
                 resp.headers.update(cached.get("headers", {}))
                 return resp
 
-        self._wait_for_rate_limit()
+        self._wait_for_rate_limit(url)
         kwargs.setdefault("timeout", self.timeout)
-        resp = self.session.get(url, **kwargs)
+        resp = self._send("GET", url, **kwargs)
 
         if use_cache and self._cache_dir and resp.status_code == 200:
             key = self._cache_key("GET", url, **kwargs)
@@ -113,18 +172,21 @@ class RateLimitedSession:
         return resp
 
     def post(self, url: str, **kwargs) -> requests.Response:
-        self._wait_for_rate_limit()
+        self._wait_for_rate_limit(url)
         kwargs.setdefault("timeout", self.timeout)
-        return self.session.post(url, **kwargs)
+        return self._send("POST", url, **kwargs)
 
     def download_file(self, url: str, dest: Path, chunk_size: int = 8192) -> Path:
         """Download a file with streaming, returning the destination path."""
-        self._wait_for_rate_limit()
+        self._wait_for_rate_limit(url)
         logger.info(f"Downloading {url} → {dest}")
-        with self.session.get(url, stream=True, timeout=self.timeout) as resp:
+        with self._send("GET", url, stream=True, timeout=self.timeout) as resp:
             resp.raise_for_status()
-            with open(dest, "wb") as f:
+            nbytes = 0
+            with profiling.span("http.download", category="http", light=True), open(dest, "wb") as f:
                 for chunk in resp.iter_content(chunk_size=chunk_size):
                     f.write(chunk)
+                    nbytes += len(chunk)
+        HTTP_METRICS.record_bytes(urlsplit(url).netloc, self.cache_name, nbytes)
         logger.info(f"Downloaded {dest} ({dest.stat().st_size:,} bytes)")
         return dest
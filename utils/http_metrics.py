@@ -0,0 +1,206 @@
+"""Per-host and per-cache HTTP metrics for RateLimitedSession.
+
+Every session call is attributed to its host and, when the session has a
+disk cache, to the cache name. For each key we keep:
+
+- network requests, transport errors, status-code counts and 429s;
+- urllib3 retry attempts (from the response's retry history);
+- response bytes;
+- disk cache hits and misses;
+- time spent sleeping for the rate limit, waiting on the network and
+  reading the cache;
+- a latency histogram with log-spaced buckets (~12% wide, 1 ms to ~4 min),
+  from which p50/p95/p99 are estimated.
+
+Histograms are plain bucket counts, so memory stays constant however many
+requests run, and the metrics for one stage are the difference of two
+snapshot()s. summary() turns raw state into the JSON shape that goes into
+the run report.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency buckets; one overflow bucket follows
+LATENCY_BOUNDS = [0.001 * 1.12 ** i for i in range(110)]
+PERCENTILES = (50, 95, 99)
+
+
+def _new_stats() -> dict:
+    return {
+        "requests": 0,
+        "errors": 0,
+        "status": {},
+        "throttled": 0,
+        "retries": 0,
+        "bytes": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "sleep_s": 0.0,
+        "network_s": 0.0,
+        "cache_s": 0.0,
+        "latency": [0] * (len(LATENCY_BOUNDS) + 1),
+    }
+
+
+class HttpMetrics:
+    """Thread-safe registry of stats keyed by host and by cache name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, dict]] = {"hosts": {}, "caches": {}}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {"hosts": {}, "caches": {}}
+
+    def _targets(self, host: str, cache: str | None) -> list[dict]:
+        targets = [self._stats["hosts"].setdefault(host, _new_stats())]
+        if cache:
+            targets.append(self._stats["caches"].setdefault(cache, _new_stats()))
+        return targets
+
+    def record_request(
+        self,
+        host: str,
+        cache: str | None,
+        latency: float,
+        status: int | None = None,
+        nbytes: int = 0,
+        retries: int = 0,
+        throttled: int = 0,
+    ) -> None:
+        """One network round trip (status None means it raised)."""
+        bucket = bisect_left(LATENCY_BOUNDS, latency)
+        with self._lock:
+            for stats in self._targets(host, cache):
+                stats["requests"] += 1
+                stats["network_s"] += latency
+                stats["latency"][bucket] += 1
+                stats["bytes"] += nbytes
+                stats["retries"] += retries
+                stats["throttled"] += throttled
+                if status is None:
+                    stats["errors"] += 1
+                else:
+                    key = str(status)
+                    stats["status"][key] = stats["status"].get(key, 0) + 1
+
+    def record_bytes(self, host: str, cache: str | None, nbytes: int) -> None:
+        """Body bytes of a streamed response, counted once it has been read."""
+        with self._lock:
+            for stats in self._targets(host, cache):
+                stats["bytes"] += nbytes
+
+    def record_cache(self, host: str, cache: str, hit: bool, seconds: float) -> None:
+        with self._lock:
+            for stats in self._targets(host, cache):
+                stats["cache_hits" if hit else "cache_misses"] += 1
+                stats["cache_s"] += seconds
+
+    def record_sleep(self, host: str, cache: str | None, seconds: float) -> None:
+        with self._lock:
+            for stats in self._targets(host, cache):
+                stats["sleep_s"] += seconds
+
+    def snapshot(self) -> dict:
+        """Deep copy of the raw counters, for diffing with summary(since=...)."""
+        with self._lock:
+            return copy.deepcopy(self._stats)
+
+    def summary(self, since: dict | None = None) -> dict:
+        """Per-host / per-cache metrics, optionally only what happened after `since`."""
+        current = self.snapshot()
+        result = {}
+        for kind, entries in current.items():
+            before = (since or {}).get(kind, {})
+            summarized = {}
+            for key, stats in entries.items():
+                delta = _diff(stats, before.get(key))
+                if delta["requests"] or delta["cache_hits"] or delta["cache_misses"]:
+                    summarized[key] = _summarize(delta)
+            if summarized:
+                result[kind] = summarized
+        return result
+
+
+def _diff(stats: dict, before: dict | None) -> dict:
+    if before is None:
+        return stats
+    delta = {}
+    for field, value in stats.items():
+        old = before[field]
+        if field == "latency":
+            delta[field] = [a - b for a, b in zip(value, old)]
+        elif field == "status":
+            delta[field] = {k: n - old.get(k, 0) for k, n in value.items() if n != old.get(k, 0)}
+        else:
+            delta[field] = value - old
+    return delta
+
+
+def percentile(histogram: list[int], q: float) -> float | None:
+    """Estimate the q-th percentile latency (seconds) from bucket counts."""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = q / 100 * total
+    seen = 0
+    for i, n in enumerate(histogram):
+        seen += n
+        if seen >= rank and n:
+            lower = LATENCY_BOUNDS[i - 1] if i > 0 else 0.0
+            upper = LATENCY_BOUNDS[i] if i < len(LATENCY_BOUNDS) else LATENCY_BOUNDS[-1]
+            # Linear interpolation inside the bucket
+            return lower + (upper - lower) * (rank - (seen - n)) / n
+    return LATENCY_BOUNDS[-1]
+
+
+def _summarize(stats: dict) -> dict:
+    lookups = stats["cache_hits"] + stats["cache_misses"]
+    entry = {
+        "requests": stats["requests"],
+        "errors": stats["errors"],
+        "status": stats["status"],
+        "throttled_429": stats["throttled"],
+        "retries": stats["retries"],
+        "bytes": stats["bytes"],
+        "cache_hits": stats["cache_hits"],
+        "cache_misses": stats["cache_misses"],
+        "cache_hit_rate": round(stats["cache_hits"] / lookups, 4) if lookups else None,
+        "sleep_s": round(stats["sleep_s"], 3),
+        "network_s": round(stats["network_s"], 3),
+        "cache_s": round(stats["cache_s"], 3),
+    }
+    for q in PERCENTILES:
+        value = percentile(stats["latency"], q)
+        entry[f"p{q}_s"] = round(value, 4) if value is not None else None
+    return entry
+
+
+def log_summary(summary: dict, title: str = "HTTP") -> None:
+    """Log one line per host and per cache."""
+    for kind in ("hosts", "caches"):
+        for key, m in summary.get(kind, {}).items():
+            hit_rate = f"{m['cache_hit_rate'] * 100:.0f}%" if m["cache_hit_rate"] is not None else "-"
+            p50, p95, p99 = (_ms(m[f"p{q}_s"]) for q in PERCENTILES)
+            logger.info(
+                f"{title} {kind[:-1]} {key}: {m['requests']:,} req, "
+                f"p50/p95/p99 {p50}/{p95}/{p99}, {m['bytes'] / 2**20:,.1f}MB, "
+                f"cache {m['cache_hits']:,}/{m['cache_hits'] + m['cache_misses']:,} ({hit_rate}), "
+                f"429s {m['throttled_429']:,}, retries {m['retries']:,}, errors {m['errors']:,}, "
+                f"sleep {m['sleep_s']:,.1f}s, network {m['network_s']:,.1f}s"
+            )
+
+
+def _ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+
+HTTP_METRICS = HttpMetrics()
@@ -0,0 +1,366 @@
+"""Lightweight run profiling: timed spans with memory, I/O and counters.
+
+Pipeline stages, extractor runs and HTTP calls are wrapped in span()s.
+Each span records its wall time, resident memory at entry and exit, the
+process peak RSS, bytes read/written by the process, rows in and out
+where known, and how far every counter (HTTP requests, cache hits, …)
+moved while it was open. Non-light spans also carry the per-host and
+per-cache HTTP metrics (utils.http_metrics) accumulated while they ran,
+and stages log them when they finish.
+
+write_run_report() saves a JSON report after the run. Spans are also
+aggregated by name, so the per-request HTTP spans show up as one line per
+call type. With tracing enabled the report is accompanied by a Chrome
+trace file (open it in chrome://tracing or https://ui.perfetto.dev).
+
+Memory and I/O come from /proc on Linux and fall back to getrusage()
+peak RSS (or nothing) elsewhere; missing values are reported as null.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from utils.http_metrics import HTTP_METRICS
+from utils.http_metrics import log_summary as log_http_summary
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILENAME = "run_report.json"
+TRACE_FILENAME = "run_trace.json"
+
+# Spans in these categories are only aggregated (and traced), not listed
+# individually in the report — there is one per HTTP request.
+AGGREGATE_ONLY = {"http"}
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes() -> int | None:
+    """Current resident set size, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of the process so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def io_bytes() -> dict[str, int] | None:
+    """Cumulative storage read/write bytes of the process (Linux only)."""
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return {"read": int(fields["read_bytes"]), "write": int(fields["write_bytes"])}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+class Span:
+    """One timed region. Set rows_in / rows_out / args while it is open."""
+
+    __slots__ = (
+        "name", "category", "args", "rows_in", "rows_out", "light",
+        "start", "end", "tid", "depth",
+        "rss_start", "rss_end", "peak_rss", "io_start", "io_end",
+        "counters_start", "counters_end", "http_start", "http", "error",
+    )
+
+    def __init__(self, name: str, category: str, args: dict, light: bool):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.light = light
+        self.rows_in = None
+        self.rows_out = None
+        self.error = None
+        self.rss_start = self.rss_end = self.peak_rss = None
+        self.io_start = self.io_end = None
+        self.counters_start = self.counters_end = None
+        self.http_start = self.http = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def to_dict(self, origin: float) -> dict:
+        entry = {
+            "name": self.name,
+            "category": self.category,
+            "start_s": round(self.start - origin, 6),
+            "duration_s": round(self.duration, 6),
+            "depth": self.depth,
+        }
+        if self.rows_in is not None:
+            entry["rows_in"] = self.rows_in
+        if self.rows_out is not None:
+            entry["rows_out"] = self.rows_out
+        if not self.light:
+            entry["rss_start"] = self.rss_start
+            entry["rss_end"] = self.rss_end
+            entry["peak_rss"] = self.peak_rss
+            if self.io_start and self.io_end:
+                entry["io_read"] = self.io_end["read"] - self.io_start["read"]
+                entry["io_write"] = self.io_end["write"] - self.io_start["write"]
+            counters = {
+                key: n - self.counters_start.get(key, 0)
+                for key, n in self.counters_end.items()
+                if n != self.counters_start.get(key, 0)
+            }
+            if counters:
+                entry["counters"] = counters
+            if self.http:
+                entry["http"] = self.http
+        if self.args:
+            entry["args"] = self.args
+        if self.error:
+            entry["error"] = self.error
+        return entry
+
+
+class RunProfile:
+    """Collects spans and counters for one pipeline run (thread-safe)."""
+
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.started = datetime.now()
+        self.origin = time.perf_counter()
+        self.spans: list[Span] = []
+        self.aggregates: dict[tuple[str, str], list] = {}
+        self.counters: Counter = Counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[key] += n
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", light: bool = False, **args):
+        s = Span(name, category, args, light)
+        stack = self._local.__dict__.setdefault("stack", [])
+        s.depth = len(stack)
+        s.tid = threading.get_ident()
+        if not light:
+            s.rss_start = rss_bytes()
+            s.io_start = io_bytes()
+            with self._lock:
+                s.counters_start = dict(self.counters)
+            s.http_start = HTTP_METRICS.snapshot()
+        stack.append(s)
+        s.start = time.perf_counter()
+        try:
+            yield s
+        except BaseException as e:
+            s.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            s.end = time.perf_counter()
+            stack.pop()
+            if not light:
+                s.rss_end = rss_bytes()
+                peak = peak_rss_bytes()
+                # ru_maxrss can lag the /proc sample slightly
+                s.peak_rss = max(peak, s.rss_end) if peak and s.rss_end else peak
+                s.io_end = io_bytes()
+                with self._lock:
+                    s.counters_end = dict(self.counters)
+                s.http = HTTP_METRICS.summary(since=s.http_start)
+                s.http_start = None
+            self._record(s)
+
+    def _record(self, s: Span) -> None:
+        with self._lock:
+            agg = self.aggregates.setdefault((s.category, s.name), [0, 0.0, 0.0])
+            agg[0] += 1
+            agg[1] += s.duration
+            agg[2] = max(agg[2], s.duration)
+            if self.trace or s.category not in AGGREGATE_ONLY:
+                self.spans.append(s)
+
+    def report(self) -> dict:
+        with self._lock:
+            spans = list(self.spans)
+            aggregates = dict(self.aggregates)
+            counters = dict(self.counters)
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_s": round(time.perf_counter() - self.origin, 3),
+            "peak_rss": peak_rss_bytes(),
+            "pid": os.getpid(),
+            "argv": sys.argv,
+            "counters": counters,
+            "http": HTTP_METRICS.summary(),
+            "spans": [
+                s.to_dict(self.origin) for s in spans
+                if s.category not in AGGREGATE_ONLY
+            ],
+            "aggregates": [
+                {
+                    "name": name,
+                    "category": category,
+                    "count": n,
+                    "total_s": round(total, 6),
+                    "mean_s": round(total / n, 6),
+                    "max_s": round(longest, 6),
+                }
+                for (category, name), (n, total, longest)
+                in sorted(aggregates.items(), key=lambda item: -item[1][1])
+            ],
+        }
+
+    def chrome_trace(self) -> dict:
+        """Spans as Chrome trace-event 'complete' events plus an RSS counter track."""
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            spans = list(self.spans)
+        for s in spans:
+            args = dict(s.args)
+            if s.rows_in is not None:
+                args["rows_in"] = s.rows_in
+            if s.rows_out is not None:
+                args["rows_out"] = s.rows_out
+            if s.error:
+                args["error"] = s.error
+            events.append({
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": (s.start - self.origin) * 1e6,
+                "dur": s.duration * 1e6,
+                "pid": pid,
+                "tid": s.tid,
+                "args": {k: v if isinstance(v, (int, float, str, bool)) or v is None else str(v)
+                         for k, v in args.items()},
+            })
+            if s.rss_end is not None:
+                events.append({
+                    "name": "rss_mb", "ph": "C", "pid": pid,
+                    "ts": (s.end - self.origin) * 1e6,
+                    "args": {"rss_mb": round(s.rss_end / 2**20, 1)},
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+_profile = RunProfile()
+
+
+def start_run(trace: bool = False) -> RunProfile:
+    """Reset the process-wide profile; call once at pipeline start."""
+    global _profile
+    _profile = RunProfile(trace=trace)
+    HTTP_METRICS.reset()
+    return _profile
+
+
+def current() -> RunProfile:
+    return _profile
+
+
+def span(name: str, category: str = "stage", light: bool = False, **args):
+    """Context manager timing a region of the current run.
+
+    ``light`` spans skip the /proc reads; use it for very frequent calls.
+    """
+    return _profile.span(name, category, light=light, **args)
+
+
+def count(key: str, n: int = 1) -> None:
+    """Increment a run counter (e.g. ``http.requests``)."""
+    _profile.count(key, n)
+
+
+def _rows(value) -> int | list[int] | None:
+    """Row count of a DataFrame, or of each DataFrame in a tuple/list."""
+    if hasattr(value, "shape") and hasattr(value, "columns"):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        rows = [len(v) for v in value if hasattr(v, "shape") and hasattr(v, "columns")]
+        return rows or None
+    return None
+
+
+def profiled(name: str | None = None, category: str = "stage"):
+    """Decorator: run the function in a span, recording rows in and out.
+
+    rows_in is the total length of DataFrame positional arguments, rows_out
+    the length of the returned DataFrame (or of each one in a tuple). Stages
+    log the HTTP metrics of their span when they finish.
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, category) as s:
+                rows_in = [_rows(a) for a in args]
+                rows_in = [n for n in rows_in if isinstance(n, int)]
+                if rows_in:
+                    s.rows_in = sum(rows_in)
+                result = func(*args, **kwargs)
+                s.rows_out = _rows(result)
+            if category == "stage" and s.http:
+                log_http_summary(s.http, title=f"{span_name} HTTP")
+            return result
+        return wrapper
+    return decorator
+
+
+def log_summary(profile: RunProfile | None = None) -> None:
+    """Log one line per top-level span: time, RSS and rows."""
+    profile = profile or _profile
+    report = profile.report()
+    for entry in report["spans"]:
+        if entry["depth"] != 0:
+            continue
+        rss = entry.get("rss_end")
+        peak = entry.get("peak_rss")
+        rows = entry.get("rows_out", "")
+        logger.info(
+            f"  {entry['name']:<28} {entry['duration_s']:>10.1f}s"
+            f"   rss {_mb(rss):>8}   peak {_mb(peak):>8}   rows out {rows}"
+        )
+    log_http_summary(report["http"], title="  HTTP")
+
+
+def _mb(n: int | None) -> str:
+    return "n/a" if n is None else f"{n / 2**20:,.0f}MB"
+
+
+def write_run_report(output_dir: Path, profile: RunProfile | None = None) -> Path:
+    """Write run_report.json (and run_trace.json when tracing) to output_dir."""
+    profile = profile or _profile
+    report_path = Path(output_dir) / REPORT_FILENAME
+    report = profile.report()
+    if profile.trace:
+        trace_path = Path(output_dir) / TRACE_FILENAME
+        trace_path.write_text(json.dumps(profile.chrome_trace()))
+        report["trace"] = trace_path.name
+        logger.info(f"Chrome trace: {trace_path}")
+    report_path.write_text(json.dumps(report, indent=2, default=str))
+    logger.info(f"Run report: {report_path}")
+    return report_path
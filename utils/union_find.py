@@ -0,0 +1,70 @@
+"""Disjoint-set (union-find) over row positions.
+
+Dedup tiers emit candidate edges between row positions; the connected
+components are the entity clusters. Union by size with path halving keeps
+every operation effectively constant time, so clustering is near-linear
+in rows + edges and does not depend on the order edges arrive in.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+
+class UnionFind:
+    """Union-find over the integers 0..n-1."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """Join the sets of a and b; False if they were already joined."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return True
+
+    def union_edges(self, edges: Iterable[tuple[int, int]]) -> int:
+        """Apply a batch of edges; returns how many joined two sets."""
+        joined = 0
+        for a, b in edges:
+            joined += self.union(int(a), int(b))
+        return joined
+
+    def copy(self) -> UnionFind:
+        other = UnionFind(0)
+        other.parent = list(self.parent)
+        other.size = list(self.size)
+        return other
+
+    def roots(self) -> np.ndarray:
+        """Current root per element (depends on union order; see labels())."""
+        return np.fromiter((self.find(i) for i in range(len(self))), dtype=np.int64, count=len(self))
+
+    def labels(self) -> np.ndarray:
+        """Component label per element: the smallest member's position.
+
+        Labels depend only on the components, never on union order.
+        """
+        roots = self.roots()
+        # First (smallest) position seen for each root
+        _, first = np.unique(roots, return_index=True)
+        smallest = dict(zip(roots[first].tolist(), first.tolist()))
+        return np.array([smallest[r] for r in roots.tolist()], dtype=np.int64)
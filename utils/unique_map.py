@@ -0,0 +1,55 @@
+"""Factorize-then-transform helper for repetitive string columns.
+
+Columns such as city, state, ZIP and social URLs have far fewer distinct
+values than rows. map_unique() factorizes the column, runs the column
+transform once over the distinct values, and maps the results back through
+the integer codes.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def map_unique(series: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """Apply a Series → Series transform to the distinct values of series only.
+
+    func must be elementwise (each output depends only on its own input).
+    Missing values are factorized as their own value, so func decides what
+    they become exactly as it would on the full column.
+    """
+    start = time.perf_counter()
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    mapped = func(pd.Series(uniques, dtype=series.dtype))
+
+    result = mapped.take(codes)
+    result.index = series.index
+    result.name = series.name
+
+    elapsed = time.perf_counter() - start
+    logger.debug(
+        f"{series.name}: {len(series):,} rows → {len(uniques):,} unique "
+        f"({len(series) / max(len(uniques), 1):.1f}x fewer), {elapsed:.3f}s"
+    )
+    return result
+
+
+def strip_title(series: pd.Series) -> pd.Series:
+    """Column transform: trim whitespace and title-case."""
+    return series.str.strip().str.title()
+
+
+def strip_upper(series: pd.Series) -> pd.Series:
+    """Column transform: trim whitespace and uppercase."""
+    return series.str.strip().str.upper()
+
+
+def strip(series: pd.Series) -> pd.Series:
+    """Column transform: trim whitespace."""
+    return series.str.strip()